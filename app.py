@@ -5,13 +5,23 @@ from flask import Flask, send_file, send_from_directory, request, jsonify, rende
 from functools import wraps
 import os
 import json
-import requests
 import uuid
 import re
-from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
+from datetime import datetime
 from dotenv import load_dotenv
+from utils.client_registry import get_client as get_registered_client, clients_file_exists
+from utils.jwt_verifier import verify_access_token, forget_token
+from utils.cache import SWRCache, make_backend
+from utils.executor import Deadline, fan_out, get_executor
+from utils.http_cache import conditional_get, time_bucket
+from utils.compression import init_compression
+from utils.json_provider import install_json_provider
+from dashboard_service import (
+    load_dashboard_client, get_social_profiles, get_products, get_growth_data,
+    load_weekly_post_data, get_weekly_posts, get_hero_metrics, get_analysis,
+    get_dashboard_bundle, BUNDLE_PANELS
+)
+from content.request_loader import get_loader, current_round_trips
 
 # Load environment variables from .env file
 load_dotenv()
@@ -23,10 +33,80 @@ app = Flask(__name__,
             template_folder='web/templates')
 app.secret_key = os.getenv('FLASK_SECRET_KEY', 'dev-secret-key-change-in-production')
 
-# Workspace metrics cache (in-memory, 5 minute TTL)
-_workspace_cache = {}
-_cache_lock = Lock()
-CACHE_TTL_SECONDS = 300  # 5 minutes
+# orjson serialization (if installed) and gzip/brotli for large text/JSON responses
+install_json_provider(app)
+init_compression(app)
+
+# Workspace metrics cache (stale-while-revalidate)
+# Fresh for WORKSPACE_CACHE_SOFT_TTL; after that served stale while one
+# background refresh rebuilds it, up to WORKSPACE_CACHE_HARD_TTL
+CACHE_TTL_SECONDS = int(os.getenv('WORKSPACE_CACHE_SOFT_TTL', 300))  # 5 minutes
+CACHE_HARD_TTL_SECONDS = int(os.getenv('WORKSPACE_CACHE_HARD_TTL', 3600))  # 1 hour
+# Backed by shared Redis/KV when available so all instances share entries and invalidations
+_workspace_cache = SWRCache(
+    soft_ttl=CACHE_TTL_SECONDS,
+    hard_ttl=CACHE_HARD_TTL_SECONDS,
+    backend=make_backend('workspace', max_entries=100)
+)
+
+# Upper bound on building the workspace overview; clients still pending get default metrics
+WORKSPACE_FANOUT_DEADLINE_SECONDS = float(os.getenv('WORKSPACE_FANOUT_DEADLINE', 25))
+
+# Upper bound on /api/dashboard/bundle; panels still pending are reported in "errors"
+DASHBOARD_BUNDLE_DEADLINE_SECONDS = float(os.getenv('DASHBOARD_BUNDLE_DEADLINE', 20))
+
+# Requests making more backend round trips than this are logged
+ROUND_TRIP_WARN_THRESHOLD = int(os.getenv('ROUND_TRIP_WARN_THRESHOLD', 10))
+
+
+@app.after_request
+def report_backend_round_trips(response):
+    """Expose the request loader's round-trip count and flag chatty endpoints"""
+    round_trips = current_round_trips()
+    if round_trips is not None:
+        response.headers['X-Backend-Round-Trips'] = str(round_trips)
+        if round_trips > ROUND_TRIP_WARN_THRESHOLD:
+            print(f"⚠️ {request.method} {request.path} made {round_trips} backend round trips")
+    return response
+
+# ==================== CONDITIONAL GET ====================
+
+# Follower counts and other live third-party data are treated as unchanged
+# for this long when building ETags
+LIVE_DATA_ETAG_WINDOW_SECONDS = int(os.getenv('LIVE_DATA_ETAG_WINDOW', 300))
+LIVE_DATA_CACHE_CONTROL = 'private, max-age=60'
+
+# Data each dashboard panel is built from (see content/data_version.py)
+DASHBOARD_PANEL_DATASETS = {
+    'socials': ('clients',),
+    'products': ('clients',),
+    'growth': ('clients', 'metrics_history'),
+    'posts': ('posts', 'derivatives', 'clients'),
+    'metrics': ('clients',),
+    'analysis': ('clients',),
+}
+LIVE_DASHBOARD_PANELS = ('socials', 'growth')
+
+
+def _dashboard_versions(*panels):
+    """Version markers for the given dashboard panels, checked before the handler runs"""
+    loader = get_loader()
+    datasets = sorted({d for panel in panels for d in DASHBOARD_PANEL_DATASETS[panel]})
+    markers = [loader.get_version(d) for d in datasets]
+    if any(panel in LIVE_DASHBOARD_PANELS for panel in panels):
+        markers.append(time_bucket(LIVE_DATA_ETAG_WINDOW_SECONDS))
+    if 'posts' in panels:
+        # "This week" moves with the calendar
+        markers.append(datetime.now().date().isoformat())
+    return markers
+
+
+def _bundle_versions():
+    panels_arg = request.args.get('panels')
+    panels = [p.strip() for p in panels_arg.split(',') if p.strip()] if panels_arg else list(BUNDLE_PANELS)
+    if any(p not in DASHBOARD_PANEL_DATASETS for p in panels):
+        return None
+    return _dashboard_versions(*panels)
 
 # Content API routes - lazy imports to avoid crashing if ANTHROPIC_API_KEY is missing
 # These will be imported inside the route handlers when needed
@@ -52,9 +132,8 @@ def get_current_user():
         if not token:
             return None
         
-        # Verify token with Supabase
-        try:
-            # Get user with JWT token
+        def verify_with_supabase():
+            # Get user with JWT token (network round trip)
             user_response = client.auth.get_user(jwt=token)
             if user_response and user_response.user:
                 return {
@@ -62,6 +141,11 @@ def get_current_user():
                     'email': user_response.user.email,
                     'user_metadata': user_response.user.user_metadata or {}
                 }
+            return None
+        
+        # Verify token locally (cached signing key), falling back to Supabase
+        try:
+            return verify_access_token(token, verify_with_supabase)
         except Exception as e:
             print(f"⚠️ Error verifying token: {e}")
             # If token verification fails, return None (require re-auth)
@@ -203,13 +287,18 @@ def api_logout():
         from content.supabase_storage import get_supabase_client
         client = get_supabase_client()
         
+        # Drop the cached verification so the token stops resolving locally
+        auth_header = request.headers.get('Authorization')
+        token = auth_header.split(' ')[1] if auth_header and auth_header.startswith('Bearer ') else session.get('access_token')
+        if token:
+            forget_token(token)
+        
         # Clear session
         session.clear()
         
         # Sign out from Supabase
         if client:
             try:
-                token = session.get('access_token')
                 if token:
                     client.auth.sign_out()
             except:
@@ -261,8 +350,7 @@ def index():
     
     # If client_id provided, verify access
     if client_id and user:
-        from content.supabase_storage import get_user_client_role
-        role = get_user_client_role(user['id'], client_id)
+        role = get_loader().get_user_client_role(user['id'], client_id)
         if not role:
             # User doesn't have access, redirect to workspace
             return redirect('/workspace')
@@ -283,6 +371,7 @@ def workspace():
 
 # Content Management Routes
 @app.route('/api/content/posts', methods=['GET'])
+@conditional_get(lambda: [get_loader().get_version('posts')])
 def api_list_posts():
     """List all content posts"""
     from content.center_post import list_posts
@@ -317,8 +406,7 @@ def api_create_post():
     
     # Verify user has access to this client
     if user:
-        from content.supabase_storage import get_user_client_role
-        role = get_user_client_role(user['id'], client_id)
+        role = get_loader().get_user_client_role(user['id'], client_id)
         if not role:
             return jsonify({"error": "Access denied to this project"}), 403
     
@@ -347,9 +435,8 @@ def api_create_post():
 @app.route('/api/content/posts/<post_id>', methods=['GET'])
 def api_get_post(post_id):
     """Get a specific post"""
-    from content.center_post import get_post
     try:
-        post = get_post(post_id)
+        post = get_loader().get_post(post_id)
         if not post:
             print(f"❌ Post {post_id} not found in storage")
             return jsonify({"error": "Post not found", "post_id": post_id}), 404
@@ -380,9 +467,8 @@ def api_update_post(post_id):
 @require_auth
 def api_expand_post(post_id):
     """Expand an existing post's raw_idea into center_post using AI"""
-    from content.center_post import get_post, update_post, load_content_posts, save_content_posts
+    from content.center_post import update_post, load_content_posts, save_content_posts
     from content.ai_client import ClaudeClient
-    from content.supabase_storage import get_user_client_role
     
     try:
         user = getattr(request, 'current_user', None)
@@ -390,15 +476,14 @@ def api_expand_post(post_id):
             return jsonify({"error": "Authentication required"}), 401
         
         # Get the post
-        post = get_post(post_id)
+        post = get_loader().get_post(post_id)
         if not post:
             return jsonify({"error": "Post not found"}), 404
         
         # Verify user has access to this post's client
         client_id = post.get('client_id')
         if client_id and user:
-            from content.supabase_storage import get_user_client_role
-            role = get_user_client_role(user['id'], client_id)
+            role = get_loader().get_user_client_role(user['id'], client_id)
             if not role:
                 return jsonify({"error": "Access denied to this post"}), 403
         
@@ -414,26 +499,13 @@ def api_expand_post(post_id):
         # Load client config (try Supabase first, then JSON file)
         client = None
         try:
-            from content.supabase_storage import load_clients_from_supabase
-            clients = load_clients_from_supabase()
-            for c in clients:
-                if c.get('client_id') == client_id:
-                    client = c
-                    break
+            client = get_loader().get_client(client_id)
         except Exception as e:
             print(f"⚠️ Could not load clients from Supabase: {e}")
         
         if not client:
             # Fallback to JSON file
-            try:
-                with open('clients.json', 'r') as f:
-                    clients_data = json.load(f)
-                for c in clients_data.get('clients', []):
-                    if c.get('client_id') == client_id:
-                        client = c
-                        break
-            except FileNotFoundError:
-                pass
+            client = get_registered_client(client_id)
         
         if not client:
             client = {
@@ -519,13 +591,12 @@ def api_generate_branches(post_id):
 @app.route('/api/content/posts/<post_id>/generate', methods=['POST'])
 def api_generate_derivatives(post_id):
     """Generate derivatives for selected platforms"""
-    from content.center_post import get_post
     from content.derivative_generator import generate_derivatives
     data = request.json or {}
     platforms = data.get('platforms', ['linkedin', 'x', 'threads', 'instagram', 'substack', 'telegram'])
     try:
         # Get client_id from post
-        post = get_post(post_id)
+        post = get_loader().get_post(post_id)
         client_id = post.get('client_id') if post else None
         
         derivatives = generate_derivatives(
@@ -550,6 +621,7 @@ def api_schedule_derivatives(post_id):
         return jsonify({"error": str(e)}), 400
 
 @app.route('/api/content/derivatives', methods=['GET'])
+@conditional_get(lambda: [get_loader().get_version('derivatives')])
 def api_list_derivatives():
     """List derivatives"""
     from content.derivative_generator import get_derivatives
@@ -600,7 +672,6 @@ def api_regenerate_derivative(deriv_id):
     """Regenerate a specific derivative"""
     try:
         from content.derivative_generator import load_derivatives, save_derivatives, get_derivatives
-        from content.center_post import get_post
         from content.ai_client import ClaudeClient
         
         data = load_derivatives()
@@ -616,7 +687,7 @@ def api_regenerate_derivative(deriv_id):
             return jsonify({"error": "Derivative not found"}), 404
         
         # Get the original post
-        post = get_post(derivative.get('post_id'))
+        post = get_loader().get_post(derivative.get('post_id'))
         if not post:
             return jsonify({"error": "Post not found"}), 404
         
@@ -630,25 +701,20 @@ def api_regenerate_derivative(deriv_id):
         cta_info = None
         if client_id:
             try:
-                try:
-                    with open('clients.json', 'r') as f:
-                        clients_data = json.load(f)
-                except FileNotFoundError:
+                if not clients_file_exists():
                     print("⚠️ clients.json not found, skipping brand settings")
-                    clients_data = {"clients": []}
                 
-                for client in clients_data.get('clients', []):
-                    if client.get('client_id') == client_id:
-                        brand_socials = (client.get('brand') or {}).get('socials', {})
-                        # Get CTA info if post has include_cta flag
-                        if post.get('include_cta'):
-                            main_product = (client.get('brand') or {}).get('main_product', {})
-                            if main_product.get('cta_text') and main_product.get('cta_url'):
-                                cta_info = {
-                                    'text': main_product['cta_text'],
-                                    'url': main_product['cta_url']
-                                }
-                        break
+                client = get_registered_client(client_id)
+                if client:
+                    brand_socials = (client.get('brand') or {}).get('socials', {})
+                    # Get CTA info if post has include_cta flag
+                    if post.get('include_cta'):
+                        main_product = (client.get('brand') or {}).get('main_product', {})
+                        if main_product.get('cta_text') and main_product.get('cta_url'):
+                            cta_info = {
+                                'text': main_product['cta_text'],
+                                'url': main_product['cta_url']
+                            }
             except Exception as e:
                 print(f"Warning: Could not load brand settings: {e}")
         
@@ -687,7 +753,6 @@ def api_publish_derivative(deriv_id):
     """Publish a derivative to its platform (Beehiiv for newsletters, etc.)"""
     try:
         from content.derivative_generator import load_derivatives, save_derivatives, get_derivatives
-        from content.center_post import get_post
         
         data = load_derivatives()
         derivative = None
@@ -705,7 +770,7 @@ def api_publish_derivative(deriv_id):
         deriv_type = derivative.get('type')
         
         # Get client_id from post
-        post = get_post(derivative.get('post_id'))
+        post = get_loader().get_post(derivative.get('post_id'))
         if not post:
             return jsonify({"error": "Post not found"}), 404
         
@@ -827,8 +892,7 @@ def api_create_client():
             client_id = f"project-{uuid.uuid4().hex[:8]}"
         
         # Ensure uniqueness
-        from content.supabase_storage import load_clients_from_supabase
-        existing_clients = load_clients_from_supabase()
+        existing_clients = get_loader().load_clients()
         existing_ids = [c.get('client_id') for c in existing_clients]
         original_client_id = client_id
         counter = 1
@@ -890,10 +954,8 @@ def api_create_client():
             # Clear workspace cache for this user
             user_id = user['id']
             cache_key = f"workspace_projects_{user_id}"
-            with _cache_lock:
-                if cache_key in _workspace_cache:
-                    del _workspace_cache[cache_key]
-                    print(f"✅ Cleared workspace cache for user {user_id}")
+            if _workspace_cache.invalidate(cache_key):
+                print(f"✅ Cleared workspace cache for user {user_id}")
             
             # Also save to JSON file as fallback
             try:
@@ -926,8 +988,7 @@ def api_list_clients():
             return jsonify({"error": "Authentication required"}), 401
         
         # Try Supabase first
-        from content.supabase_storage import load_clients_from_supabase
-        supabase_clients = load_clients_from_supabase(user_id=user['id'])
+        supabase_clients = get_loader().load_clients(user_id=user['id'])
         
         if supabase_clients:
             return jsonify({"clients": supabase_clients})
@@ -962,8 +1023,8 @@ def api_list_clients():
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
-def _fetch_client_metrics(client_id, base_url, scheme):
-    """Fetch all metrics for a single client in parallel"""
+def _fetch_client_metrics(client_id):
+    """Compute workspace card metrics for a single client (growth, socials, products in parallel)"""
     project = {
         "client_id": client_id,
         "growth": 0,
@@ -972,79 +1033,105 @@ def _fetch_client_metrics(client_id, base_url, scheme):
         "growth_trend": "neutral"
     }
     
+    # One client lookup shared by all three services
+    client = load_dashboard_client(client_id)
+    
     def fetch_growth():
         try:
-            response = requests.get(
-                f"{scheme}://{base_url}/api/dashboard/growth",
-                params={"client_id": client_id},
-                timeout=5
-            )
-            if response.status_code == 200:
-                data = response.json()
-                earnings = data.get('earnings', [])
-                followers = data.get('followers', [])
-                
-                if len(earnings) >= 2:
-                    current = earnings[-1]
-                    previous = earnings[-2]
-                    if previous > 0:
-                        growth = round(((current - previous) / previous) * 100, 1)
-                        project["growth"] = growth
-                        project["growth_trend"] = "up" if growth > 0 else "down" if growth < 0 else "neutral"
-                
-                if followers:
-                    project["total_followers"] = followers[-1] if followers else 0
+            data = get_growth_data(client)
+            earnings = data.get('earnings', [])
+            followers = data.get('followers', [])
+            
+            if len(earnings) >= 2:
+                current = earnings[-1]
+                previous = earnings[-2]
+                if previous > 0:
+                    growth = round(((current - previous) / previous) * 100, 1)
+                    project["growth"] = growth
+                    project["growth_trend"] = "up" if growth > 0 else "down" if growth < 0 else "neutral"
+            
+            if followers:
+                project["total_followers"] = followers[-1] if followers else 0
         except Exception as e:
             print(f"⚠️ Error fetching growth for {client_id}: {e}")
     
     def fetch_socials():
         try:
-            response = requests.get(
-                f"{scheme}://{base_url}/api/dashboard/socials",
-                params={"client_id": client_id},
-                timeout=5
-            )
-            if response.status_code == 200:
-                data = response.json()
-                profiles = data.get('profiles', [])
-                total = sum(p.get('followers_count', 0) for p in profiles)
-                if total > 0:
-                    project["total_followers"] = total
+            data = get_social_profiles(client)
+            profiles = data.get('profiles', [])
+            total = sum(p.get('followers', 0) for p in profiles)
+            if total > 0:
+                return total
         except Exception as e:
             print(f"⚠️ Error fetching socials for {client_id}: {e}")
+        return 0
     
     def fetch_products():
         try:
-            response = requests.get(
-                f"{scheme}://{base_url}/api/dashboard/products",
-                params={"client_id": client_id},
-                timeout=5
-            )
-            if response.status_code == 200:
-                data = response.json()
-                products = data.get('products', [])
-                revenue = sum(p.get('monthly_revenue', 0) for p in products)
-                if revenue > 0:
-                    project["revenue"] = revenue
+            data = get_products(client)
+            products = data.get('products', [])
+            revenue = sum(p.get('monthly_revenue', 0) for p in products)
+            if revenue > 0:
+                project["revenue"] = revenue
         except Exception as e:
             print(f"⚠️ Error fetching products for {client_id}: {e}")
     
-    # Execute all three requests in parallel
-    with ThreadPoolExecutor(max_workers=3) as executor:
-        futures = [
-            executor.submit(fetch_growth),
-            executor.submit(fetch_socials),
-            executor.submit(fetch_products)
-        ]
-        # Wait for all to complete
-        for future in as_completed(futures):
-            try:
-                future.result()
-            except Exception as e:
-                print(f"⚠️ Error in parallel fetch: {e}")
+    # Execute all three on the shared executor (inline when the pool is busy)
+    results = fan_out({
+        'growth': fetch_growth,
+        'socials': fetch_socials,
+        'products': fetch_products
+    })
+    for name, result in results.items():
+        if not result.ok:
+            print(f"⚠️ {name} fetch for {client_id} {result.status}: {result.error}")
+    
+    # Social totals take precedence over the growth series when available
+    socials_total = results['socials'].value or 0
+    if socials_total > 0:
+        project["total_followers"] = socials_total
     
     return project
 
+def _build_workspace_projects(user_id):
+    """Aggregate metrics for every project the user can access (runs outside the request context)"""
+    # Get accessible clients
+    clients = get_loader().load_clients(user_id=user_id)
+
+    if not clients:
+        return {"projects": []}
+
+    # Fetch metrics for all clients on the shared bounded executor
+    clients = [client for client in clients if client.get('client_id')]
+    results = fan_out(
+        {client['client_id']: (lambda cid=client['client_id']: _fetch_client_metrics(cid)) for client in clients},
+        deadline=Deadline(WORKSPACE_FANOUT_DEADLINE_SECONDS)
+    )
+
+    projects = []
+    for client in clients:
+        result = results[client['client_id']]
+        if result.ok:
+            metrics = result.value
+        else:
+            print(f"⚠️ Error processing client {client['client_id']} ({result.status}): {result.error}")
+            # Add project with default values even if metrics fail
+            metrics = {
+                "growth": 0,
+                "total_followers": 0,
+                "revenue": 0,
+                "growth_trend": "neutral"
+            }
+        projects.append({
+            "client_id": client['client_id'],
+            "name": client.get('name', 'Unnamed Project'),
+            "status": client.get('status', 'active'),
+            "user_role": client.get('user_role', 'viewer'),
+            **metrics
+        })
+
+    return {"projects": projects}
+
 @app.route('/api/workspace/projects', methods=['GET'])
 @require_auth
 def api_get_workspace_projects():
@@ -1057,73 +1144,9 @@ def api_get_workspace_projects():
         user_id = user['id']
         cache_key = f"workspace_projects_{user_id}"
         
-        # Check cache
-        with _cache_lock:
-            if cache_key in _workspace_cache:
-                cached_data, cached_time = _workspace_cache[cache_key]
-                if datetime.now() - cached_time < timedelta(seconds=CACHE_TTL_SECONDS):
-                    return jsonify(cached_data)
-        
-        # Get accessible clients
-        from content.supabase_storage import load_clients_from_supabase
-        clients = load_clients_from_supabase(user_id=user_id)
-        
-        if not clients:
-            result = {"projects": []}
-            with _cache_lock:
-                _workspace_cache[cache_key] = (result, datetime.now())
-            return jsonify(result)
-        
-        base_url = request.host
-        scheme = request.scheme
-        
-        # Fetch metrics for all clients in parallel
-        projects = []
-        with ThreadPoolExecutor(max_workers=min(10, len(clients))) as executor:
-            future_to_client = {
-                executor.submit(_fetch_client_metrics, client.get('client_id'), base_url, scheme): client
-                for client in clients
-                if client.get('client_id')
-            }
-            
-            for future in as_completed(future_to_client):
-                client = future_to_client[future]
-                try:
-                    metrics = future.result()
-                    project = {
-                        "client_id": client.get('client_id'),
-                        "name": client.get('name', 'Unnamed Project'),
-                        "status": client.get('status', 'active'),
-                        "user_role": client.get('user_role', 'viewer'),
-                        **metrics
-                    }
-                    projects.append(project)
-                except Exception as e:
-                    print(f"⚠️ Error processing client {client.get('client_id')}: {e}")
-                    # Add project with default values even if metrics fail
-                    projects.append({
-                        "client_id": client.get('client_id'),
-                        "name": client.get('name', 'Unnamed Project'),
-                        "status": client.get('status', 'active'),
-                        "user_role": client.get('user_role', 'viewer'),
-                        "growth": 0,
-                        "total_followers": 0,
-                        "revenue": 0,
-                        "growth_trend": "neutral"
-                    })
-        
-        result = {"projects": projects}
-        
-        # Cache the result
-        with _cache_lock:
-            _workspace_cache[cache_key] = (result, datetime.now())
-            # Clean up old cache entries (keep last 100)
-            if len(_workspace_cache) > 100:
-                # Remove oldest entries
-                sorted_cache = sorted(_workspace_cache.items(), key=lambda x: x[1][1])
-                for key, _ in sorted_cache[:-100]:
-                    del _workspace_cache[key]
-        
+        # Fresh or stale-while-revalidating entries return immediately;
+        # concurrent misses for the same user share one computation
+        result = _workspace_cache.get_or_compute(cache_key, lambda: _build_workspace_projects(user_id))
         return jsonify(result)
     except Exception as e:
         import traceback
@@ -1142,33 +1165,43 @@ def api_clear_workspace_cache():
         user_id = user['id']
         cache_key = f"workspace_projects_{user_id}"
         
-        with _cache_lock:
-            if cache_key in _workspace_cache:
-                del _workspace_cache[cache_key]
-                return jsonify({"message": "Cache cleared", "user_id": user_id})
-            else:
-                return jsonify({"message": "No cache found", "user_id": user_id})
+        if _workspace_cache.invalidate(cache_key):
+            return jsonify({"message": "Cache cleared", "user_id": user_id})
+        else:
+            return jsonify({"message": "No cache found", "user_id": user_id})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/workspace/executor/stats', methods=['GET'])
+@require_auth
+def api_executor_stats():
+    """Queue depth and counters for the shared fan-out executor (debug endpoint)"""
+    return jsonify(get_executor().stats())
+
+@app.route('/api/workspace/throttle/stats', methods=['GET'])
+@require_auth
+def api_throttle_stats():
+    """Per-host rate limit and circuit breaker state for outbound requests (debug endpoint)"""
+    from utils.throttle import stats as throttle_stats
+    return jsonify(throttle_stats())
+
+@app.route('/api/workspace/follower-refresh/status', methods=['GET'])
+@require_auth
+def api_follower_refresh_status():
+    """Last follower refresh run and per-platform snapshot freshness (debug endpoint)"""
+    from follower_refresh import get_refresh_status
+    return jsonify(get_refresh_status() or {})
+
 # Client Routes
 @app.route('/api/clients/<client_id>', methods=['GET'])
 def api_get_client(client_id):
     """Get a specific client"""
     try:
-        try:
-            with open('clients.json', 'r') as f:
-                data = json.load(f)
-        except FileNotFoundError:
+        if not clients_file_exists():
             print("⚠️ clients.json not found, returning 404")
             return jsonify({"error": "Client not found"}), 404
         
-        client = None
-        for c in data.get('clients', []):
-            if c.get('client_id') == client_id:
-                client = c
-                break
-        
+        client = get_registered_client(client_id)
         if not client:
             return jsonify({"error": "Client not found"}), 404
         
@@ -1197,19 +1230,11 @@ def brand_identity_page():
 def api_get_brand(client_id):
     """Get brand settings for a client"""
     try:
-        try:
-            with open('clients.json', 'r') as f:
-                data = json.load(f)
-        except FileNotFoundError:
+        if not clients_file_exists():
             print("⚠️ clients.json not found, returning empty brand")
             return jsonify({"brand": {}})
         
-        client = None
-        for c in data.get('clients', []):
-            if c.get('client_id') == client_id:
-                client = c
-                break
-        
+        client = get_registered_client(client_id)
         if not client:
             return jsonify({"brand": {}})
         
@@ -1219,6 +1244,7 @@ def api_get_brand(client_id):
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/dashboard/socials', methods=['GET'])
+@conditional_get(lambda: _dashboard_versions('socials'), LIVE_DATA_CACHE_CONTROL)
 def api_get_social_profiles():
     """Get social media profiles for enabled platforms"""
     try:
@@ -1226,157 +1252,13 @@ def api_get_social_profiles():
         if not client_id:
             return jsonify({"error": "client_id required"}), 400
         
-        # Try to load clients.json, fallback to dummy data if not found (e.g., on Vercel)
-        try:
-            with open('clients.json', 'r') as f:
-                data = json.load(f)
-        except FileNotFoundError:
-            print("⚠️ clients.json not found, using dummy data for socials")
-            data = {"clients": []}
-        
-        client = None
-        for c in data.get('clients', []):
-            if c.get('client_id') == client_id:
-                client = c
-                break
-        
-        # If client not found, use dummy client structure
-        if not client:
-            print(f"⚠️ Client {client_id} not found, using dummy data")
-            client = {
-                'client_id': client_id,
-                'brand': {
-                    'socials': {}
-                },
-                'connected_accounts': {}
-            }
-        
-        brand = client.get('brand') or {}
-        socials = brand.get('socials', {})
-        connected_accounts = client.get('connected_accounts') or {}
-        
-        profiles = []
-        total_followers = 0
-        
-        # Check each platform
-        platform_configs = {
-            'linkedin': {'name': 'LinkedIn', 'icon': '💼'},
-            'x': {'name': 'X (Twitter)', 'icon': '🐦'},
-            'threads': {'name': 'Threads', 'icon': '🧵'},
-            'instagram': {'name': 'Instagram', 'icon': '📷'},
-            'substack': {'name': 'Substack', 'icon': '📰'},
-            'telegram': {'name': 'Telegram', 'icon': '✈️'}
-        }
-        
-        # If socials is empty or missing, default all platforms to enabled
-        # (matches settings page behavior where platforms default to enabled)
-        socials_empty = not socials or len(socials) == 0
-        
-        for platform_id, platform_info in platform_configs.items():
-            platform_settings = socials.get(platform_id, {})
-            # Default to enabled if:
-            # 1. socials is empty/missing (user hasn't configured yet)
-            # 2. platform not in socials
-            # 3. enabled is not explicitly set to false
-            if socials_empty:
-                is_enabled = True
-            elif platform_id not in socials:
-                is_enabled = True  # Platform not configured yet, default to enabled
-            else:
-                is_enabled = platform_settings.get('enabled', True)  # Default to True if key missing
-            
-            if is_enabled:
-                # Try to get profile data
-                profile_data = {
-                    'platform': platform_id,
-                    'name': platform_info['name'],
-                    'icon': platform_info['icon'],
-                    'followers': 0,
-                    'profile_pic': None,
-                    'description': '',
-                    'username': ''
-                }
-                
-                # Fetch real data using web scraper or API
-                profile_url = platform_settings.get('profile_url', '')
-                
-                # Try Instagram API first (if connected via OAuth - fallback for existing setups)
-                connected = connected_accounts.get(platform_id, {})
-                if platform_id == 'instagram' and connected.get('connected'):
-                    try:
-                        user_id = connected.get('user_id')
-                        access_token = connected.get('access_token') or os.getenv('INSTAGRAM_ACCESS_TOKEN')
-                        if user_id and access_token:
-                            url = f"https://graph.facebook.com/v18.0/{user_id}"
-                            params = {
-                                'fields': 'username,biography,profile_picture_url,followers_count',
-                                'access_token': access_token
-                            }
-                            response = requests.get(url, params=params)
-                            if response.status_code == 200:
-                                instagram_data = response.json()
-                                profile_data['followers'] = instagram_data.get('followers_count', 0)
-                                profile_data['profile_pic'] = instagram_data.get('profile_picture_url')
-                                profile_data['description'] = instagram_data.get('biography', '')
-                                profile_data['username'] = instagram_data.get('username', '')
-                                print(f"✅ Fetched Instagram profile via API: {profile_data['followers']} followers")
-                            else:
-                                print(f"⚠️ Instagram API error: {response.status_code} - {response.text}")
-                                # Fall through to scraper if API fails
-                                profile_url = profile_url or f"https://instagram.com/{connected.get('username', '')}"
-                    except Exception as e:
-                        print(f"❌ Error fetching Instagram profile via API: {e}")
-                        # Fall through to scraper
-                        profile_url = profile_url or f"https://instagram.com/{connected.get('username', '')}"
-                
-                # Use web scraper if profile URL is provided
-                if profile_url:
-                    try:
-                        from social_scraper import get_followers_from_url
-                        scraped_data = get_followers_from_url(platform_id, profile_url)
-                        if scraped_data and scraped_data.get('followers', 0) > 0:
-                            profile_data['followers'] = scraped_data.get('followers', 0)
-                            profile_data['profile_pic'] = scraped_data.get('profile_pic')
-                            profile_data['description'] = scraped_data.get('description', '')
-                            profile_data['username'] = scraped_data.get('username', '')
-                            print(f"✅ Scraped {platform_info['name']} profile: {profile_data['followers']} followers")
-                        else:
-                            print(f"⚠️ Could not scrape {platform_info['name']} from {profile_url}, using dummy data")
-                            # Fall through to dummy data
-                            profile_data['followers'] = 0
-                    except Exception as e:
-                        print(f"❌ Error scraping {platform_info['name']}: {e}, using dummy data")
-                        # Fall through to dummy data
-                        profile_data['followers'] = 0
-                
-                # Always provide dummy data if no real data was fetched
-                if not profile_data['followers'] or profile_data['followers'] == 0:
-                    print(f"ℹ️ {platform_info['name']} using dummy data for testing")
-                    dummy_followers = {
-                        'linkedin': 1250,
-                        'x': 3200,
-                        'threads': 890,
-                        'instagram': 5600,
-                        'substack': 450,
-                        'telegram': 1200
-                    }
-                    profile_data['followers'] = dummy_followers.get(platform_id, 0)
-                    if not profile_data['username']:
-                        profile_data['username'] = f'@{platform_id}_example'
-                    if not profile_data['description']:
-                        profile_data['description'] = f'Professional {platform_info["name"]} profile'
-                
-                total_followers += profile_data['followers']
-                profiles.append(profile_data)
-        
-        return jsonify({
-            'profiles': profiles,
-            'total_followers': total_followers
-        })
+        client = load_dashboard_client(client_id)
+        return jsonify(get_social_profiles(client))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/dashboard/products', methods=['GET'])
+@conditional_get(lambda: _dashboard_versions('products'))
 def api_get_products():
     """Get products with sales/buyers data"""
     try:
@@ -1384,65 +1266,13 @@ def api_get_products():
         if not client_id:
             return jsonify({"error": "client_id required"}), 400
         
-        # Try to load clients.json, fallback to dummy data if not found
-        try:
-            with open('clients.json', 'r') as f:
-                data = json.load(f)
-        except FileNotFoundError:
-            print("⚠️ clients.json not found, using dummy data for products")
-            data = {"clients": []}
-        
-        client = None
-        for c in data.get('clients', []):
-            if c.get('client_id') == client_id:
-                client = c
-                break
-        
-        # If client not found, use dummy client structure
-        if not client:
-            print(f"⚠️ Client {client_id} not found, using dummy data")
-            client = {
-                'client_id': client_id,
-                'brand': {
-                    'main_product': {}
-                }
-            }
-        
-        brand = client.get('brand') or {}
-        main_product = brand.get('main_product', {})
-        
-        products = []
-        if main_product.get('product_id'):
-            # Return the main product with dummy sales data for testing
-            products.append({
-                'product_id': main_product.get('product_id'),
-                'name': main_product.get('cta_text', 'Main Product') or 'Main Product',
-                'monthly_sales': 12,  # Dummy data for testing
-                'monthly_buyers': 8,  # Dummy data for testing
-                'monthly_revenue': 9600  # Dummy data: 8 buyers × $1,200 average
-            })
-        else:
-            # If no product configured, show dummy data for testing
-            products.append({
-                'product_id': 'product_dummy_001',
-                'name': 'Coaching Program',
-                'monthly_sales': 15,
-                'monthly_buyers': 12,
-                'monthly_revenue': 14400
-            })
-            products.append({
-                'product_id': 'product_dummy_002',
-                'name': 'Discovery Call',
-                'monthly_sales': 8,
-                'monthly_buyers': 8,
-                'monthly_revenue': 0  # Free product
-            })
-        
-        return jsonify({'products': products})
+        client = load_dashboard_client(client_id)
+        return jsonify(get_products(client))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/dashboard/growth', methods=['GET'])
+@conditional_get(lambda: _dashboard_versions('growth'), LIVE_DATA_CACHE_CONTROL)
 def api_get_growth_data():
     """Get monthly growth data for earnings and followers"""
     try:
@@ -1450,148 +1280,13 @@ def api_get_growth_data():
         if not client_id:
             return jsonify({"error": "client_id required"}), 400
         
-        from datetime import datetime, timedelta
-        from calendar import month_abbr
-        
-        # Get current month data - try to load clients.json, fallback to dummy data
-        try:
-            with open('clients.json', 'r') as f:
-                data = json.load(f)
-        except FileNotFoundError:
-            print("⚠️ clients.json not found, using dummy data for growth")
-            data = {"clients": []}
-        
-        client = None
-        for c in data.get('clients', []):
-            if c.get('client_id') == client_id:
-                client = c
-                break
-        
-        # If client not found, use dummy client structure
-        if not client:
-            print(f"⚠️ Client {client_id} not found, using dummy data")
-            client = {
-                'client_id': client_id,
-                'brand': {
-                    'main_product': {},
-                    'socials': {}
-                },
-                'connected_accounts': {}
-            }
-        
-        # Get current earnings (from products)
-        brand = client.get('brand') or {}
-        main_product = brand.get('main_product', {})
-        current_earnings = 0
-        if main_product.get('product_id'):
-            # Use dummy data for now (would come from Stripe API in production)
-            current_earnings = 9600  # Dummy: 8 buyers × $1,200
-        else:
-            # Sum dummy products
-            current_earnings = 14400  # Dummy data
-        
-        # Get current followers (from social profiles)
-        socials = brand.get('socials', {})
-        connected_accounts = client.get('connected_accounts', {})
-        current_followers = 0
-        
-        # Calculate total followers from connected accounts
-        if (connected_accounts.get('instagram') or {}).get('connected'):
-            try:
-                user_id = connected_accounts['instagram'].get('user_id')
-                access_token = connected_accounts['instagram'].get('access_token') or os.getenv('INSTAGRAM_ACCESS_TOKEN')
-                if user_id and access_token:
-                    url = f"https://graph.facebook.com/v18.0/{user_id}"
-                    params = {
-                        'fields': 'followers_count',
-                        'access_token': access_token
-                    }
-                    response = requests.get(url, params=params)
-                    if response.status_code == 200:
-                        instagram_data = response.json()
-                        current_followers += instagram_data.get('followers_count', 0)
-            except Exception as e:
-                print(f"Error fetching Instagram followers: {e}")
-        
-        # Generate last 12 months of data
-        months = []
-        earnings = []
-        followers = []
-        
-        now = datetime.now()
-        
-        # Use dummy data for testing - clear growth trend
-        # Earnings: Start at $5,000, grow to current (or $14,400 if no current)
-        # Followers: Start at 5,000, grow to current (or 12,000 if no current)
-        base_earnings = current_earnings if current_earnings > 0 else 14400
-        base_followers = current_followers if current_followers > 0 else 12000
-        
-        for i in range(11, -1, -1):  # Last 12 months
-            month_date = now - timedelta(days=30 * i)
-            month_label = f"{month_abbr[month_date.month]} '{str(month_date.year)[2:]}"
-            months.append(month_label)
-            
-            # For historical data, use metrics_history.json if available
-            # Otherwise, generate dummy data with growth trend
-            month_key = month_date.strftime('%Y-%m')
-            
-            # Try to load from metrics_history
-            historical_earnings = None
-            historical_followers = None
-            try:
-                if os.path.exists('metrics_history.json'):
-                    with open('metrics_history.json', 'r') as f:
-                        history = json.load(f)
-                    # Look for data matching this month
-                    for scope_id, metrics in history.items():
-                        if scope_id == client_id or scope_id.startswith(client_id):
-                            metric_date_str = metrics.get('date', '')
-                            if metric_date_str:
-                                try:
-                                    metric_date = datetime.fromisoformat(metric_date_str.replace('Z', '+00:00'))
-                                    if metric_date.strftime('%Y-%m') == month_key:
-                                        historical_earnings = metrics.get('monthly_revenue', 0)
-                                        historical_followers = metrics.get('fans_total', 0)
-                                        break
-                                except:
-                                    pass
-            except Exception as e:
-                print(f"Error loading historical data: {e}")
-            
-            # Use historical data if available, otherwise generate dummy trend
-            if historical_earnings is not None:
-                earnings.append(historical_earnings)
-            else:
-                # Generate trend: start at 60% of base and grow linearly to base
-                progress = (12 - i) / 12
-                # Add some variation for realism
-                variation = (i % 3 - 1) * 0.05  # ±5% variation
-                month_earnings = int(base_earnings * (0.6 + 0.4 * progress) * (1 + variation))
-                earnings.append(max(1000, month_earnings))  # Minimum $1,000
-            
-            if historical_followers is not None:
-                followers.append(historical_followers)
-            else:
-                # Generate trend: start at 70% of base and grow linearly to base
-                progress = (12 - i) / 12
-                # Add some variation for realism
-                variation = (i % 2) * 0.03  # ±3% variation
-                month_followers = int(base_followers * (0.7 + 0.3 * progress) * (1 + variation))
-                followers.append(max(1000, month_followers))  # Minimum 1,000 followers
-        
-        # Ensure current month matches actual values (or use dummy if no actual)
-        earnings[-1] = current_earnings if current_earnings > 0 else base_earnings
-        followers[-1] = current_followers if current_followers > 0 else base_followers
-        
-        return jsonify({
-            'months': months,
-            'earnings': earnings,
-            'followers': followers
-        })
+        client = load_dashboard_client(client_id)
+        return jsonify(get_growth_data(client))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/dashboard/posts', methods=['GET'])
+@conditional_get(lambda: _dashboard_versions('posts'))
 def api_get_weekly_posts():
     """Get this week's posts with scheduling info"""
     try:
@@ -1599,224 +1294,16 @@ def api_get_weekly_posts():
         if not client_id:
             return jsonify({"error": "client_id required"}), 400
         
-        from datetime import datetime, timedelta
-        from content.center_post import load_content_posts
-        from content.derivative_generator import load_derivatives
-        
-        # Get current week (Monday to Sunday)
-        now = datetime.now()
-        day_of_week = now.weekday()  # 0 = Monday, 6 = Sunday
-        monday = now - timedelta(days=day_of_week)
-        sunday = monday + timedelta(days=6)
-        
-        # Load posts - fallback to dummy data if files don't exist
-        try:
-            posts_data = load_content_posts()
-            if not posts_data.get('posts'):
-                print("⚠️ No posts found, using dummy data")
-                posts_data = {"posts": []}
-        except Exception as e:
-            print(f"⚠️ Error loading posts: {e}, using dummy data")
-            posts_data = {"posts": []}
-        
-        try:
-            derivatives_data = load_derivatives()
-            if not derivatives_data.get('derivatives'):
-                print("⚠️ No derivatives found, using dummy data")
-                derivatives_data = {"derivatives": []}
-        except Exception as e:
-            print(f"⚠️ Error loading derivatives: {e}, using dummy data")
-            derivatives_data = {"derivatives": []}
-        
-        # Load client config for default schedule and special events - fallback to dummy data
-        try:
-            with open('clients.json', 'r') as f:
-                clients_data = json.load(f)
-        except FileNotFoundError:
-            print("⚠️ clients.json not found, using dummy data for weekly posts")
-            clients_data = {"clients": []}
-        
-        client = None
-        for c in clients_data.get('clients', []):
-            if c.get('client_id') == client_id:
-                client = c
-                break
-        
-        # If client not found, use empty brand structure
-        if not client:
-            print(f"⚠️ Client {client_id} not found, using default schedule")
-            client = {
-                'client_id': client_id,
-                'brand': {}
-            }
-        
-        # Get default schedule from brand settings
-        brand = client.get('brand') or {}
-        default_schedule = brand.get('default_schedule', {})
-        newsletter_default_time = default_schedule.get('newsletter_time', '09:00')
-        newsletter_default_day = default_schedule.get('newsletter_day', 'friday')
-        
-        # Format default schedule string
-        day_map = {
-            'monday': 'Monday',
-            'tuesday': 'Tuesday',
-            'wednesday': 'Wednesday',
-            'thursday': 'Thursday',
-            'friday': 'Friday',
-            'saturday': 'Saturday',
-            'sunday': 'Sunday',
-            'weekly': 'Weekly',
-            'biweekly': 'Bi-weekly'
-        }
-        default_schedule_str = f"{newsletter_default_time} UTC (Every {day_map.get(newsletter_default_day, 'Friday')})"
-        
-        # Get special events
-        special_events = brand.get('special_events', [])
-        # Filter events for this week and upcoming
-        upcoming_events = []
-        for event in special_events:
-            event_date_str = event.get('date')
-            if event_date_str:
-                try:
-                    event_date = datetime.fromisoformat(event_date_str)
-                    # Show events from this week onwards
-                    if event_date >= monday:
-                        upcoming_events.append(event)
-                except:
-                    pass
-        
-        # Aggregate data for this week
-        main_topic = None
-        topic_post_id = None
-        newsletter_scheduled = None
-        has_drafted = False
-        has_scheduled = False
-        social_counts = {
-            'linkedin': 0,
-            'x': 0,
-            'threads': 0,
-            'instagram': 0,
-            'substack': 0,
-            'telegram': 0
-        }
-        
-        # Find posts from this week and aggregate their derivatives
-        for post in posts_data.get('posts', []):
-            if post.get('client_id') != client_id:
-                continue
-            
-            try:
-                created_at_str = post.get('created_at', '')
-                if not created_at_str:
-                    continue
-                # Handle timezone-aware and naive datetimes
-                if 'Z' in created_at_str:
-                    created_at = datetime.fromisoformat(created_at_str.replace('Z', '+00:00'))
-                elif '+' in created_at_str or created_at_str.count('-') > 2:
-                    created_at = datetime.fromisoformat(created_at_str)
-                else:
-                    created_at = datetime.fromisoformat(created_at_str)
-                
-                # Make both timezone-naive for comparison
-                if created_at.tzinfo:
-                    created_at = created_at.replace(tzinfo=None)
-                monday_naive = monday.replace(tzinfo=None) if monday.tzinfo else monday
-                sunday_naive = sunday.replace(tzinfo=None) if sunday.tzinfo else sunday
-                
-                # Check if post was created this week
-                if monday_naive <= created_at <= sunday_naive + timedelta(days=1):  # Include Sunday
-                    # Check if post is drafted (idea, drafted, branched, approved)
-                    post_status = post.get('status', 'draft')
-                    if post_status in ['idea', 'drafted', 'branched', 'approved']:
-                        has_drafted = True
-                    
-                    # Get main topic (use the most recent post's title)
-                    if not main_topic:
-                        center_post = post.get('center_post') or {}
-                        main_topic = center_post.get('title', post.get('raw_idea', 'Untitled')[:50])
-                        topic_post_id = post.get('id')
-                    
-                    # Find derivatives for this post and aggregate
-                    post_id = post.get('id')
-                    for deriv in derivatives_data.get('derivatives', []):
-                        if deriv.get('post_id') != post_id:
-                            continue
-                        
-                        deriv_type = deriv.get('type')
-                        status = (deriv.get('metadata') or {}).get('status', deriv.get('status', 'draft'))
-                        
-                        # Check if queued (scheduled)
-                        if status == 'queued' and deriv.get('scheduled_for'):
-                            has_scheduled = True
-                            if deriv_type == 'newsletter':
-                                # Use the first/earliest newsletter scheduled time
-                                if not newsletter_scheduled:
-                                    newsletter_scheduled = deriv.get('scheduled_for')
-                            else:
-                                # Map derivative types to platform IDs
-                                platform_map = {
-                                    'x': 'x',
-                                    'social_x': 'x',
-                                    'linkedin': 'linkedin',
-                                    'social_linkedin': 'linkedin',
-                                    'threads': 'threads',
-                                    'social_threads': 'threads',
-                                    'instagram': 'instagram',
-                                    'social_ig': 'instagram',
-                                    'ig': 'instagram',
-                                    'substack': 'substack',
-                                    'social_substack': 'substack',
-                                    'telegram': 'telegram',
-                                    'social_telegram': 'telegram'
-                                }
-                                platform_id = platform_map.get(deriv_type)
-                                if platform_id and platform_id in social_counts:
-                                    social_counts[platform_id] += 1
-            except Exception as e:
-                print(f"Error processing post {post.get('id', 'unknown')}: {e}")
-                continue
-        
-        # If no data found, return dummy data for testing
-        if not main_topic and not has_drafted and not has_scheduled:
-            print("ℹ️ No posts found for this week, returning dummy data")
-            return jsonify({
-                'topic': 'Building Your Personal Brand',
-                'topic_post_id': None,
-                'newsletter_scheduled': None,
-                'newsletter_default_time': '09:00 UTC',
-                'social_counts': {
-                    'x': 5,
-                    'linkedin': 3,
-                    'threads': 2,
-                    'instagram': 4,
-                    'substack': 1,
-                    'telegram': 1
-                },
-                'has_drafted': False,
-                'has_scheduled': False,
-                'special_events': [],
-                'week_start': monday.isoformat(),
-                'week_end': sunday.isoformat()
-            })
-        
-        return jsonify({
-            'topic': main_topic,
-            'topic_post_id': topic_post_id,
-            'newsletter_scheduled': newsletter_scheduled,
-            'newsletter_default_time': default_schedule_str,
-            'social_counts': social_counts,
-            'has_drafted': has_drafted,
-            'has_scheduled': has_scheduled,
-            'special_events': upcoming_events[:5],  # Limit to 5 upcoming events
-            'week_start': monday.isoformat(),
-            'week_end': sunday.isoformat()
-        })
+        client = load_dashboard_client(client_id)
+        posts_data, derivatives_data = load_weekly_post_data(get_loader().load_derivatives)
+        return jsonify(get_weekly_posts(client, posts_data, derivatives_data))
     except Exception as e:
         import traceback
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/dashboard/metrics', methods=['GET'])
+@conditional_get(lambda: _dashboard_versions('metrics'))
 def api_get_dashboard_metrics():
     """Get hero metrics (impressions, email capture, client calls)"""
     try:
@@ -1824,76 +1311,15 @@ def api_get_dashboard_metrics():
         if not client_id:
             return jsonify({"error": "client_id required"}), 400
         
-        # Load client config - fallback to dummy data if not found
-        try:
-            with open('clients.json', 'r') as f:
-                clients_data = json.load(f)
-        except FileNotFoundError:
-            print("⚠️ clients.json not found, using dummy data for metrics")
-            clients_data = {"clients": []}
-        
-        client = None
-        for c in clients_data.get('clients', []):
-            if c.get('client_id') == client_id:
-                client = c
-                break
-        
-        # If client not found, use dummy client structure
-        if not client:
-            print(f"⚠️ Client {client_id} not found, using dummy data")
-            client = {
-                'client_id': client_id,
-                'brand': {},
-                'funnel_structure': {}
-            }
-        
-        # Calculate metrics from funnel structure or use dummy data
-        funnel_structure = client.get('funnel_structure', {})
-        awareness_channels = funnel_structure.get('awareness', {}).get('channels', [])
-        
-        # Calculate total impressions from awareness channels (would come from APIs in production)
-        total_impressions = 0
-        for channel in awareness_channels:
-            # In production, would fetch from channel APIs
-            # For now, use dummy values
-            metric_name = channel.get('metric_name', '')
-            if 'blog' in metric_name.lower():
-                total_impressions += 1234
-            elif 'instagram' in metric_name.lower() or 'ig' in metric_name.lower():
-                total_impressions += 5678
-            elif 'linkedin' in metric_name.lower():
-                total_impressions += 890
-        
-        # If no channels configured, use dummy total
-        if total_impressions == 0:
-            total_impressions = 7802  # Blog (1234) + Instagram (5678) + LinkedIn (890)
-        
-        # Get email capture from capture stage (would come from Beehiiv API)
-        capture_config = funnel_structure.get('capture', {})
-        email_capture = 23  # Would come from Beehiiv API
-        if capture_config.get('platform') == 'beehiiv':
-            # In production, would fetch from Beehiiv API
-            pass
-        
-        # Get client calls from conversion stage (manual entry)
-        conversion_config = funnel_structure.get('conversion', {})
-        client_calls = 1  # Would come from manual metrics
-        
-        # Calculate capture rate
-        capture_rate = (email_capture / total_impressions * 100) if total_impressions > 0 else 0
-        
-        return jsonify({
-            'total_impressions': total_impressions,
-            'email_capture': email_capture,
-            'capture_rate': round(capture_rate, 1),
-            'client_calls': client_calls
-        })
+        client = load_dashboard_client(client_id)
+        return jsonify(get_hero_metrics(client))
     except Exception as e:
         import traceback
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/dashboard/analysis', methods=['GET'])
+@conditional_get(lambda: _dashboard_versions('analysis'))
 def api_get_dashboard_analysis():
     """Get analysis for a specific dashboard area"""
     try:
@@ -1903,352 +1329,56 @@ def api_get_dashboard_analysis():
         if not client_id or not area:
             return jsonify({"error": "client_id and area required"}), 400
         
-        # Load client config - fallback to dummy data if not found
-        try:
-            with open('clients.json', 'r') as f:
-                clients_data = json.load(f)
-        except FileNotFoundError:
-            print("⚠️ clients.json not found, using dummy data for analysis")
-            clients_data = {"clients": []}
-        
-        client = None
-        for c in clients_data.get('clients', []):
-            if c.get('client_id') == client_id:
-                client = c
-                break
-        
-        # If client not found, use dummy client structure
-        if not client:
-            print(f"⚠️ Client {client_id} not found, using dummy data")
-            client = {
-                'client_id': client_id,
-                'brand': {},
-                'funnel_structure': {}
-            }
-        
-        # Try to get real metrics (from existing endpoints or calculate)
-        # For now, use static analysis with fallback logic
-        from report_formatter import identify_bottleneck, generate_action_plan
-        
-        # Calculate basic metrics from client structure
-        funnel_structure = client.get('funnel_structure', {})
-        awareness_channels = funnel_structure.get('awareness', {}).get('channels', [])
-        capture_config = funnel_structure.get('capture', {})
-        nurture_config = funnel_structure.get('nurture', {})
-        conversion_touchpoints = funnel_structure.get('conversion', {}).get('touchpoints', [])
-        
-        # Build metrics dict (simplified - in production would fetch from APIs)
-        # Calculate total impressions from all awareness channels
-        total_impressions = 1234 + 5678 + 890  # Blog + Instagram + LinkedIn (would come from APIs)
-        
-        metrics = {
-            'blog_visitors': 1234,  # Would come from Vercel API
-            'new_subscribers': 23,  # Would come from Beehiiv API
-            'total_subscribers': 456,  # Would come from Beehiiv API
-            'open_rate': 45.2,  # Would come from Beehiiv API
-            'click_rate': 8.3,  # Would come from Beehiiv API
-            'inquiries': 2,  # Manual entry
-            'calls_booked': 1,  # Manual entry
-            'close_rate': 50.0,  # Calculated
-            'capture_rate': (23 / total_impressions * 100) if total_impressions > 0 else 0,  # Calculated
-            'inquiry_rate': (2 / 456 * 100) if 456 > 0 else 0,  # Calculated
-            'total_reach': total_impressions,
-            'total_impressions': total_impressions
-        }
-        
-        # Identify bottleneck
-        bottleneck_name, bottleneck_desc = identify_bottleneck(metrics)
-        action_plan = generate_action_plan(bottleneck_name, metrics)
-        
-        # Generate analysis for the requested area
-        analysis = generate_area_analysis(area, metrics, bottleneck_name, action_plan)
+        client = load_dashboard_client(client_id)
+        result = get_analysis(client, [area])
         
         # Include metrics in response for frontend use
         return jsonify({
-            "analysis": analysis,
-            "metrics": metrics
+            "analysis": result['areas'][area],
+            "metrics": result['metrics']
         })
     except Exception as e:
         import traceback
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
-def generate_area_analysis(area, metrics, bottleneck_name, action_plan):
-    """Generate analysis for a specific dashboard area"""
-    
-    area_map = {
-        'blog_visitors': {
-            'area_name': 'Blog Visitors',
-            'current_value': metrics.get('blog_visitors', 0),
-            'target_value': 5000,
-            'status': 'good' if metrics.get('blog_visitors', 0) >= 3000 else 'warning' if metrics.get('blog_visitors', 0) >= 1000 else 'critical',
-            'what_is_good': 'Your blog is getting consistent traffic' if metrics.get('blog_visitors', 0) >= 1000 else None,
-            'what_is_bad': 'Traffic is below target of 5,000 weekly visitors' if metrics.get('blog_visitors', 0) < 5000 else None,
-            'improvements': [
-                'Increase content frequency to 3-4 posts/week',
-                'Optimize SEO for high-intent keywords',
-                'Promote posts on social media'
-            ],
-            'suggestions': [
-                'Focus on long-form content (2,000+ words)',
-                'Add internal linking between posts',
-                'Create topic clusters around main themes'
-            ]
-        },
-        'new_subscribers': {
-            'area_name': 'New Subscribers',
-            'current_value': metrics.get('new_subscribers', 0),
-            'target_value': int(metrics.get('blog_visitors', 0) * 0.04),
-            'status': 'good' if metrics.get('capture_rate', 0) >= 4 else 'warning' if metrics.get('capture_rate', 0) >= 2 else 'critical',
-            'what_is_good': 'You have a growing email list' if metrics.get('new_subscribers', 0) > 0 else None,
-            'what_is_bad': f"Capture rate is {metrics.get('capture_rate', 0):.1f}% vs target 4%. You're losing {100 - metrics.get('capture_rate', 0):.1f}% of visitors" if metrics.get('capture_rate', 0) < 4 else None,
-            'improvements': (
-                [action_plan.get('LEAD CAPTURE', {}).get('priority_1', {}).get('title'), action_plan.get('LEAD CAPTURE', {}).get('priority_2', {}).get('title', 'Add lead magnet to every post')]
-                if action_plan.get('LEAD CAPTURE', {}).get('priority_1', {}).get('title')
-                else [
-                    'Add ebook popup to blog',
-                    'Create exit-intent popup',
-                    'Add lead magnet to every post'
-                ]
-            ),
-            'suggestions': [
-                'Test different lead magnet offers',
-                'Simplify signup form (fewer fields)',
-                'Add social proof to signup page'
-            ]
-        },
-        'open_rate': {
-            'area_name': 'Open Rate',
-            'current_value': metrics.get('open_rate', 0),
-            'target_value': 40,
-            'status': 'good' if metrics.get('open_rate', 0) >= 40 else 'warning' if metrics.get('open_rate', 0) >= 30 else 'critical',
-            'what_is_good': 'Your open rate is above target! Content resonates well' if metrics.get('open_rate', 0) >= 40 else None,
-            'what_is_bad': f"Open rate is {metrics.get('open_rate', 0):.1f}% vs target 40%" if metrics.get('open_rate', 0) < 40 else None,
-            'improvements': (
-                [action_plan.get('ENGAGEMENT', {}).get('priority_1', {}).get('title'), action_plan.get('ENGAGEMENT', {}).get('priority_2', {}).get('title', 'Test send times')]
-                if action_plan.get('ENGAGEMENT', {}).get('priority_1', {}).get('title')
-                else [
-                    'Improve email subject lines',
-                    'Test send times for better engagement'
-                ]
-            ),
-            'suggestions': [
-                'Segment list for more targeted content',
-                'A/B test subject lines',
-                'Personalize email content'
-            ]
-        },
-        'inquiries_clients': {
-            'area_name': 'Inquiries → Clients',
-            'current_value': metrics.get('close_rate', 0),
-            'target_value': 40,
-            'status': 'good' if metrics.get('close_rate', 0) >= 40 else 'warning' if metrics.get('close_rate', 0) >= 30 else 'critical',
-            'what_is_good': 'Excellent close rate! You convert well' if metrics.get('close_rate', 0) >= 40 else None,
-            'what_is_bad': f"Low inquiry volume (only {metrics.get('inquiries', 0)} per week)" if metrics.get('inquiries', 0) < 5 else f"Close rate is {metrics.get('close_rate', 0):.0f}% vs target 40%" if metrics.get('close_rate', 0) < 40 else None,
-            'improvements': (
-                [action_plan.get('INQUIRIES', {}).get('priority_1', {}).get('title'), action_plan.get('INQUIRIES', {}).get('priority_2', {}).get('title', 'Create clear call-to-action')]
-                if action_plan.get('INQUIRIES', {}).get('priority_1', {}).get('title')
-                else [
-                    'Add case studies to newsletter',
-                    'Include testimonials in every email',
-                    'Create clear call-to-action'
-                ]
-            ),
-            'suggestions': [
-                'Add inquiry form to website',
-                'Make booking process easier',
-                'Show social proof on landing pages'
-            ]
-        },
-        'funnel_flow': {
-            'area_name': 'Funnel Flow Overview',
-            'status': 'warning' if bottleneck_name in ['LEAD CAPTURE', 'INQUIRIES'] else 'good',
-            'what_is_good': 'Your funnel is working end-to-end',
-            'what_is_bad': f"Bottleneck identified: {bottleneck_name}" if bottleneck_name != 'UNKNOWN' else None,
-            'improvements': [
-                f"Focus on fixing {bottleneck_name.lower()} first",
-                'Optimize each stage sequentially',
-                'Track conversion rates between stages'
-            ],
-            'suggestions': [
-                'Set up funnel tracking',
-                'A/B test each stage',
-                'Monitor drop-off points'
-            ]
-        },
-        'funnel_awareness': {
-            'area_name': 'Awareness Stage',
-            'status': 'good' if metrics.get('total_impressions', 0) >= 5000 else 'warning',
-            'current_value': metrics.get('total_impressions', 0),
-            'target_value': 5000,
-            'what_is_good': 'Good reach across multiple channels' if metrics.get('total_impressions', 0) >= 3000 else None,
-            'what_is_bad': f"Total impressions is {metrics.get('total_impressions', 0):,} vs target 5,000" if metrics.get('total_impressions', 0) < 5000 else None,
-            'improvements': (
-                [action_plan.get('AWARENESS', {}).get('priority_1', {}).get('title'), action_plan.get('AWARENESS', {}).get('priority_2', {}).get('title', 'Increase content frequency')]
-                if action_plan.get('AWARENESS', {}).get('priority_1', {}).get('title')
-                else [
-                    'Post 3x per week on Instagram',
-                    'Guest post on relevant blogs',
-                    'Increase content frequency'
-                ]
-            ),
-            'suggestions': [
-                'Focus on high-intent keywords',
-                'Collaborate with other creators',
-                'Repurpose content across platforms'
-            ]
-        },
-        'funnel_capture': {
-            'area_name': 'Email Capture Stage',
-            'status': 'critical' if metrics.get('capture_rate', 0) < 2 else 'warning' if metrics.get('capture_rate', 0) < 4 else 'good',
-            'current_value': metrics.get('new_subscribers', 0),
-            'target_value': int(metrics.get('total_impressions', 0) * 0.04),
-            'what_is_good': 'Good capture rate' if metrics.get('capture_rate', 0) >= 4 else None,
-            'what_is_bad': f"Capture rate is {metrics.get('capture_rate', 0):.1f}% vs target 4%" if metrics.get('capture_rate', 0) < 4 else None,
-            'improvements': (
-                [action_plan.get('LEAD CAPTURE', {}).get('priority_1', {}).get('title'), action_plan.get('LEAD CAPTURE', {}).get('priority_2', {}).get('title', 'Add exit-intent popup')]
-                if action_plan.get('LEAD CAPTURE', {}).get('priority_1', {}).get('title')
-                else [
-                    'Add ebook popup to blog',
-                    'Create exit-intent popup',
-                    'Add lead magnet to every post'
-                ]
-            ),
-            'suggestions': [
-                'Test different lead magnet offers',
-                'Simplify signup form',
-                'Add social proof'
-            ]
-        },
-        'funnel_nurture': {
-            'area_name': 'Inquiry Stage',
-            'status': 'warning' if metrics.get('inquiry_rate', 0) < 1 else 'good',
-            'current_value': metrics.get('inquiries', 0),
-            'target_value': int(metrics.get('total_subscribers', 0) * 0.015),
-            'what_is_good': 'Good inquiry rate' if metrics.get('inquiry_rate', 0) >= 1 else None,
-            'what_is_bad': f"Inquiry rate is {metrics.get('inquiry_rate', 0):.1f}% vs target 1%" if metrics.get('inquiry_rate', 0) < 1 else None,
-            'improvements': (
-                [action_plan.get('INQUIRIES', {}).get('priority_1', {}).get('title'), action_plan.get('INQUIRIES', {}).get('priority_2', {}).get('title', 'Add testimonials')]
-                if action_plan.get('INQUIRIES', {}).get('priority_1', {}).get('title')
-                else [
-                    'Add case studies to newsletter',
-                    'Include testimonials in emails',
-                    'Create clear call-to-action'
-                ]
-            ),
-            'suggestions': [
-                'Add inquiry form to website',
-                'Make booking process easier',
-                'Show social proof on landing pages'
-            ]
-        },
-        'funnel_conversion': {
-            'area_name': 'Conversion Stage',
-            'status': 'good' if metrics.get('close_rate', 0) >= 40 else 'warning',
-            'current_value': metrics.get('calls_booked', 0),
-            'target_value': metrics.get('inquiries', 0),
-            'what_is_good': 'Excellent close rate' if metrics.get('close_rate', 0) >= 40 else None,
-            'what_is_bad': f"Close rate is {metrics.get('close_rate', 0):.0f}% vs target 40%" if metrics.get('close_rate', 0) < 40 else None,
-            'improvements': (
-                [action_plan.get('CLOSE RATE', {}).get('priority_1', {}).get('title'), action_plan.get('CLOSE RATE', {}).get('priority_2', {}).get('title', 'Create call checklist')]
-                if action_plan.get('CLOSE RATE', {}).get('priority_1', {}).get('title')
-                else [
-                    'Record and analyze sales calls',
-                    'Create call preparation checklist',
-                    'Follow up with warm leads'
-                ]
-            ),
-            'suggestions': [
-                'Improve discovery call process',
-                'Address common objections',
-                'Follow up within 24 hours'
-            ]
-        },
-        'stage_awareness': {
-            'area_name': 'Awareness Stage',
-            'status': 'good' if metrics.get('total_reach', 0) >= 5000 else 'warning',
-            'what_is_good': 'Good reach across multiple channels' if metrics.get('total_reach', 0) >= 3000 else None,
-            'what_is_bad': f"Total reach is {metrics.get('total_reach', 0):,} vs target 5,000" if metrics.get('total_reach', 0) < 5000 else None,
-            'improvements': (
-                [action_plan.get('AWARENESS', {}).get('priority_1', {}).get('title'), action_plan.get('AWARENESS', {}).get('priority_2', {}).get('title', 'Increase content frequency')]
-                if action_plan.get('AWARENESS', {}).get('priority_1', {}).get('title')
-                else [
-                    'Post 3x per week on Instagram',
-                    'Guest post on relevant blogs',
-                    'Increase content frequency'
-                ]
-            ),
-            'suggestions': [
-                'Focus on high-intent keywords',
-                'Collaborate with other creators',
-                'Repurpose content across platforms'
-            ]
-        },
-        'stage_capture': {
-            'area_name': 'Lead Capture Stage',
-            'status': 'critical' if metrics.get('capture_rate', 0) < 2 else 'warning' if metrics.get('capture_rate', 0) < 4 else 'good',
-            'what_is_good': 'Good capture rate' if metrics.get('capture_rate', 0) >= 4 else None,
-            'what_is_bad': f"Capture rate is {metrics.get('capture_rate', 0):.1f}% vs target 4%" if metrics.get('capture_rate', 0) < 4 else None,
-            'improvements': action_plan.get('LEAD CAPTURE', {}).get('priority_1', {}).get('title') and [
-                action_plan['LEAD CAPTURE']['priority_1']['title'],
-                action_plan['LEAD CAPTURE'].get('priority_2', {}).get('title', 'Add exit-intent popup')
-            ] or [
-                'Add ebook popup to blog',
-                'Create exit-intent popup',
-                'Add lead magnet to every post'
-            ],
-            'suggestions': [
-                'Test different lead magnet offers',
-                'Simplify signup form',
-                'Add social proof'
-            ]
-        },
-        'stage_nurture': {
-            'area_name': 'Nurture Stage',
-            'status': 'good' if metrics.get('open_rate', 0) >= 40 else 'warning',
-            'what_is_good': 'Strong email engagement' if metrics.get('open_rate', 0) >= 40 else None,
-            'what_is_bad': f"Open rate is {metrics.get('open_rate', 0):.1f}% vs target 40%" if metrics.get('open_rate', 0) < 40 else None,
-            'improvements': action_plan.get('ENGAGEMENT', {}).get('priority_1', {}).get('title') and [
-                action_plan['ENGAGEMENT']['priority_1']['title'],
-                action_plan['ENGAGEMENT'].get('priority_2', {}).get('title', 'Add clear CTAs')
-            ] or [
-                'Improve email subject lines',
-                'Add clear CTAs in emails',
-                'Test send times'
-            ],
-            'suggestions': [
-                'Segment list for targeted content',
-                'A/B test subject lines',
-                'Personalize email content'
-            ]
-        },
-        'stage_conversion': {
-            'area_name': 'Conversion Stage',
-            'status': 'good' if metrics.get('close_rate', 0) >= 40 else 'warning',
-            'what_is_good': 'Excellent close rate' if metrics.get('close_rate', 0) >= 40 else None,
-            'what_is_bad': f"Close rate is {metrics.get('close_rate', 0):.0f}% vs target 40%" if metrics.get('close_rate', 0) < 40 else f"Low inquiry volume ({metrics.get('inquiries', 0)} per week)" if metrics.get('inquiries', 0) < 5 else None,
-            'improvements': action_plan.get('INQUIRIES', {}).get('priority_1', {}).get('title') and [
-                action_plan['INQUIRIES']['priority_1']['title'],
-                action_plan['INQUIRIES'].get('priority_2', {}).get('title', 'Add testimonials')
-            ] or [
-                'Add case studies to newsletter',
-                'Include testimonials in emails',
-                'Create clear call-to-action'
-            ],
-            'suggestions': [
-                'Record and analyze sales calls',
-                'Create call preparation checklist',
-                'Follow up with warm leads'
-            ]
-        }
-    }
+@app.route('/api/dashboard/bundle', methods=['GET'])
+@conditional_get(_bundle_versions)
+def api_get_dashboard_bundle():
+    """
+    Get several dashboard panels in one request.
     
-    return area_map.get(area, {
-        'area_name': area.replace('_', ' ').title(),
-        'status': 'good',
-        'what_is_good': 'This area is performing well',
-        'improvements': ['Continue monitoring performance']
-    })
+    Query params: client_id (required), panels (comma-separated subset of
+    socials,products,growth,posts,metrics,analysis; default all) and areas
+    (comma-separated analysis areas; default funnel_flow).
+    """
+    try:
+        client_id = request.args.get('client_id')
+        if not client_id:
+            return jsonify({"error": "client_id required"}), 400
+        
+        panels_arg = request.args.get('panels')
+        panels = [p.strip() for p in panels_arg.split(',') if p.strip()] if panels_arg else list(BUNDLE_PANELS)
+        unknown = [p for p in panels if p not in BUNDLE_PANELS]
+        if unknown:
+            return jsonify({"error": f"Unknown panels: {', '.join(unknown)}", "available": list(BUNDLE_PANELS)}), 400
+        
+        areas_arg = request.args.get('areas')
+        areas = [a.strip() for a in areas_arg.split(',') if a.strip()] if areas_arg else None
+        
+        client = load_dashboard_client(client_id)
+        bundle = get_dashboard_bundle(
+            client,
+            list(dict.fromkeys(panels)),
+            get_loader().load_derivatives,
+            areas=areas,
+            deadline=Deadline(DASHBOARD_BUNDLE_DEADLINE_SECONDS)
+        )
+        return jsonify(bundle)
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
 
 @app.route('/api/clients/<client_id>/connect/<platform>', methods=['POST'])
 def api_connect_platform(client_id, platform):
@@ -2334,15 +1464,13 @@ def api_get_brand_identity(client_id):
             return jsonify({"error": "Authentication required"}), 401
         
         # Verify user has access to this client
-        from content.supabase_storage import get_user_client_role
-        role = get_user_client_role(user['id'], client_id)
+        role = get_loader().get_user_client_role(user['id'], client_id)
         if not role:
             return jsonify({"error": "Access denied to this project"}), 403
         
         # Try Supabase first
         try:
-            from content.supabase_storage import load_clients_from_supabase
-            clients = load_clients_from_supabase(user_id=user['id'])
+            clients = get_loader().load_clients(user_id=user['id'])
             for client in clients:
                 if client.get('client_id') == client_id:
                     brand = client.get('brand') or {}
@@ -2352,17 +1480,11 @@ def api_get_brand_identity(client_id):
             print(f"⚠️ Supabase lookup failed: {e}")
         
         # Fallback to JSON file
-        try:
-            with open('clients.json', 'r') as f:
-                data = json.load(f)
-            
-            for client in data.get('clients', []):
-                if client.get('client_id') == client_id:
-                    brand = client.get('brand') or {}
-                    identity = brand.get('identity', {})
-                    return jsonify({"identity": identity})
-        except FileNotFoundError:
-            pass
+        client = get_registered_client(client_id)
+        if client:
+            brand = client.get('brand') or {}
+            identity = brand.get('identity', {})
+            return jsonify({"identity": identity})
         
         return jsonify({"identity": {}})
     except Exception as e:
@@ -2381,8 +1503,7 @@ def api_update_brand_identity(client_id):
             return jsonify({"error": "Authentication required"}), 401
         
         # Verify user has access to this client
-        from content.supabase_storage import get_user_client_role
-        role = get_user_client_role(user['id'], client_id)
+        role = get_loader().get_user_client_role(user['id'], client_id)
         if not role:
             return jsonify({"error": "Access denied to this project"}), 403
         
@@ -2390,8 +1511,8 @@ def api_update_brand_identity(client_id):
         
         # Try Supabase first
         try:
-            from content.supabase_storage import load_clients_from_supabase, save_client_to_supabase
-            clients = load_clients_from_supabase(user_id=user['id'])
+            from content.supabase_storage import save_client_to_supabase
+            clients = get_loader().load_clients(user_id=user['id'])
             for client in clients:
                 if client.get('client_id') == client_id:
                     if 'brand' not in client:
@@ -2449,8 +1570,7 @@ def api_upload_brand_asset(client_id):
             return jsonify({"error": "Authentication required"}), 401
         
         # Verify user has access to this client
-        from content.supabase_storage import get_user_client_role
-        role = get_user_client_role(user['id'], client_id)
+        role = get_loader().get_user_client_role(user['id'], client_id)
         if not role:
             return jsonify({"error": "Access denied to this project"}), 403
         
@@ -2506,8 +1626,7 @@ def api_start_onboarding(client_id):
             return jsonify({"error": "Authentication required"}), 401
         
         # Verify user has access to this client
-        from content.supabase_storage import get_user_client_role
-        role = get_user_client_role(user['id'], client_id)
+        role = get_loader().get_user_client_role(user['id'], client_id)
         if not role:
             return jsonify({"error": "Access denied to this project"}), 403
         
@@ -2518,8 +1637,7 @@ def api_start_onboarding(client_id):
         # Get client name
         client_name = None
         try:
-            from content.supabase_storage import load_clients_from_supabase
-            clients = load_clients_from_supabase(user_id=user['id'])
+            clients = get_loader().load_clients(user_id=user['id'])
             for client in clients:
                 if client.get('client_id') == client_id:
                     client_name = client.get('name', 'this brand')
@@ -2549,8 +1667,7 @@ def api_get_question(client_id):
             return jsonify({"error": "Authentication required"}), 401
         
         # Verify user has access to this client
-        from content.supabase_storage import get_user_client_role
-        role = get_user_client_role(user['id'], client_id)
+        role = get_loader().get_user_client_role(user['id'], client_id)
         if not role:
             return jsonify({"error": "Access denied to this project"}), 403
         
@@ -2586,8 +1703,7 @@ def api_submit_answer(client_id):
             return jsonify({"error": "Authentication required"}), 401
         
         # Verify user has access to this client
-        from content.supabase_storage import get_user_client_role
-        role = get_user_client_role(user['id'], client_id)
+        role = get_loader().get_user_client_role(user['id'], client_id)
         if not role:
             return jsonify({"error": "Access denied to this project"}), 403
         
@@ -2623,8 +1739,7 @@ def api_complete_interview(client_id):
             return jsonify({"error": "Authentication required"}), 401
         
         # Verify user has access to this client
-        from content.supabase_storage import get_user_client_role
-        role = get_user_client_role(user['id'], client_id)
+        role = get_loader().get_user_client_role(user['id'], client_id)
         if not role:
             return jsonify({"error": "Access denied to this project"}), 403
         
@@ -2657,8 +1772,7 @@ def api_save_persona(client_id):
             return jsonify({"error": "Authentication required"}), 401
         
         # Verify user has access to this client
-        from content.supabase_storage import get_user_client_role
-        role = get_user_client_role(user['id'], client_id)
+        role = get_loader().get_user_client_role(user['id'], client_id)
         if not role:
             return jsonify({"error": "Access denied to this project"}), 403
         
@@ -2670,8 +1784,8 @@ def api_save_persona(client_id):
         
         # Save to brand.persona field
         try:
-            from content.supabase_storage import load_clients_from_supabase, save_client_to_supabase
-            clients = load_clients_from_supabase(user_id=user['id'])
+            from content.supabase_storage import save_client_to_supabase
+            clients = get_loader().load_clients(user_id=user['id'])
             for client in clients:
                 if client.get('client_id') == client_id:
                     if 'brand' not in client:
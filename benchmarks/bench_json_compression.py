@@ -0,0 +1,98 @@
+"""
+Benchmark JSON serialization and response compression for the content APIs.
+
+Builds the /api/content/posts and /api/content/derivatives payloads from the
+shipped content_posts.json / content_derivatives.json fixtures and compares:
+- Flask's default stdlib encoding (sort_keys, compact) vs orjson
+- uncompressed vs gzip vs brotli (sizes and encode time)
+
+Usage:
+    python benchmarks/bench_json_compression.py [--repeat 200] [--scale 1]
+
+--scale N repeats the fixture records N times to approximate larger accounts.
+orjson and brotli are optional; missing ones are reported and skipped.
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.compression import BROTLI_QUALITY, GZIP_LEVEL  # noqa: E402
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+FIXTURES = {
+    '/api/content/posts': ('content_posts.json', 'posts'),
+    '/api/content/derivatives': ('content_derivatives.json', 'derivatives'),
+}
+
+
+def load_payload(filename, key, scale):
+    with open(os.path.join(ROOT, filename), 'r') as f:
+        records = json.load(f).get(key, [])
+    return {key: records * scale}
+
+
+def stdlib_dumps(obj):
+    # Flask's DefaultJSONProvider outside debug mode
+    return json.dumps(obj, ensure_ascii=True, sort_keys=True, separators=(',', ':'))
+
+
+def orjson_dumps(obj):
+    return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS).decode()
+
+
+def timeit(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def bench(route, payload, repeat):
+    print(f"\n{route}  ({len(next(iter(payload.values())))} records)")
+
+    ms, body = timeit(lambda: stdlib_dumps(payload), repeat)
+    print(f"  encode  stdlib json  {ms:8.3f} ms")
+    if orjson:
+        orjson_ms, _ = timeit(lambda: orjson_dumps(payload), repeat)
+        print(f"  encode  orjson       {orjson_ms:8.3f} ms   ({ms / orjson_ms:.1f}x faster)")
+    else:
+        print("  encode  orjson       (not installed)")
+
+    raw = body.encode()
+    print(f"  size    identity     {len(raw):8d} B")
+    gzip_ms, gz = timeit(lambda: gzip.compress(raw, compresslevel=GZIP_LEVEL), repeat)
+    print(f"  gzip    level {GZIP_LEVEL}      {len(gz):8d} B   {len(gz) / len(raw):6.1%}   {gzip_ms:7.3f} ms")
+    if brotli:
+        br_ms, br = timeit(lambda: brotli.compress(raw, quality=BROTLI_QUALITY), repeat)
+        print(f"  brotli  quality {BROTLI_QUALITY}    {len(br):8d} B   {len(br) / len(raw):6.1%}   {br_ms:7.3f} ms")
+    else:
+        print("  brotli               (not installed)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--scale', type=int, default=1)
+    args = parser.parse_args()
+
+    for route, (filename, key) in FIXTURES.items():
+        bench(route, load_payload(filename, key, args.scale), args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+"""
+Accuracy and speed of the social_scraper parsers over the saved page corpus.
+
+For every page listed in benchmarks/fixtures/social/expected.json this:
+- checks the ``_scrape_<platform>`` result against the expected dict
+- times the parse (median CPU time, pages/s and MB/s over --repeat runs)
+- measures peak memory allocated during one parse (tracemalloc)
+- reports which tier served it (1 = regexes only, 2 = body tree)
+and then checks and times ``_parse_count`` over the listed inputs.
+
+Usage:
+    python benchmarks/bench_scraper_corpus.py [--repeat 20] [--platform x] [--check-only]
+
+Runs fully offline (parsers only, no fetching). Exits with status 1 when any
+result differs from its expected value, so it can gate parser changes.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import social_scraper  # noqa: E402
+from bench_scraper_parse import tier_used  # noqa: E402
+
+FIXTURE_DIR = os.path.join(ROOT, 'benchmarks', 'fixtures', 'social')
+MANIFEST = os.path.join(FIXTURE_DIR, 'expected.json')
+
+
+def load_manifest():
+    with open(MANIFEST, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def mismatches(result, expected):
+    """Field-by-field differences between a parse result and its expected dict"""
+    if result is None:
+        return ['parser returned None']
+    return [
+        f"{field}: got {result.get(field)!r}, expected {value!r}"
+        for field, value in expected.items()
+        if result.get(field) != value
+    ]
+
+
+def cpu_times(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.process_time()
+        fn()
+        times.append(time.process_time() - start)
+    return times
+
+
+def peak_allocated_kb(fn):
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (peak - baseline) / 1024
+
+
+def run_pages(pages, repeat, check_only):
+    failures = 0
+    total_bytes = 0
+    total_seconds = 0.0
+    if not check_only:
+        print(f"{'page':<26} {'KB':>6} {'tier':>4} {'ms/parse':>9} {'pages/s':>9} {'MB/s':>7} {'peak KB':>8}  result")
+
+    for case in pages:
+        with open(os.path.join(FIXTURE_DIR, case['file']), 'r', encoding='utf-8') as f:
+            html = f.read()
+        parser = getattr(social_scraper, f"_scrape_{case['platform']}")
+        url = case['url']
+
+        problems = mismatches(parser(html, url), case['expected'])
+        failures += bool(problems)
+        verdict = 'ok' if not problems else 'FAIL'
+
+        if check_only:
+            print(f"{case['file']:<26} {verdict}")
+        else:
+            times = cpu_times(lambda: parser(html, url), repeat)
+            median = statistics.median(times) or 1e-9
+            total_bytes += len(html) * repeat
+            total_seconds += sum(times)
+            print(f"{case['file']:<26} {len(html) / 1024:6.0f} {tier_used(parser, html, url):>4} "
+                  f"{median * 1000:9.3f} {1 / median:9.0f} {len(html) / median / 1e6:7.1f} "
+                  f"{peak_allocated_kb(lambda: parser(html, url)):8.0f}  {verdict}")
+        for problem in problems:
+            print(f"    {problem}")
+
+    if not check_only and total_seconds:
+        print(f"{'all pages':<26} {'':>6} {'':>4} {'':>9} "
+              f"{len(pages) * repeat / total_seconds:9.0f} {total_bytes / total_seconds / 1e6:7.1f}")
+    return failures
+
+
+def run_parse_count(cases, repeat, check_only):
+    failures = 0
+    for value, expected in cases:
+        got = social_scraper._parse_count(value)
+        if got != expected:
+            failures += 1
+            print(f"    _parse_count({value!r}): got {got!r}, expected {expected!r}")
+
+    verdict = 'ok' if not failures else 'FAIL'
+    if check_only:
+        print(f"{'_parse_count':<26} {verdict}")
+        return failures
+
+    inputs = [value for value, _ in cases]
+    loops = max(1, repeat * 100)
+    start = time.process_time()
+    for _ in range(loops):
+        for value in inputs:
+            social_scraper._parse_count(value)
+    elapsed = time.process_time() - start
+    calls = loops * len(inputs)
+    print(f"\n_parse_count  {len(inputs)} inputs  {elapsed / calls * 1e9:7.0f} ns/call  "
+          f"{calls / elapsed:,.0f} calls/s  "
+          f"peak {peak_allocated_kb(lambda: [social_scraper._parse_count(v) for v in inputs]):.1f} KB  {verdict}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--platform', help='only pages for this platform')
+    parser.add_argument('--check-only', action='store_true', help='check results without timing')
+    args = parser.parse_args()
+
+    manifest = load_manifest()
+    pages = [p for p in manifest['pages'] if not args.platform or p['platform'] == args.platform]
+
+    failures = run_pages(pages, args.repeat, args.check_only)
+    failures += run_parse_count(manifest['parse_count'], args.repeat, args.check_only)
+
+    print(f"\n{'✅ All results match' if not failures else f'❌ {failures} mismatches'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark CPU time per parse of the social_scraper profile parsers.
+
+Runs each ``_scrape_<platform>`` over the saved pages in
+benchmarks/fixtures/social/<platform>.html and compares it with building the
+full BeautifulSoup tree every parse used to start with (html.parser, and
+lxml when installed). Also reports which tier served the result: tier 1 is
+regex-only, tier 2 means the parser fell back to a body tree.
+
+Usage:
+    python benchmarks/bench_scraper_parse.py [--repeat 50] [--platform x]
+
+No network access is needed.
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import social_scraper  # noqa: E402
+from bs4 import BeautifulSoup  # noqa: E402
+
+FIXTURE_DIR = os.path.join(ROOT, 'benchmarks', 'fixtures', 'social')
+
+FIXTURE_URLS = {
+    'linkedin': 'https://www.linkedin.com/in/janedoe',
+    'x': 'https://x.com/janedoe',
+    'threads': 'https://www.threads.net/@janedoe',
+    'instagram': 'https://www.instagram.com/janedoe/',
+    'substack': 'https://acmegrowth.substack.com',
+    'telegram': 'https://t.me/acmegrowth',
+}
+
+
+def cpu_ms(fn, repeat):
+    start = time.process_time()
+    for _ in range(repeat):
+        result = fn()
+    return (time.process_time() - start) / repeat * 1000, result
+
+
+def tier_used(parser, html, url):
+    """1 if the parser finished on regexes alone, 2 if it built a body tree"""
+    calls = []
+    body_text = social_scraper._body_text
+
+    def counting_body_text(page):
+        calls.append(1)
+        return body_text(page)
+
+    social_scraper._body_text = counting_body_text
+    try:
+        parser(html, url)
+    finally:
+        social_scraper._body_text = body_text
+    return 2 if calls else 1
+
+
+def bench(platform, repeat):
+    with open(os.path.join(FIXTURE_DIR, f"{platform}.html"), 'r', encoding='utf-8') as f:
+        html = f.read()
+    url = FIXTURE_URLS[platform]
+    parser = getattr(social_scraper, f"_scrape_{platform}")
+
+    print(f"\n{platform}  ({len(html) // 1024} KB)")
+    parse_ms, result = cpu_ms(lambda: parser(html, url), repeat)
+    print(f"  _scrape_{platform:<10}     {parse_ms:8.3f} ms   tier {tier_used(parser, html, url)}"
+          f"   followers={result['followers'] if result else None}")
+
+    tree_ms, _ = cpu_ms(lambda: BeautifulSoup(html, 'html.parser'), repeat)
+    print(f"  full tree html.parser  {tree_ms:8.3f} ms   ({tree_ms / parse_ms:.0f}x the parser)")
+    if social_scraper.LXML_AVAILABLE:
+        lxml_ms, _ = cpu_ms(lambda: BeautifulSoup(html, 'lxml'), repeat)
+        print(f"  full tree lxml         {lxml_ms:8.3f} ms")
+    else:
+        print("  full tree lxml         (not installed)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--platform', choices=sorted(FIXTURE_URLS))
+    args = parser.parse_args()
+
+    for platform in ([args.platform] if args.platform else FIXTURE_URLS):
+        bench(platform, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
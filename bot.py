@@ -3,6 +3,7 @@ import requests
 import json
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
+from utils.throttle import guarded_request
 
 load_dotenv()
 
@@ -63,7 +64,7 @@ def get_beehiiv_metrics(pub_id, api_key):
     """Fetch newsletter metrics from Beehiiv"""
     url = f"https://api.beehiiv.com/v2/publications/{pub_id}/stats"
     headers = {'Authorization': f'Bearer {api_key}'}
-    response = requests.get(url, headers=headers)
+    response = guarded_request('GET', url, headers=headers)
     data = response.json()
     return {
         'subscribers': data.get('total_subscribers', 0),
@@ -71,28 +72,49 @@ def get_beehiiv_metrics(pub_id, api_key):
         'click_rate': data.get('avg_click_rate', 0)
     }
 
-def get_instagram_metrics(user_id, access_token):
-    """Fetch IG insights"""
-    metrics = 'impressions,reach'
-    since = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
-    until = datetime.now().strftime('%Y-%m-%d')
-    
+# Longest since..until span the Graph API accepts for daily insights
+INSIGHTS_MAX_SPAN_DAYS = 30
+
+def fetch_instagram_insights(user_id, access_token, since, until):
+    """Fetch daily IG insights for since..until (dates, inclusive) as {YYYY-MM-DD: {metric: value}}"""
     url = f"https://graph.facebook.com/v18.0/{user_id}/insights"
-    params = {
-        'metric': metrics,
-        'period': 'day',
-        'since': since,
-        'until': until,
-        'access_token': access_token
-    }
-    
-    response = requests.get(url, params=params)
-    data = response.json()
-    
-    impressions = sum([d['values'][0]['value'] for d in data['data'] if d['name'] == 'impressions'])
-    reach = sum([d['values'][0]['value'] for d in data['data'] if d['name'] == 'reach'])
-    
-    return {'impressions': impressions, 'reach': reach}
+    daily = {}
+    start = since
+    while start <= until:
+        end = min(until, start + timedelta(days=INSIGHTS_MAX_SPAN_DAYS - 1))
+        params = {
+            'metric': 'impressions,reach',
+            'period': 'day',
+            'since': start.strftime('%Y-%m-%d'),
+            'until': (end + timedelta(days=1)).strftime('%Y-%m-%d'),
+            'access_token': access_token
+        }
+        response = guarded_request('GET', url, params=params)
+        data = response.json()
+        if 'error' in data:
+            raise RuntimeError(f"Instagram insights error: {data['error'].get('message')}")
+
+        for metric in data.get('data', []):
+            for value in metric.get('values', []):
+                # Each value covers the day ending at end_time
+                day = (datetime.fromisoformat(value['end_time'][:10]) - timedelta(days=1)).strftime('%Y-%m-%d')
+                daily.setdefault(day, {})[metric['name']] = value.get('value', 0)
+        start = end + timedelta(days=1)
+    return daily
+
+def instagram_window():
+    """(since, until) dates get_instagram_metrics covers: the last 7 complete days"""
+    until = datetime.now().date() - timedelta(days=1)
+    return until - timedelta(days=6), until
+
+def get_instagram_metrics(user_id, access_token):
+    """IG insights for the last 7 complete days, from the local daily ledger (only missing days are fetched)"""
+    from instagram_ledger import get_ledger
+    since, until = instagram_window()
+    return get_ledger().totals(
+        user_id, since, until,
+        fetch=lambda start, end: fetch_instagram_insights(user_id, access_token, start, end)
+    )
 
 def get_instagram_profile(user_id, access_token):
     """Fetch IG profile info (followers, profile pic, bio)"""
@@ -102,7 +124,7 @@ def get_instagram_profile(user_id, access_token):
             'fields': 'username,biography,profile_picture_url,followers_count',
             'access_token': access_token
         }
-        response = requests.get(url, params=params)
+        response = guarded_request('GET', url, params=params)
         if response.status_code == 200:
             return response.json()
         return None
@@ -119,7 +141,7 @@ def get_vercel_metrics(project_id, token):
         'to': int(datetime.now().timestamp() * 1000)
     }
     
-    response = requests.get(url, headers=headers, params=params)
+    response = guarded_request('GET', url, headers=headers, params=params)
     data = response.json()
     
     return {
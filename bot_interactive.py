@@ -3,7 +3,6 @@ Interactive bot with /metrics command for on-demand reports
 Run this to enable Telegram commands
 """
 import os
-import json
 from datetime import datetime
 from telegram import Update
 from telegram.ext import ApplicationBuilder, CommandHandler, ContextTypes
@@ -25,6 +24,7 @@ from metrics_collector import (
 )
 from report_formatter_dynamic import generate_full_report
 from utils.projects import extract_projects
+from utils.client_registry import get_client_by_chat_id as find_client_by_chat_id
 from content.center_post import create_center_post, list_posts, get_post
 from content.branch_generator import generate_branches
 from content.derivative_generator import generate_derivatives
@@ -117,15 +117,9 @@ async def metrics(update: Update, context: ContextTypes.DEFAULT_TYPE):
 def get_client_by_chat_id(chat_id):
     """Get client data by chat_id"""
     try:
-        with open('clients.json', 'r') as f:
-            clients_data = json.load(f)
-        
-        for c in clients_data['clients']:
-            if str(c.get('chat_id')) == str(chat_id):
-                return c
-    except:
-        pass
-    return None
+        return find_client_by_chat_id(chat_id)
+    except Exception:
+        return None
 
 async def update_metric(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /update command - update manual metrics (dynamic based on client config)"""
@@ -282,14 +276,7 @@ async def content_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         chat_id = str(update.effective_chat.id)
         
         # Find client by chat_id
-        with open('clients.json', 'r') as f:
-            clients_data = json.load(f)
-        
-        client = None
-        for c in clients_data['clients']:
-            if str(c.get('chat_id')) == chat_id:
-                client = c
-                break
+        client = get_client_by_chat_id(chat_id)
         
         if not client:
             await update.message.reply_text("❌ Client not found. Please set up your client in clients.json")
@@ -326,14 +313,7 @@ async def content_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         chat_id = str(update.effective_chat.id)
         
         # Find client by chat_id
-        with open('clients.json', 'r') as f:
-            clients_data = json.load(f)
-        
-        client = None
-        for c in clients_data['clients']:
-            if str(c.get('chat_id')) == chat_id:
-                client = c
-                break
+        client = get_client_by_chat_id(chat_id)
         
         if not client:
             await update.message.reply_text("❌ Client not found")
@@ -369,14 +349,7 @@ async def content_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         chat_id = str(update.effective_chat.id)
         
         # Find client by chat_id
-        with open('clients.json', 'r') as f:
-            clients_data = json.load(f)
-        
-        client = None
-        for c in clients_data['clients']:
-            if str(c.get('chat_id')) == chat_id:
-                client = c
-                break
+        client = get_client_by_chat_id(chat_id)
         
         if not client:
             await update.message.reply_text("❌ Client not found")
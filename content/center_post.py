@@ -26,6 +26,10 @@ def load_content_posts():
     except Exception as e:
         print(f"⚠️ Supabase not available: {e}")
     
+    return load_fallback_posts()
+
+def load_fallback_posts():
+    """Load all content posts from KV, file, or memory cache (skipping Supabase)"""
     # Fallback to KV (for Vercel without Supabase)
     try:
         from .storage import load_posts
@@ -97,6 +101,10 @@ def save_content_posts(data):
                 print("   ⚠️ CRITICAL: Post data is ONLY in memory cache and will be LOST after this request!")
                 print("   ⚠️ Set up Supabase or Vercel KV to persist data.")
                 # Don't raise - allow the function to continue, but warn loudly
+    
+    # Invalidate ETags of responses built from posts
+    from .data_version import bump_version
+    bump_version('posts')
 
 def create_center_post(client_id, raw_idea, auto_expand=True, pillar_id=None, include_cta=False):
     """
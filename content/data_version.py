@@ -0,0 +1,107 @@
+"""
+Cheap version tokens for stored datasets (posts, derivatives, clients, ...).
+
+Used to build HTTP ETags without loading the data itself. A dataset's
+version combines:
+- a write counter bumped by the save functions (shared through KV when
+  connected, so every instance sees other instances' writes)
+- the newest ``updated_at`` and row count in Supabase (catches writes made
+  by other processes, including deletes)
+- the backing files' mtime/size (JSON files in local development, the
+  metrics SQLite database and its write-ahead log)
+
+Any change in those parts changes the token; an unchanged token means the
+data is very likely unchanged.
+"""
+import os
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+# Same default as metrics_store.METRICS_DB_PATH; committed snapshots land in its -wal file first
+METRICS_DB_PATH = os.getenv('METRICS_DB_PATH', 'metrics.db')
+
+# dataset -> (Supabase table, local file or files)
+DATASETS = {
+    'posts': ('posts', 'content_posts.json'),
+    'derivatives': ('derivatives', 'content_derivatives.json'),
+    'clients': ('clients', 'clients.json'),
+    'metrics_history': (None, ('metrics_history.json', METRICS_DB_PATH, f"{METRICS_DB_PATH}-wal")),
+}
+
+_local_counters: Dict[str, int] = {}
+_counter_lock = Lock()
+
+
+def _counter_key(dataset: str) -> str:
+    return f"content:version:{dataset}"
+
+
+def bump_version(dataset: str) -> None:
+    """Record a write to ``dataset`` (call after saving it)"""
+    with _counter_lock:
+        _local_counters[dataset] = _local_counters.get(dataset, 0) + 1
+    try:
+        from .storage import get_redis_client
+        redis_client = get_redis_client()
+        if redis_client:
+            redis_client.incr(_counter_key(dataset))
+    except Exception as e:
+        print(f"⚠️ Could not bump {dataset} version in KV: {e}")
+
+
+def _shared_counter(dataset: str) -> Optional[str]:
+    try:
+        from .storage import get_redis_client
+        redis_client = get_redis_client()
+        if redis_client:
+            value = redis_client.get(_counter_key(dataset))
+            return value.decode() if isinstance(value, bytes) else str(value or 0)
+    except Exception as e:
+        print(f"⚠️ Could not read {dataset} version from KV: {e}")
+    return None
+
+
+def _supabase_marker(table: str) -> Optional[str]:
+    try:
+        from .supabase_storage import get_supabase_client
+        client = get_supabase_client()
+        if not client:
+            return None
+        response = (client.table(table)
+                    .select('updated_at', count='exact')
+                    .order('updated_at', desc=True)
+                    .limit(1)
+                    .execute())
+        latest = response.data[0].get('updated_at') if response.data else None
+        return f"{latest}|{response.count}"
+    except Exception as e:
+        print(f"⚠️ Could not read {table} version from Supabase: {e}")
+        return None
+
+
+def _file_marker(path: str) -> str:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return 'missing'
+    return f"{st.st_mtime_ns}|{st.st_size}"
+
+
+def dataset_version(dataset: str) -> str:
+    """
+    Version token for ``dataset``.
+
+    Costs at most one KV GET and one single-row Supabase query; file-only
+    datasets just stat their files.
+    """
+    table, path = DATASETS.get(dataset, (None, None))
+    parts: List[Any] = [dataset]
+    with _counter_lock:
+        parts.append(_local_counters.get(dataset, 0))
+    parts.append(_shared_counter(dataset))
+    if table:
+        parts.append(_supabase_marker(table))
+    if path:
+        paths = (path,) if isinstance(path, str) else path
+        parts.extend(_file_marker(p) for p in paths)
+    return ':'.join(str(p) for p in parts)
@@ -105,6 +105,10 @@ def save_derivatives(data):
                 print("   Derivative data is cached in memory for this session only.")
                 print("   To persist data, set up Supabase or Vercel KV.")
                 # Don't raise - allow the function to continue
+    
+    # Invalidate ETags of responses built from derivatives
+    from .data_version import bump_version
+    bump_version('derivatives')
 
 def update_derivative(deriv_id, updates):
     """Update a derivative with new data"""
@@ -146,25 +150,20 @@ def generate_derivatives(post_id, include_podcast=False, platforms=None, client_
     brand_config = None
     if client_id:
         try:
-            import json
-            import os
-            if os.path.exists('clients.json'):
-                with open('clients.json', 'r') as f:
-                    clients_data = json.load(f)
-                    for client in clients_data.get('clients', []):
-                        if client.get('client_id') == client_id:
-                            brand_socials = (client.get('brand') or {}).get('socials', {})
-                            # Store full brand config for persona access
-                            brand_config = {'brand': client.get('brand') or {}}
-                            # Get CTA info if post has include_cta flag
-                            if post.get('include_cta'):
-                                main_product = (client.get('brand') or {}).get('main_product', {})
-                                if main_product.get('cta_text') and main_product.get('cta_url'):
-                                    cta_info = {
-                                        'text': main_product['cta_text'],
-                                        'url': main_product['cta_url']
-                                    }
-                            break
+            from utils.client_registry import get_client
+            client = get_client(client_id)
+            if client:
+                brand_socials = (client.get('brand') or {}).get('socials', {})
+                # Store full brand config for persona access
+                brand_config = {'brand': client.get('brand') or {}}
+                # Get CTA info if post has include_cta flag
+                if post.get('include_cta'):
+                    main_product = (client.get('brand') or {}).get('main_product', {})
+                    if main_product.get('cta_text') and main_product.get('cta_url'):
+                        cta_info = {
+                            'text': main_product['cta_text'],
+                            'url': main_product['cta_url']
+                        }
         except Exception as e:
             print(f"Warning: Could not load brand social settings: {e}")
     
@@ -2,7 +2,6 @@
 Publishing system for derivatives
 """
 import os
-import json
 from datetime import datetime
 from .derivative_generator import load_derivatives, save_derivatives, get_derivatives
 from dotenv import load_dotenv
@@ -70,21 +69,13 @@ def get_beehiiv_credentials(client_id):
     Returns:
         tuple: (pub_id, api_key) or (None, None) if not configured
     """
-    import json
+    from utils.client_registry import get_client, clients_file_exists
     
-    try:
-        with open('clients.json', 'r') as f:
-            clients_data = json.load(f)
-    except FileNotFoundError:
+    if not clients_file_exists():
         print(f"⚠️ clients.json not found, cannot get Beehiiv credentials")
         return None
     
-    client = None
-    for c in clients_data.get('clients', []):
-        if c.get('client_id') == client_id:
-            client = c
-            break
-    
+    client = get_client(client_id)
     if not client:
         return None, None
     
@@ -406,20 +397,13 @@ def publish_queued_derivatives():
                     deriv_type = derivative.get('type')
                     post_id = derivative.get('post_id')
                     
-                    # Get client info for chat_id
-                    try:
-                        with open('clients.json', 'r') as f:
-                            clients_data = json.load(f)
-                    except FileNotFoundError:
-                        print(f"⚠️ clients.json not found, skipping scheduled publish")
-                        clients_data = {"clients": []}
-                    
                     # Find client from post
                     from .center_post import get_post
                     post = get_post(post_id)
                     if post:
                         client_id = post.get('client_id')
-                        client = next((c for c in clients_data.get('clients', []) if c.get('client_id') == client_id), None)
+                        from utils.client_registry import get_client
+                        client = get_client(client_id)
                         chat_id = client.get('chat_id') if client else None
                         
                         # Publish based on type
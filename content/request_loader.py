@@ -0,0 +1,174 @@
+"""
+Request-scoped data loader for storage lookups.
+
+A single API request can ask for the same post, role, client list or
+derivatives several times. RequestLoader memoizes those lookups for the
+lifetime of one Flask request (stored on ``flask.g``), batches multi-key
+lookups into single ``in_`` queries, and counts backend round trips so
+fan-out regressions show up in logs and the ``X-Backend-Round-Trips`` header.
+
+Outside a request context get_loader() returns a fresh, unshared loader, so
+the same code paths work from the bot, scheduler and background threads.
+"""
+from typing import Optional, List, Dict, Any, Iterable
+
+from .supabase_storage import (
+    get_supabase_client,
+    get_posts_from_supabase,
+    get_user_client_roles,
+    load_clients_from_supabase,
+    load_clients_by_ids_from_supabase,
+)
+
+# Sentinel for "looked up, not found" so misses are memoized too
+_MISSING = object()
+
+
+class RequestLoader:
+    """Memoizing, batching facade over content storage for one request"""
+
+    def __init__(self):
+        self.round_trips = 0
+        self._posts: Dict[str, Any] = {}
+        self._roles: Dict[tuple, Any] = {}
+        self._clients: Dict[Optional[str], List[Dict[str, Any]]] = {}
+        self._clients_by_id: Dict[str, Any] = {}
+        self._derivatives: Dict[Optional[str], Dict[str, Any]] = {}
+        self._versions: Dict[str, str] = {}
+
+    # ---------- posts ----------
+
+    def get_posts(self, post_ids: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Posts keyed by id (None for missing), fetched in one batch where possible"""
+        post_ids = [pid for pid in dict.fromkeys(post_ids) if pid]
+        missing = [pid for pid in post_ids if pid not in self._posts]
+        if missing:
+            found = {}
+            if get_supabase_client():
+                self.round_trips += 1
+                found = get_posts_from_supabase(missing)
+            for pid in missing:
+                if pid in found:
+                    self._posts[pid] = found[pid]
+            # Posts not in Supabase: one KV/file/memory load for all of them
+            not_found = [pid for pid in missing if pid not in self._posts]
+            if not_found:
+                from .center_post import load_fallback_posts
+                self.round_trips += 1
+                fallback = {p.get('id'): p for p in load_fallback_posts().get('posts', [])}
+                for pid in not_found:
+                    self._posts[pid] = fallback.get(pid, _MISSING)
+        return {pid: self._value(self._posts[pid]) for pid in post_ids}
+
+    def get_post(self, post_id: str) -> Optional[Dict[str, Any]]:
+        return self.get_posts([post_id]).get(post_id)
+
+    # ---------- access control ----------
+
+    def get_user_client_roles(self, user_id: str, client_ids: Iterable[str]) -> Dict[str, Optional[str]]:
+        """User's role per client (None if no access), fetched in one batch"""
+        client_ids = [cid for cid in dict.fromkeys(client_ids) if cid]
+        missing = [cid for cid in client_ids if (user_id, cid) not in self._roles]
+        if missing:
+            self.round_trips += 1
+            roles = get_user_client_roles(user_id, missing)
+            for cid in missing:
+                self._roles[(user_id, cid)] = roles.get(cid, _MISSING)
+        return {cid: self._value(self._roles[(user_id, cid)]) for cid in client_ids}
+
+    def get_user_client_role(self, user_id: str, client_id: str) -> Optional[str]:
+        return self.get_user_client_roles(user_id, [client_id]).get(client_id)
+
+    # ---------- clients ----------
+
+    def load_clients(self, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Clients accessible by user_id (all clients if None)"""
+        if user_id not in self._clients:
+            # user_clients + clients queries when scoped to a user
+            self.round_trips += 2 if user_id else 1
+            clients = load_clients_from_supabase(user_id=user_id)
+            self._clients[user_id] = clients
+            for client in clients:
+                client_id = client.get('client_id')
+                if not client_id:
+                    continue
+                self._clients_by_id.setdefault(client_id, client)
+                if user_id and client.get('user_role'):
+                    self._roles[(user_id, client_id)] = client['user_role']
+        return self._clients[user_id]
+
+    def get_clients(self, client_ids: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Clients keyed by client_id (None for missing), fetched in one batch"""
+        client_ids = [cid for cid in dict.fromkeys(client_ids) if cid]
+        missing = [cid for cid in client_ids if cid not in self._clients_by_id]
+        if missing:
+            self.round_trips += 1
+            found = {c.get('client_id'): c for c in load_clients_by_ids_from_supabase(missing)}
+            for cid in missing:
+                self._clients_by_id[cid] = found.get(cid, _MISSING)
+        return {cid: self._value(self._clients_by_id[cid]) for cid in client_ids}
+
+    def get_client(self, client_id: str) -> Optional[Dict[str, Any]]:
+        return self.get_clients([client_id]).get(client_id)
+
+    # ---------- derivatives ----------
+
+    def load_derivatives(self, post_id: Optional[str] = None) -> Dict[str, Any]:
+        """Same shape as derivative_generator.load_derivatives, memoized per post_id"""
+        if post_id not in self._derivatives:
+            if post_id and None in self._derivatives:
+                # Already have everything; filter instead of another round trip
+                everything = self._derivatives[None].get('derivatives', [])
+                self._derivatives[post_id] = {
+                    "derivatives": [d for d in everything if d.get('post_id') == post_id]
+                }
+            else:
+                from .derivative_generator import load_derivatives
+                self.round_trips += 1
+                self._derivatives[post_id] = load_derivatives(post_id=post_id)
+        return self._derivatives[post_id]
+
+    def forget_derivatives(self) -> None:
+        """Drop memoized derivatives after a write in this request"""
+        self._derivatives.clear()
+
+    # ---------- versions ----------
+
+    def get_version(self, dataset: str) -> str:
+        """data_version.dataset_version, memoized for the request"""
+        if dataset not in self._versions:
+            from .data_version import dataset_version
+            self.round_trips += 1
+            self._versions[dataset] = dataset_version(dataset)
+        return self._versions[dataset]
+
+    @staticmethod
+    def _value(entry):
+        return None if entry is _MISSING else entry
+
+
+def get_loader() -> RequestLoader:
+    """Loader for the current Flask request, or a fresh one outside a request"""
+    try:
+        from flask import g, has_request_context
+    except ImportError:
+        return RequestLoader()
+    if not has_request_context():
+        return RequestLoader()
+    loader = getattr(g, 'data_loader', None)
+    if loader is None:
+        loader = RequestLoader()
+        g.data_loader = loader
+    return loader
+
+
+def current_round_trips() -> Optional[int]:
+    """Round trips recorded for the current request, or None if no loader was used"""
+    try:
+        from flask import g, has_request_context
+    except ImportError:
+        return None
+    if not has_request_context():
+        return None
+    loader = getattr(g, 'data_loader', None)
+    return loader.round_trips if loader else None
@@ -37,6 +37,12 @@ except ImportError:
 except Exception as e:
     print(f"⚠️ Could not connect to KV: {e}")
 
+def get_redis_client():
+    """Return the direct Redis/KV connection if one was established, else None"""
+    if KV_AVAILABLE and redis_client:
+        return redis_client
+    return None
+
 def get_storage_key(key_type, key_id=None):
     """Generate storage key for KV"""
     if key_id:
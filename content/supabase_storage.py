@@ -113,6 +113,19 @@ def get_post_from_supabase(post_id: str) -> Optional[Dict[str, Any]]:
         print(f"⚠️ Error getting post from Supabase: {e}")
         return None
 
+def get_posts_from_supabase(post_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Get several posts in one query, keyed by post id"""
+    client = get_supabase_client()
+    if not client or not post_ids:
+        return {}
+    
+    try:
+        response = client.table('posts').select('*').in_('id', list(post_ids)).execute()
+        return {post['id']: post for post in (response.data or [])}
+    except Exception as e:
+        print(f"⚠️ Error getting posts from Supabase: {e}")
+        return {}
+
 # ==================== DERIVATIVES ====================
 
 def load_derivatives_from_supabase(post_id: Optional[str] = None) -> Dict[str, Any]:
@@ -316,6 +329,8 @@ def save_client_to_supabase(client_data: Dict[str, Any]) -> bool:
         
         client.table('clients').upsert(client_dict, on_conflict='client_id').execute()
         print(f"✅ Saved client {client_dict.get('client_id')} to Supabase")
+        from .data_version import bump_version
+        bump_version('clients')
         return True
     except Exception as e:
         print(f"⚠️ Error saving client to Supabase: {e}")
@@ -351,6 +366,32 @@ def get_user_client_role(user_id: str, client_id: str) -> Optional[str]:
         print(f"⚠️ Error getting user client role: {e}")
         return None
 
+def get_user_client_roles(user_id: str, client_ids: List[str]) -> Dict[str, str]:
+    """Get user's roles for several clients in one query, keyed by client_id"""
+    client = get_supabase_client()
+    if not client or not client_ids:
+        return {}
+    
+    try:
+        response = client.table('user_clients').select('client_id, role').eq('user_id', user_id).in_('client_id', list(client_ids)).execute()
+        return {uc['client_id']: uc['role'] for uc in (response.data or [])}
+    except Exception as e:
+        print(f"⚠️ Error getting user client roles: {e}")
+        return {}
+
+def load_clients_by_ids_from_supabase(client_ids: List[str]) -> List[Dict[str, Any]]:
+    """Load specific clients in one query"""
+    client = get_supabase_client()
+    if not client or not client_ids:
+        return []
+    
+    try:
+        response = client.table('clients').select('*').in_('client_id', list(client_ids)).execute()
+        return response.data if response.data else []
+    except Exception as e:
+        print(f"⚠️ Error loading clients from Supabase: {e}")
+        return []
+
 # ==================== API CREDENTIALS ====================
 
 def load_api_credentials_from_supabase(client_id: str, platform: Optional[str] = None) -> Dict[str, Any]:
@@ -0,0 +1,1053 @@
+"""
+Dashboard data services - plain functions behind the /api/dashboard/* routes.
+
+Routes and the workspace aggregator call these directly (no loopback HTTP).
+Each function takes an already-resolved client config and returns plain
+Python objects; use load_dashboard_client() once per request and pass the
+result to every service that needs it.
+"""
+import os
+from datetime import datetime, timedelta
+from calendar import month_abbr
+from utils.client_registry import get_client, clients_file_exists
+from utils.throttle import guarded_request
+
+
+def load_dashboard_client(client_id):
+    """Resolve a client config from clients.json, falling back to an empty dummy structure"""
+    if not clients_file_exists():
+        print("⚠️ clients.json not found, using dummy data for dashboard")
+
+    client = get_client(client_id)
+
+    # If client not found, use dummy client structure
+    if not client:
+        print(f"⚠️ Client {client_id} not found, using dummy data")
+        client = {
+            'client_id': client_id,
+            'brand': {
+                'main_product': {},
+                'socials': {}
+            },
+            'connected_accounts': {},
+            'funnel_structure': {}
+        }
+    return client
+
+
+# Platforms shown on the dashboard, in display order
+PLATFORM_CONFIGS = {
+    'linkedin': {'name': 'LinkedIn', 'icon': '💼'},
+    'x': {'name': 'X (Twitter)', 'icon': '🐦'},
+    'threads': {'name': 'Threads', 'icon': '🧵'},
+    'instagram': {'name': 'Instagram', 'icon': '📷'},
+    'substack': {'name': 'Substack', 'icon': '📰'},
+    'telegram': {'name': 'Telegram', 'icon': '✈️'}
+}
+
+# Follower counts shown when no real data could be fetched
+DUMMY_FOLLOWERS = {
+    'linkedin': 1250,
+    'x': 3200,
+    'threads': 890,
+    'instagram': 5600,
+    'substack': 450,
+    'telegram': 1200
+}
+
+# Upper bound on fetching all platforms; latency is the slowest platform, not the sum
+SOCIAL_PROFILES_DEADLINE_SECONDS = float(os.getenv('SOCIAL_PROFILES_DEADLINE', '12'))
+
+
+def enabled_platforms(socials):
+    """Platform ids enabled in brand.socials, in display order"""
+    # If socials is empty or missing, default all platforms to enabled
+    # (matches settings page behavior where platforms default to enabled)
+    socials_empty = not socials or len(socials) == 0
+
+    enabled = []
+    for platform_id in PLATFORM_CONFIGS:
+        # Default to enabled if:
+        # 1. socials is empty/missing (user hasn't configured yet)
+        # 2. platform not in socials
+        # 3. enabled is not explicitly set to false
+        if socials_empty or platform_id not in socials:
+            enabled.append(platform_id)
+        elif (socials.get(platform_id) or {}).get('enabled', True):
+            enabled.append(platform_id)
+    return enabled
+
+
+def _empty_profile(platform_id):
+    platform_info = PLATFORM_CONFIGS[platform_id]
+    return {
+        'platform': platform_id,
+        'name': platform_info['name'],
+        'icon': platform_info['icon'],
+        'followers': 0,
+        'profile_pic': None,
+        'description': '',
+        'username': ''
+    }
+
+
+def fetch_instagram_api_profile(user_id, access_token):
+    """Profile from the Instagram Graph API; raises on API errors"""
+    url = f"https://graph.facebook.com/v18.0/{user_id}"
+    params = {
+        'fields': 'username,biography,profile_picture_url,followers_count',
+        'access_token': access_token
+    }
+    response = guarded_request('GET', url, params=params, timeout=10)
+    if response.status_code != 200:
+        raise RuntimeError(f"Instagram API error: {response.status_code} - {response.text}")
+    instagram_data = response.json()
+    return {
+        'followers': instagram_data.get('followers_count', 0),
+        'username': instagram_data.get('username', ''),
+        'description': instagram_data.get('biography', ''),
+        'profile_pic': instagram_data.get('profile_picture_url')
+    }
+
+
+def get_instagram_api_snapshot(connected, allow_fetch=True):
+    """
+    Graph API profile for a connected Instagram account, via the snapshot store.
+
+    With ``allow_fetch=False`` only a missing snapshot is fetched.
+    """
+    from social_snapshots import get_store
+    user_id = connected.get('user_id')
+    access_token = connected.get('access_token') or os.getenv('INSTAGRAM_ACCESS_TOKEN')
+    if not user_id or not access_token:
+        return None
+    return get_store().get_profile(
+        'instagram',
+        f"graph.facebook.com/{user_id}",
+        lambda: fetch_instagram_api_profile(user_id, access_token),
+        allow_fetch=allow_fetch,
+        fetch_missing=True
+    )
+
+
+def _fetch_platform_profile(platform_id, platform_settings, connected):
+    """
+    Fetch one platform's profile via the Graph API (Instagram) or the scraper.
+
+    Both go through the follower snapshot store, so fresh snapshots are
+    served without any outbound request; while the follower refresh job is
+    keeping snapshots fresh, stale ones are served as-is too. Returns (profile_data, source) where
+    source is 'api', 'scraper' or None if no real data was found.
+    """
+    from follower_refresh import request_fetch_allowed
+    platform_name = PLATFORM_CONFIGS[platform_id]['name']
+    profile_data = _empty_profile(platform_id)
+    source = None
+    allow_fetch = request_fetch_allowed()
+
+    # Fetch real data using web scraper or API
+    profile_url = platform_settings.get('profile_url', '')
+
+    # Try Instagram API first (if connected via OAuth - fallback for existing setups)
+    if platform_id == 'instagram' and connected.get('connected'):
+        try:
+            instagram_data = get_instagram_api_snapshot(connected, allow_fetch=allow_fetch)
+            # Stale data is only retried via the scraper when requests may fetch
+            if instagram_data and (not instagram_data['stale'] or not allow_fetch):
+                _apply_snapshot(profile_data, instagram_data)
+                source = 'api'
+                print(f"✅ Fetched Instagram profile via API: {profile_data['followers']} followers")
+            else:
+                print("⚠️ Instagram API profile unavailable")
+                # Fall through to scraper if API fails
+                profile_url = profile_url or f"https://instagram.com/{connected.get('username', '')}"
+                if instagram_data:
+                    # Keep the last good API data in case the scraper fails too
+                    _apply_snapshot(profile_data, instagram_data)
+                    source = 'api'
+        except Exception as e:
+            print(f"❌ Error fetching Instagram profile via API: {e}")
+            # Fall through to scraper
+            profile_url = profile_url or f"https://instagram.com/{connected.get('username', '')}"
+
+    # Use web scraper if profile URL is provided
+    if profile_url:
+        try:
+            from social_snapshots import get_profile_snapshot
+            scraped_data = get_profile_snapshot(platform_id, profile_url, allow_fetch=allow_fetch, fetch_missing=True)
+            if scraped_data and scraped_data.get('followers', 0) > 0:
+                _apply_snapshot(profile_data, scraped_data)
+                source = 'scraper'
+                print(f"✅ Scraped {platform_name} profile: {profile_data['followers']} followers")
+            elif source:
+                print(f"⚠️ Could not scrape {platform_name} from {profile_url}, keeping last API data")
+            else:
+                print(f"⚠️ Could not scrape {platform_name} from {profile_url}, using dummy data")
+        except Exception as e:
+            print(f"❌ Error scraping {platform_name}: {e}, using dummy data")
+
+    if not profile_data['followers']:
+        source = None
+    return profile_data, source
+
+
+def _apply_snapshot(profile_data, snapshot):
+    profile_data['followers'] = snapshot.get('followers') or 0
+    profile_data['profile_pic'] = snapshot.get('profile_pic')
+    profile_data['description'] = snapshot.get('description') or ''
+    profile_data['username'] = snapshot.get('username') or ''
+    profile_data['fetched_at'] = snapshot.get('fetched_at')
+    profile_data['stale'] = snapshot.get('stale', False)
+
+
+def get_social_profiles(client, deadline=None):
+    """
+    Social media profiles for enabled platforms.
+
+    Platforms are fetched concurrently; any still running when ``deadline``
+    (default SOCIAL_PROFILES_DEADLINE) passes are returned with fallback data.
+    ``platform_status`` reports per platform whether data is live ('ok'),
+    dummy ('fallback'), or the fetch hit 'timeout'/'error'.
+    """
+    from utils.executor import Deadline, fan_out
+
+    brand = client.get('brand') or {}
+    socials = brand.get('socials', {}) or {}
+    connected_accounts = client.get('connected_accounts') or {}
+    deadline = deadline or Deadline(SOCIAL_PROFILES_DEADLINE_SECONDS)
+
+    enabled = enabled_platforms(socials)
+    tasks = {
+        platform_id: (lambda pid=platform_id: _fetch_platform_profile(
+            pid, socials.get(pid) or {}, connected_accounts.get(pid) or {}
+        ))
+        for platform_id in enabled
+    }
+    results = fan_out(tasks, timeout=SOCIAL_PROFILES_DEADLINE_SECONDS, deadline=deadline)
+
+    profiles = []
+    platform_status = {}
+    total_followers = 0
+    for platform_id in enabled:
+        platform_info = PLATFORM_CONFIGS[platform_id]
+        result = results[platform_id]
+        if result.ok:
+            profile_data, source = result.value
+            status = 'ok' if source else 'fallback'
+        else:
+            print(f"⚠️ {platform_info['name']} profile fetch {result.status}: {result.error}")
+            profile_data, source = _empty_profile(platform_id), None
+            status = result.status
+
+        # Always provide dummy data if no real data was fetched
+        if not profile_data['followers']:
+            print(f"ℹ️ {platform_info['name']} using dummy data for testing")
+            profile_data['followers'] = DUMMY_FOLLOWERS.get(platform_id, 0)
+            if not profile_data['username']:
+                profile_data['username'] = f'@{platform_id}_example'
+            if not profile_data['description']:
+                profile_data['description'] = f'Professional {platform_info["name"]} profile'
+
+        profile_data['status'] = status
+        profile_data['source'] = source
+        platform_status[platform_id] = {
+            'status': status,
+            'source': source,
+            'elapsed_ms': result.elapsed_ms,
+            'error': result.error
+        }
+        total_followers += profile_data['followers']
+        profiles.append(profile_data)
+
+    # Real counts feed the client's follower time series (no-op when unchanged)
+    real_counts = {p['platform']: p['followers'] for p in profiles if p['source']}
+    if real_counts:
+        from follower_series import get_series_store
+        get_series_store().record_many(client.get('client_id'), real_counts)
+
+    return {
+        'profiles': profiles,
+        'total_followers': total_followers,
+        'platform_status': platform_status
+    }
+
+
+def get_products(client):
+    """Products with sales/buyers data"""
+    brand = client.get('brand') or {}
+    main_product = brand.get('main_product', {})
+
+    products = []
+    if main_product.get('product_id'):
+        # Return the main product with dummy sales data for testing
+        products.append({
+            'product_id': main_product.get('product_id'),
+            'name': main_product.get('cta_text', 'Main Product') or 'Main Product',
+            'monthly_sales': 12,  # Dummy data for testing
+            'monthly_buyers': 8,  # Dummy data for testing
+            'monthly_revenue': 9600  # Dummy data: 8 buyers × $1,200 average
+        })
+    else:
+        # If no product configured, show dummy data for testing
+        products.append({
+            'product_id': 'product_dummy_001',
+            'name': 'Coaching Program',
+            'monthly_sales': 15,
+            'monthly_buyers': 12,
+            'monthly_revenue': 14400
+        })
+        products.append({
+            'product_id': 'product_dummy_002',
+            'name': 'Discovery Call',
+            'monthly_sales': 8,
+            'monthly_buyers': 8,
+            'monthly_revenue': 0  # Free product
+        })
+
+    return {'products': products}
+
+
+def _client_history_by_month(client_id):
+    """{YYYY-MM: metrics} from saved report snapshots for a client's scopes (latest per month)"""
+    from metrics_store import get_metrics_store
+    by_month = {}
+    if not client_id:
+        return by_month
+    for scope_id, metrics in get_metrics_store().history(scope_prefix=client_id):
+        metric_date_str = metrics.get('date', '')
+        try:
+            metric_date = datetime.fromisoformat(metric_date_str.replace('Z', '+00:00'))
+        except ValueError:
+            continue
+        # Oldest first, so the month's latest snapshot wins
+        by_month[metric_date.strftime('%Y-%m')] = metrics
+    return by_month
+
+
+def get_growth_data(client):
+    """
+    Monthly growth data for earnings and followers.
+
+    Followers come from the client's follower time series where recorded,
+    then saved report metrics, then an estimated trend; ``followers_source``
+    says which per month.
+    """
+    client_id = client.get('client_id')
+
+    # Get current earnings (from products)
+    brand = client.get('brand') or {}
+    main_product = brand.get('main_product', {})
+    current_earnings = 0
+    if main_product.get('product_id'):
+        # Use dummy data for now (would come from Stripe API in production)
+        current_earnings = 9600  # Dummy: 8 buyers × $1,200
+    else:
+        # Sum dummy products
+        current_earnings = 14400  # Dummy data
+
+    # Get current followers (from social profiles)
+    socials = brand.get('socials', {})
+    connected_accounts = client.get('connected_accounts', {})
+    current_followers = 0
+
+    # Calculate total followers from connected accounts
+    if (connected_accounts.get('instagram') or {}).get('connected'):
+        try:
+            from follower_refresh import request_fetch_allowed
+            instagram_data = get_instagram_api_snapshot(
+                connected_accounts['instagram'], allow_fetch=request_fetch_allowed()
+            )
+            if instagram_data:
+                current_followers += instagram_data.get('followers') or 0
+        except Exception as e:
+            print(f"Error fetching Instagram followers: {e}")
+
+    # Last 12 calendar months, oldest first
+    now = datetime.now()
+    month_dates = []
+    year, month = now.year, now.month
+    for _ in range(12):
+        month_dates.append(datetime(year, month, 1))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    month_dates.reverse()
+    month_keys = [d.strftime('%Y-%m') for d in month_dates]
+    months = [f"{month_abbr[d.month]} '{str(d.year)[2:]}" for d in month_dates]
+
+    # Real follower history: one read of the client's time series
+    from follower_series import get_series_store
+    series = get_series_store().get(client_id)
+    series_followers = series.monthly_totals(month_keys) if series else [None] * 12
+    if series and not current_followers:
+        current_followers = series.latest() or 0
+
+    # Saved report metrics (metrics_store.py), read once and indexed by month
+    history_by_month = _client_history_by_month(client_id)
+
+    # Use dummy data for testing - clear growth trend
+    # Earnings: Start at $5,000, grow to current (or $14,400 if no current)
+    # Followers: Start at 5,000, grow to current (or 12,000 if no current)
+    base_earnings = current_earnings if current_earnings > 0 else 14400
+    base_followers = current_followers if current_followers > 0 else 12000
+
+    earnings = []
+    followers = []
+    followers_source = []
+    for index, month_key in enumerate(month_keys):
+        i = 11 - index  # months ago
+        historical = history_by_month.get(month_key, {})
+
+        if historical.get('monthly_revenue') is not None:
+            earnings.append(historical['monthly_revenue'])
+        else:
+            # Generate trend: start at 60% of base and grow linearly to base
+            progress = (12 - i) / 12
+            # Add some variation for realism
+            variation = (i % 3 - 1) * 0.05  # ±5% variation
+            month_earnings = int(base_earnings * (0.6 + 0.4 * progress) * (1 + variation))
+            earnings.append(max(1000, month_earnings))  # Minimum $1,000
+
+        if series_followers[index] is not None:
+            followers.append(series_followers[index])
+            followers_source.append('series')
+        elif historical.get('fans_total') is not None:
+            followers.append(historical['fans_total'])
+            followers_source.append('history')
+        else:
+            # Generate trend: start at 70% of base and grow linearly to base
+            progress = (12 - i) / 12
+            # Add some variation for realism
+            variation = (i % 2) * 0.03  # ±3% variation
+            month_followers = int(base_followers * (0.7 + 0.3 * progress) * (1 + variation))
+            followers.append(max(1000, month_followers))  # Minimum 1,000 followers
+            followers_source.append('estimated')
+
+    # Ensure current month matches actual values (or use dummy if no actual)
+    earnings[-1] = current_earnings if current_earnings > 0 else base_earnings
+    if followers_source[-1] != 'series':
+        followers[-1] = current_followers if current_followers > 0 else base_followers
+
+    return {
+        'months': months,
+        'earnings': earnings,
+        'followers': followers,
+        'followers_source': followers_source
+    }
+
+
+def load_weekly_post_data(load_derivatives):
+    """Posts and derivatives for get_weekly_posts; empty lists if storage is missing or broken"""
+    from content.center_post import load_content_posts
+
+    # Load posts - fallback to dummy data if files don't exist
+    try:
+        posts_data = load_content_posts()
+        if not posts_data.get('posts'):
+            print("⚠️ No posts found, using dummy data")
+            posts_data = {"posts": []}
+    except Exception as e:
+        print(f"⚠️ Error loading posts: {e}, using dummy data")
+        posts_data = {"posts": []}
+
+    try:
+        derivatives_data = load_derivatives()
+        if not derivatives_data.get('derivatives'):
+            print("⚠️ No derivatives found, using dummy data")
+            derivatives_data = {"derivatives": []}
+    except Exception as e:
+        print(f"⚠️ Error loading derivatives: {e}, using dummy data")
+        derivatives_data = {"derivatives": []}
+
+    return posts_data, derivatives_data
+
+
+def get_weekly_posts(client, posts_data, derivatives_data):
+    """This week's topic, scheduling status and per-platform queued counts"""
+    client_id = client.get('client_id')
+    brand = client.get('brand') or {}
+
+    # Get current week (Monday to Sunday)
+    now = datetime.now()
+    day_of_week = now.weekday()  # 0 = Monday, 6 = Sunday
+    monday = now - timedelta(days=day_of_week)
+    sunday = monday + timedelta(days=6)
+
+    # Get default schedule from brand settings
+    default_schedule = brand.get('default_schedule', {})
+    newsletter_default_time = default_schedule.get('newsletter_time', '09:00')
+    newsletter_default_day = default_schedule.get('newsletter_day', 'friday')
+
+    # Format default schedule string
+    day_map = {
+        'monday': 'Monday',
+        'tuesday': 'Tuesday',
+        'wednesday': 'Wednesday',
+        'thursday': 'Thursday',
+        'friday': 'Friday',
+        'saturday': 'Saturday',
+        'sunday': 'Sunday',
+        'weekly': 'Weekly',
+        'biweekly': 'Bi-weekly'
+    }
+    default_schedule_str = f"{newsletter_default_time} UTC (Every {day_map.get(newsletter_default_day, 'Friday')})"
+
+    # Get special events
+    special_events = brand.get('special_events', [])
+    # Filter events for this week and upcoming
+    upcoming_events = []
+    for event in special_events:
+        event_date_str = event.get('date')
+        if event_date_str:
+            try:
+                event_date = datetime.fromisoformat(event_date_str)
+                # Show events from this week onwards
+                if event_date >= monday:
+                    upcoming_events.append(event)
+            except:
+                pass
+
+    # Aggregate data for this week
+    main_topic = None
+    topic_post_id = None
+    newsletter_scheduled = None
+    has_drafted = False
+    has_scheduled = False
+    social_counts = {
+        'linkedin': 0,
+        'x': 0,
+        'threads': 0,
+        'instagram': 0,
+        'substack': 0,
+        'telegram': 0
+    }
+
+    # Find posts from this week and aggregate their derivatives
+    for post in posts_data.get('posts', []):
+        if post.get('client_id') != client_id:
+            continue
+
+        try:
+            created_at_str = post.get('created_at', '')
+            if not created_at_str:
+                continue
+            # Handle timezone-aware and naive datetimes
+            if 'Z' in created_at_str:
+                created_at = datetime.fromisoformat(created_at_str.replace('Z', '+00:00'))
+            elif '+' in created_at_str or created_at_str.count('-') > 2:
+                created_at = datetime.fromisoformat(created_at_str)
+            else:
+                created_at = datetime.fromisoformat(created_at_str)
+
+            # Make both timezone-naive for comparison
+            if created_at.tzinfo:
+                created_at = created_at.replace(tzinfo=None)
+            monday_naive = monday.replace(tzinfo=None) if monday.tzinfo else monday
+            sunday_naive = sunday.replace(tzinfo=None) if sunday.tzinfo else sunday
+
+            # Check if post was created this week
+            if monday_naive <= created_at <= sunday_naive + timedelta(days=1):  # Include Sunday
+                # Check if post is drafted (idea, drafted, branched, approved)
+                post_status = post.get('status', 'draft')
+                if post_status in ['idea', 'drafted', 'branched', 'approved']:
+                    has_drafted = True
+
+                # Get main topic (use the most recent post's title)
+                if not main_topic:
+                    center_post = post.get('center_post') or {}
+                    main_topic = center_post.get('title', post.get('raw_idea', 'Untitled')[:50])
+                    topic_post_id = post.get('id')
+
+                # Find derivatives for this post and aggregate
+                post_id = post.get('id')
+                for deriv in derivatives_data.get('derivatives', []):
+                    if deriv.get('post_id') != post_id:
+                        continue
+
+                    deriv_type = deriv.get('type')
+                    status = (deriv.get('metadata') or {}).get('status', deriv.get('status', 'draft'))
+
+                    # Check if queued (scheduled)
+                    if status == 'queued' and deriv.get('scheduled_for'):
+                        has_scheduled = True
+                        if deriv_type == 'newsletter':
+                            # Use the first/earliest newsletter scheduled time
+                            if not newsletter_scheduled:
+                                newsletter_scheduled = deriv.get('scheduled_for')
+                        else:
+                            # Map derivative types to platform IDs
+                            platform_map = {
+                                'x': 'x',
+                                'social_x': 'x',
+                                'linkedin': 'linkedin',
+                                'social_linkedin': 'linkedin',
+                                'threads': 'threads',
+                                'social_threads': 'threads',
+                                'instagram': 'instagram',
+                                'social_ig': 'instagram',
+                                'ig': 'instagram',
+                                'substack': 'substack',
+                                'social_substack': 'substack',
+                                'telegram': 'telegram',
+                                'social_telegram': 'telegram'
+                            }
+                            platform_id = platform_map.get(deriv_type)
+                            if platform_id and platform_id in social_counts:
+                                social_counts[platform_id] += 1
+        except Exception as e:
+            print(f"Error processing post {post.get('id', 'unknown')}: {e}")
+            continue
+
+    # If no data found, return dummy data for testing
+    if not main_topic and not has_drafted and not has_scheduled:
+        print("ℹ️ No posts found for this week, returning dummy data")
+        return {
+            'topic': 'Building Your Personal Brand',
+            'topic_post_id': None,
+            'newsletter_scheduled': None,
+            'newsletter_default_time': '09:00 UTC',
+            'social_counts': {
+                'x': 5,
+                'linkedin': 3,
+                'threads': 2,
+                'instagram': 4,
+                'substack': 1,
+                'telegram': 1
+            },
+            'has_drafted': False,
+            'has_scheduled': False,
+            'special_events': [],
+            'week_start': monday.isoformat(),
+            'week_end': sunday.isoformat()
+        }
+
+    return {
+        'topic': main_topic,
+        'topic_post_id': topic_post_id,
+        'newsletter_scheduled': newsletter_scheduled,
+        'newsletter_default_time': default_schedule_str,
+        'social_counts': social_counts,
+        'has_drafted': has_drafted,
+        'has_scheduled': has_scheduled,
+        'special_events': upcoming_events[:5],  # Limit to 5 upcoming events
+        'week_start': monday.isoformat(),
+        'week_end': sunday.isoformat()
+    }
+
+
+def get_hero_metrics(client):
+    """Hero metrics (impressions, email capture, client calls)"""
+    # Calculate metrics from funnel structure or use dummy data
+    funnel_structure = client.get('funnel_structure', {})
+    awareness_channels = funnel_structure.get('awareness', {}).get('channels', [])
+
+    # Calculate total impressions from awareness channels (would come from APIs in production)
+    total_impressions = 0
+    for channel in awareness_channels:
+        # In production, would fetch from channel APIs
+        # For now, use dummy values
+        metric_name = channel.get('metric_name', '')
+        if 'blog' in metric_name.lower():
+            total_impressions += 1234
+        elif 'instagram' in metric_name.lower() or 'ig' in metric_name.lower():
+            total_impressions += 5678
+        elif 'linkedin' in metric_name.lower():
+            total_impressions += 890
+
+    # If no channels configured, use dummy total
+    if total_impressions == 0:
+        total_impressions = 7802  # Blog (1234) + Instagram (5678) + LinkedIn (890)
+
+    # Get email capture from capture stage (would come from Beehiiv API)
+    capture_config = funnel_structure.get('capture', {})
+    email_capture = 23  # Would come from Beehiiv API
+    if capture_config.get('platform') == 'beehiiv':
+        # In production, would fetch from Beehiiv API
+        pass
+
+    # Get client calls from conversion stage (manual entry)
+    conversion_config = funnel_structure.get('conversion', {})
+    client_calls = 1  # Would come from manual metrics
+
+    # Calculate capture rate
+    capture_rate = (email_capture / total_impressions * 100) if total_impressions > 0 else 0
+
+    return {
+        'total_impressions': total_impressions,
+        'email_capture': email_capture,
+        'capture_rate': round(capture_rate, 1),
+        'client_calls': client_calls
+    }
+
+
+def get_analysis_inputs(client):
+    """Funnel metrics plus the bottleneck and action plan derived from them"""
+    # Try to get real metrics (from existing endpoints or calculate)
+    # For now, use static analysis with fallback logic
+    from report_formatter import identify_bottleneck, generate_action_plan
+
+    # Calculate basic metrics from client structure
+    funnel_structure = client.get('funnel_structure', {})
+    awareness_channels = funnel_structure.get('awareness', {}).get('channels', [])
+    capture_config = funnel_structure.get('capture', {})
+    nurture_config = funnel_structure.get('nurture', {})
+    conversion_touchpoints = funnel_structure.get('conversion', {}).get('touchpoints', [])
+
+    # Build metrics dict (simplified - in production would fetch from APIs)
+    # Calculate total impressions from all awareness channels
+    total_impressions = 1234 + 5678 + 890  # Blog + Instagram + LinkedIn (would come from APIs)
+
+    metrics = {
+        'blog_visitors': 1234,  # Would come from Vercel API
+        'new_subscribers': 23,  # Would come from Beehiiv API
+        'total_subscribers': 456,  # Would come from Beehiiv API
+        'open_rate': 45.2,  # Would come from Beehiiv API
+        'click_rate': 8.3,  # Would come from Beehiiv API
+        'inquiries': 2,  # Manual entry
+        'calls_booked': 1,  # Manual entry
+        'close_rate': 50.0,  # Calculated
+        'capture_rate': (23 / total_impressions * 100) if total_impressions > 0 else 0,  # Calculated
+        'inquiry_rate': (2 / 456 * 100) if 456 > 0 else 0,  # Calculated
+        'total_reach': total_impressions,
+        'total_impressions': total_impressions
+    }
+
+    # Identify bottleneck
+    bottleneck_name, bottleneck_desc = identify_bottleneck(metrics)
+    action_plan = generate_action_plan(bottleneck_name, metrics)
+
+    return metrics, bottleneck_name, action_plan
+
+
+def build_area_analyses(metrics, bottleneck_name, action_plan):
+    """Analysis for every known dashboard area, keyed by area id"""
+    return {
+        'blog_visitors': {
+            'area_name': 'Blog Visitors',
+            'current_value': metrics.get('blog_visitors', 0),
+            'target_value': 5000,
+            'status': 'good' if metrics.get('blog_visitors', 0) >= 3000 else 'warning' if metrics.get('blog_visitors', 0) >= 1000 else 'critical',
+            'what_is_good': 'Your blog is getting consistent traffic' if metrics.get('blog_visitors', 0) >= 1000 else None,
+            'what_is_bad': 'Traffic is below target of 5,000 weekly visitors' if metrics.get('blog_visitors', 0) < 5000 else None,
+            'improvements': [
+                'Increase content frequency to 3-4 posts/week',
+                'Optimize SEO for high-intent keywords',
+                'Promote posts on social media'
+            ],
+            'suggestions': [
+                'Focus on long-form content (2,000+ words)',
+                'Add internal linking between posts',
+                'Create topic clusters around main themes'
+            ]
+        },
+        'new_subscribers': {
+            'area_name': 'New Subscribers',
+            'current_value': metrics.get('new_subscribers', 0),
+            'target_value': int(metrics.get('blog_visitors', 0) * 0.04),
+            'status': 'good' if metrics.get('capture_rate', 0) >= 4 else 'warning' if metrics.get('capture_rate', 0) >= 2 else 'critical',
+            'what_is_good': 'You have a growing email list' if metrics.get('new_subscribers', 0) > 0 else None,
+            'what_is_bad': f"Capture rate is {metrics.get('capture_rate', 0):.1f}% vs target 4%. You're losing {100 - metrics.get('capture_rate', 0):.1f}% of visitors" if metrics.get('capture_rate', 0) < 4 else None,
+            'improvements': (
+                [action_plan.get('LEAD CAPTURE', {}).get('priority_1', {}).get('title'), action_plan.get('LEAD CAPTURE', {}).get('priority_2', {}).get('title', 'Add lead magnet to every post')]
+                if action_plan.get('LEAD CAPTURE', {}).get('priority_1', {}).get('title')
+                else [
+                    'Add ebook popup to blog',
+                    'Create exit-intent popup',
+                    'Add lead magnet to every post'
+                ]
+            ),
+            'suggestions': [
+                'Test different lead magnet offers',
+                'Simplify signup form (fewer fields)',
+                'Add social proof to signup page'
+            ]
+        },
+        'open_rate': {
+            'area_name': 'Open Rate',
+            'current_value': metrics.get('open_rate', 0),
+            'target_value': 40,
+            'status': 'good' if metrics.get('open_rate', 0) >= 40 else 'warning' if metrics.get('open_rate', 0) >= 30 else 'critical',
+            'what_is_good': 'Your open rate is above target! Content resonates well' if metrics.get('open_rate', 0) >= 40 else None,
+            'what_is_bad': f"Open rate is {metrics.get('open_rate', 0):.1f}% vs target 40%" if metrics.get('open_rate', 0) < 40 else None,
+            'improvements': (
+                [action_plan.get('ENGAGEMENT', {}).get('priority_1', {}).get('title'), action_plan.get('ENGAGEMENT', {}).get('priority_2', {}).get('title', 'Test send times')]
+                if action_plan.get('ENGAGEMENT', {}).get('priority_1', {}).get('title')
+                else [
+                    'Improve email subject lines',
+                    'Test send times for better engagement'
+                ]
+            ),
+            'suggestions': [
+                'Segment list for more targeted content',
+                'A/B test subject lines',
+                'Personalize email content'
+            ]
+        },
+        'inquiries_clients': {
+            'area_name': 'Inquiries → Clients',
+            'current_value': metrics.get('close_rate', 0),
+            'target_value': 40,
+            'status': 'good' if metrics.get('close_rate', 0) >= 40 else 'warning' if metrics.get('close_rate', 0) >= 30 else 'critical',
+            'what_is_good': 'Excellent close rate! You convert well' if metrics.get('close_rate', 0) >= 40 else None,
+            'what_is_bad': f"Low inquiry volume (only {metrics.get('inquiries', 0)} per week)" if metrics.get('inquiries', 0) < 5 else f"Close rate is {metrics.get('close_rate', 0):.0f}% vs target 40%" if metrics.get('close_rate', 0) < 40 else None,
+            'improvements': (
+                [action_plan.get('INQUIRIES', {}).get('priority_1', {}).get('title'), action_plan.get('INQUIRIES', {}).get('priority_2', {}).get('title', 'Create clear call-to-action')]
+                if action_plan.get('INQUIRIES', {}).get('priority_1', {}).get('title')
+                else [
+                    'Add case studies to newsletter',
+                    'Include testimonials in every email',
+                    'Create clear call-to-action'
+                ]
+            ),
+            'suggestions': [
+                'Add inquiry form to website',
+                'Make booking process easier',
+                'Show social proof on landing pages'
+            ]
+        },
+        'funnel_flow': {
+            'area_name': 'Funnel Flow Overview',
+            'status': 'warning' if bottleneck_name in ['LEAD CAPTURE', 'INQUIRIES'] else 'good',
+            'what_is_good': 'Your funnel is working end-to-end',
+            'what_is_bad': f"Bottleneck identified: {bottleneck_name}" if bottleneck_name != 'UNKNOWN' else None,
+            'improvements': [
+                f"Focus on fixing {bottleneck_name.lower()} first",
+                'Optimize each stage sequentially',
+                'Track conversion rates between stages'
+            ],
+            'suggestions': [
+                'Set up funnel tracking',
+                'A/B test each stage',
+                'Monitor drop-off points'
+            ]
+        },
+        'funnel_awareness': {
+            'area_name': 'Awareness Stage',
+            'status': 'good' if metrics.get('total_impressions', 0) >= 5000 else 'warning',
+            'current_value': metrics.get('total_impressions', 0),
+            'target_value': 5000,
+            'what_is_good': 'Good reach across multiple channels' if metrics.get('total_impressions', 0) >= 3000 else None,
+            'what_is_bad': f"Total impressions is {metrics.get('total_impressions', 0):,} vs target 5,000" if metrics.get('total_impressions', 0) < 5000 else None,
+            'improvements': (
+                [action_plan.get('AWARENESS', {}).get('priority_1', {}).get('title'), action_plan.get('AWARENESS', {}).get('priority_2', {}).get('title', 'Increase content frequency')]
+                if action_plan.get('AWARENESS', {}).get('priority_1', {}).get('title')
+                else [
+                    'Post 3x per week on Instagram',
+                    'Guest post on relevant blogs',
+                    'Increase content frequency'
+                ]
+            ),
+            'suggestions': [
+                'Focus on high-intent keywords',
+                'Collaborate with other creators',
+                'Repurpose content across platforms'
+            ]
+        },
+        'funnel_capture': {
+            'area_name': 'Email Capture Stage',
+            'status': 'critical' if metrics.get('capture_rate', 0) < 2 else 'warning' if metrics.get('capture_rate', 0) < 4 else 'good',
+            'current_value': metrics.get('new_subscribers', 0),
+            'target_value': int(metrics.get('total_impressions', 0) * 0.04),
+            'what_is_good': 'Good capture rate' if metrics.get('capture_rate', 0) >= 4 else None,
+            'what_is_bad': f"Capture rate is {metrics.get('capture_rate', 0):.1f}% vs target 4%" if metrics.get('capture_rate', 0) < 4 else None,
+            'improvements': (
+                [action_plan.get('LEAD CAPTURE', {}).get('priority_1', {}).get('title'), action_plan.get('LEAD CAPTURE', {}).get('priority_2', {}).get('title', 'Add exit-intent popup')]
+                if action_plan.get('LEAD CAPTURE', {}).get('priority_1', {}).get('title')
+                else [
+                    'Add ebook popup to blog',
+                    'Create exit-intent popup',
+                    'Add lead magnet to every post'
+                ]
+            ),
+            'suggestions': [
+                'Test different lead magnet offers',
+                'Simplify signup form',
+                'Add social proof'
+            ]
+        },
+        'funnel_nurture': {
+            'area_name': 'Inquiry Stage',
+            'status': 'warning' if metrics.get('inquiry_rate', 0) < 1 else 'good',
+            'current_value': metrics.get('inquiries', 0),
+            'target_value': int(metrics.get('total_subscribers', 0) * 0.015),
+            'what_is_good': 'Good inquiry rate' if metrics.get('inquiry_rate', 0) >= 1 else None,
+            'what_is_bad': f"Inquiry rate is {metrics.get('inquiry_rate', 0):.1f}% vs target 1%" if metrics.get('inquiry_rate', 0) < 1 else None,
+            'improvements': (
+                [action_plan.get('INQUIRIES', {}).get('priority_1', {}).get('title'), action_plan.get('INQUIRIES', {}).get('priority_2', {}).get('title', 'Add testimonials')]
+                if action_plan.get('INQUIRIES', {}).get('priority_1', {}).get('title')
+                else [
+                    'Add case studies to newsletter',
+                    'Include testimonials in emails',
+                    'Create clear call-to-action'
+                ]
+            ),
+            'suggestions': [
+                'Add inquiry form to website',
+                'Make booking process easier',
+                'Show social proof on landing pages'
+            ]
+        },
+        'funnel_conversion': {
+            'area_name': 'Conversion Stage',
+            'status': 'good' if metrics.get('close_rate', 0) >= 40 else 'warning',
+            'current_value': metrics.get('calls_booked', 0),
+            'target_value': metrics.get('inquiries', 0),
+            'what_is_good': 'Excellent close rate' if metrics.get('close_rate', 0) >= 40 else None,
+            'what_is_bad': f"Close rate is {metrics.get('close_rate', 0):.0f}% vs target 40%" if metrics.get('close_rate', 0) < 40 else None,
+            'improvements': (
+                [action_plan.get('CLOSE RATE', {}).get('priority_1', {}).get('title'), action_plan.get('CLOSE RATE', {}).get('priority_2', {}).get('title', 'Create call checklist')]
+                if action_plan.get('CLOSE RATE', {}).get('priority_1', {}).get('title')
+                else [
+                    'Record and analyze sales calls',
+                    'Create call preparation checklist',
+                    'Follow up with warm leads'
+                ]
+            ),
+            'suggestions': [
+                'Improve discovery call process',
+                'Address common objections',
+                'Follow up within 24 hours'
+            ]
+        },
+        'stage_awareness': {
+            'area_name': 'Awareness Stage',
+            'status': 'good' if metrics.get('total_reach', 0) >= 5000 else 'warning',
+            'what_is_good': 'Good reach across multiple channels' if metrics.get('total_reach', 0) >= 3000 else None,
+            'what_is_bad': f"Total reach is {metrics.get('total_reach', 0):,} vs target 5,000" if metrics.get('total_reach', 0) < 5000 else None,
+            'improvements': (
+                [action_plan.get('AWARENESS', {}).get('priority_1', {}).get('title'), action_plan.get('AWARENESS', {}).get('priority_2', {}).get('title', 'Increase content frequency')]
+                if action_plan.get('AWARENESS', {}).get('priority_1', {}).get('title')
+                else [
+                    'Post 3x per week on Instagram',
+                    'Guest post on relevant blogs',
+                    'Increase content frequency'
+                ]
+            ),
+            'suggestions': [
+                'Focus on high-intent keywords',
+                'Collaborate with other creators',
+                'Repurpose content across platforms'
+            ]
+        },
+        'stage_capture': {
+            'area_name': 'Lead Capture Stage',
+            'status': 'critical' if metrics.get('capture_rate', 0) < 2 else 'warning' if metrics.get('capture_rate', 0) < 4 else 'good',
+            'what_is_good': 'Good capture rate' if metrics.get('capture_rate', 0) >= 4 else None,
+            'what_is_bad': f"Capture rate is {metrics.get('capture_rate', 0):.1f}% vs target 4%" if metrics.get('capture_rate', 0) < 4 else None,
+            'improvements': action_plan.get('LEAD CAPTURE', {}).get('priority_1', {}).get('title') and [
+                action_plan['LEAD CAPTURE']['priority_1']['title'],
+                action_plan['LEAD CAPTURE'].get('priority_2', {}).get('title', 'Add exit-intent popup')
+            ] or [
+                'Add ebook popup to blog',
+                'Create exit-intent popup',
+                'Add lead magnet to every post'
+            ],
+            'suggestions': [
+                'Test different lead magnet offers',
+                'Simplify signup form',
+                'Add social proof'
+            ]
+        },
+        'stage_nurture': {
+            'area_name': 'Nurture Stage',
+            'status': 'good' if metrics.get('open_rate', 0) >= 40 else 'warning',
+            'what_is_good': 'Strong email engagement' if metrics.get('open_rate', 0) >= 40 else None,
+            'what_is_bad': f"Open rate is {metrics.get('open_rate', 0):.1f}% vs target 40%" if metrics.get('open_rate', 0) < 40 else None,
+            'improvements': action_plan.get('ENGAGEMENT', {}).get('priority_1', {}).get('title') and [
+                action_plan['ENGAGEMENT']['priority_1']['title'],
+                action_plan['ENGAGEMENT'].get('priority_2', {}).get('title', 'Add clear CTAs')
+            ] or [
+                'Improve email subject lines',
+                'Add clear CTAs in emails',
+                'Test send times'
+            ],
+            'suggestions': [
+                'Segment list for targeted content',
+                'A/B test subject lines',
+                'Personalize email content'
+            ]
+        },
+        'stage_conversion': {
+            'area_name': 'Conversion Stage',
+            'status': 'good' if metrics.get('close_rate', 0) >= 40 else 'warning',
+            'what_is_good': 'Excellent close rate' if metrics.get('close_rate', 0) >= 40 else None,
+            'what_is_bad': f"Close rate is {metrics.get('close_rate', 0):.0f}% vs target 40%" if metrics.get('close_rate', 0) < 40 else f"Low inquiry volume ({metrics.get('inquiries', 0)} per week)" if metrics.get('inquiries', 0) < 5 else None,
+            'improvements': action_plan.get('INQUIRIES', {}).get('priority_1', {}).get('title') and [
+                action_plan['INQUIRIES']['priority_1']['title'],
+                action_plan['INQUIRIES'].get('priority_2', {}).get('title', 'Add testimonials')
+            ] or [
+                'Add case studies to newsletter',
+                'Include testimonials in emails',
+                'Create clear call-to-action'
+            ],
+            'suggestions': [
+                'Record and analyze sales calls',
+                'Create call preparation checklist',
+                'Follow up with warm leads'
+            ]
+        }
+    }
+
+
+def generate_area_analysis(area, metrics, bottleneck_name, action_plan, area_analyses=None):
+    """Generate analysis for a specific dashboard area"""
+    if area_analyses is None:
+        area_analyses = build_area_analyses(metrics, bottleneck_name, action_plan)
+    return area_analyses.get(area, {
+        'area_name': area.replace('_', ' ').title(),
+        'status': 'good',
+        'what_is_good': 'This area is performing well',
+        'improvements': ['Continue monitoring performance']
+    })
+
+
+def get_analysis(client, areas):
+    """Analysis for each requested area, sharing one metrics/bottleneck computation"""
+    metrics, bottleneck_name, action_plan = get_analysis_inputs(client)
+    area_analyses = build_area_analyses(metrics, bottleneck_name, action_plan)
+    return {
+        'areas': {
+            area: generate_area_analysis(area, metrics, bottleneck_name, action_plan, area_analyses)
+            for area in areas
+        },
+        'metrics': metrics
+    }
+
+
+# Panels served by /api/dashboard/bundle, in response order
+BUNDLE_PANELS = ('socials', 'products', 'growth', 'posts', 'metrics', 'analysis')
+
+# Areas analysed when a bundle asks for analysis without naming any
+DEFAULT_ANALYSIS_AREAS = ('funnel_flow',)
+
+
+def get_dashboard_bundle(client, panels, load_derivatives, areas=None, deadline=None):
+    """
+    Compute several dashboard panels for one client in a single pass.
+
+    The client config is resolved once by the caller and shared; panels that
+    do I/O (socials, growth, posts) run concurrently on the shared executor.
+    Each panel's result lands under its name; failed panels are reported in
+    ``errors`` instead of failing the whole bundle.
+    """
+    from utils.executor import fan_out
+
+    areas = list(areas or DEFAULT_ANALYSIS_AREAS)
+    tasks = {
+        'socials': lambda: get_social_profiles(client, deadline=deadline),
+        'products': lambda: get_products(client),
+        'growth': lambda: get_growth_data(client),
+        'posts': lambda: get_weekly_posts(client, *load_weekly_post_data(load_derivatives)),
+        'metrics': lambda: get_hero_metrics(client),
+        'analysis': lambda: get_analysis(client, areas),
+    }
+    results = fan_out({name: tasks[name] for name in panels}, deadline=deadline)
+
+    bundle = {'client_id': client.get('client_id'), 'errors': {}}
+    for name in panels:
+        result = results[name]
+        if result.ok:
+            bundle[name] = result.value
+        else:
+            print(f"⚠️ Dashboard panel {name} {result.status}: {result.error}")
+            bundle[name] = None
+            bundle['errors'][name] = result.error or result.status
+    return bundle
@@ -0,0 +1,329 @@
+"""
+Follower refresh job - precomputes social profile snapshots for all clients
+
+Walks every active client's brand.socials and connected_accounts and
+refreshes the follower snapshots (social_snapshots.py) that would go stale
+before the next run, so dashboard views answer from snapshots instead of
+scraping inside the request. Refreshed counts are appended to each client's
+follower time series (follower_series.py).
+
+The work is spread across the refresh window (FOLLOWER_REFRESH_WINDOW
+seconds): targets are split into slots of FOLLOWER_REFRESH_SLOT seconds and
+each slot's profiles are scraped together via social_batch.scrape_many.
+After a run, per-platform freshness (fresh/stale counts, oldest data) is
+recorded and served at /api/workspace/follower-refresh/status.
+
+Runs from scheduler.py, or as a CLI:
+    python follower_refresh.py [--window 0] [--force] [--client CLIENT_ID]
+"""
+import argparse
+import asyncio
+import os
+import threading
+import time
+
+from social_snapshots import get_store, normalize_url, ttl_for
+from utils.throttle import ThrottleRejected
+
+REFRESH_ENABLED = os.getenv('FOLLOWER_REFRESH', 'true').lower() not in ('false', '0', 'no')
+REFRESH_WINDOW_SECONDS = int(os.getenv('FOLLOWER_REFRESH_WINDOW', '3600'))
+REFRESH_SLOT_SECONDS = int(os.getenv('FOLLOWER_REFRESH_SLOT', '60'))
+# always: dashboard requests may scrape stale profiles; auto: only while the job isn't running
+REQUEST_FETCH_MODE = os.getenv('SOCIALS_FETCH_ON_REQUEST', 'auto').lower()
+
+STATUS_KEY = 'status'
+STATUS_TTL = 7 * 86400
+STATUS_CACHE_SECONDS = 60
+
+_status_backend = None
+_status_cache = {'value': None, 'loaded_at': 0}
+_run_lock = threading.Lock()
+
+
+def _backend():
+    global _status_backend
+    if _status_backend is None:
+        from utils.cache import make_backend
+        _status_backend = make_backend('follower_refresh', max_entries=10)
+    return _status_backend
+
+
+def get_refresh_status():
+    """Last recorded run summary with per-platform freshness, or None"""
+    try:
+        return _backend().get(STATUS_KEY)
+    except Exception as e:
+        print(f"⚠️ Could not read follower refresh status: {e}")
+        return None
+
+
+def _save_status(status):
+    try:
+        _backend().set(STATUS_KEY, status, STATUS_TTL)
+    except Exception as e:
+        print(f"⚠️ Could not save follower refresh status: {e}")
+    _status_cache.update(value=status, loaded_at=time.time())
+
+
+def request_fetch_allowed():
+    """
+    Whether dashboard requests should scrape stale profiles themselves.
+
+    In auto mode they don't while the refresh job has run within the last
+    two windows - snapshots are kept fresh ahead of time, and missing ones
+    are still fetched on demand.
+    """
+    if REQUEST_FETCH_MODE == 'always':
+        return True
+    if REQUEST_FETCH_MODE == 'never':
+        return False
+    now = time.time()
+    if now - _status_cache['loaded_at'] > STATUS_CACHE_SECONDS:
+        _status_cache.update(value=get_refresh_status(), loaded_at=now)
+    status = _status_cache['value']
+    if not status:
+        return True
+    last_seen = status.get('finished_at') or status.get('started_at') or 0
+    return now - last_seen > 2 * max(status.get('window_seconds', 0), REFRESH_SLOT_SECONDS) + 600
+
+
+def collect_targets(clients=None):
+    """
+    Profiles to keep fresh for active clients, deduplicated.
+
+    Returns dicts with kind ('scrape' or 'instagram_api'), platform, url
+    (the snapshot key) and client_ids; API targets also carry user_id and
+    access_token.
+    """
+    from dashboard_service import enabled_platforms
+    if clients is None:
+        from utils.client_registry import list_clients
+        clients = list_clients()
+
+    targets = {}
+
+    def add(kind, platform, url, client_id, **extra):
+        key = (kind, platform, normalize_url(url))
+        target = targets.setdefault(key, dict(kind=kind, platform=platform, url=url, client_ids=[], **extra))
+        if client_id not in target['client_ids']:
+            target['client_ids'].append(client_id)
+
+    for client in clients:
+        if client.get('status') != 'active':
+            continue
+        client_id = client.get('client_id')
+        socials = (client.get('brand') or {}).get('socials', {}) or {}
+        connected_accounts = client.get('connected_accounts') or {}
+
+        for platform_id in enabled_platforms(socials):
+            profile_url = (socials.get(platform_id) or {}).get('profile_url', '')
+            connected = connected_accounts.get(platform_id) or {}
+
+            if platform_id == 'instagram' and connected.get('connected'):
+                user_id = connected.get('user_id')
+                access_token = connected.get('access_token') or os.getenv('INSTAGRAM_ACCESS_TOKEN')
+                if user_id and access_token:
+                    add('instagram_api', 'instagram', f"graph.facebook.com/{user_id}", client_id,
+                        user_id=user_id, access_token=access_token)
+                elif not profile_url and connected.get('username'):
+                    profile_url = f"https://instagram.com/{connected['username']}"
+
+            if profile_url:
+                add('scrape', platform_id, profile_url, client_id)
+
+    return sorted(targets.values(), key=lambda t: (t['platform'], normalize_url(t['url'])))
+
+
+def due_targets(targets, window, force=False):
+    """Targets whose snapshot is missing or would go stale before the next run"""
+    if force:
+        return list(targets)
+    store = get_store()
+    now = time.time()
+    due = []
+    for target in targets:
+        snapshot = store.peek(target['platform'], target['url'])
+        if not snapshot or not snapshot.get('ok'):
+            # Failed snapshots follow the store's negative TTL
+            if not store.is_fresh(target['platform'], snapshot, now=now):
+                due.append(target)
+        elif now + window - snapshot.get('fetched_at', 0) >= ttl_for(target['platform']):
+            due.append(target)
+    return due
+
+
+def _fetch_instagram_api(target):
+    """Fetch and record an API target's snapshot; None when the request was throttled (not sent)"""
+    from dashboard_service import fetch_instagram_api_profile
+    try:
+        data, error = fetch_instagram_api_profile(target['user_id'], target['access_token']), None
+    except ThrottleRejected:
+        return None
+    except Exception as e:
+        data, error = None, str(e)
+    return get_store().record('instagram', target['url'], data, error=error)
+
+
+async def _refresh(targets, window):
+    """Refresh targets in slots spread evenly over ``window`` seconds; returns {(platform, url): snapshot}"""
+    from social_batch import make_parse_pool, scrape_many
+
+    store = get_store()
+    outcomes = {}
+    slots = max(1, min(len(targets), int(window // REFRESH_SLOT_SECONDS)))
+    slot_seconds = window / slots
+    # Round-robin, so one platform's profiles don't all land in the same slot
+    batches = [targets[i::slots] for i in range(slots)]
+    loop = asyncio.get_running_loop()
+    parse_pool = make_parse_pool()
+    start = time.monotonic()
+    try:
+        for i, batch in enumerate(batches):
+            wait = start + i * slot_seconds - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            api_jobs = [
+                loop.run_in_executor(None, _fetch_instagram_api, target)
+                for target in batch if target['kind'] == 'instagram_api'
+            ]
+            scrape_targets = [(t['platform'], t['url']) for t in batch if t['kind'] == 'scrape']
+            async for result in scrape_many(scrape_targets, parse_executor=parse_pool):
+                if result['throttled']:
+                    # Never sent; the target stays due for the next run
+                    continue
+                snapshot = store.record(result['platform'], result['url'], result['data'], error=result['error'])
+                outcomes[(result['platform'], result['url'])] = snapshot
+            for target, snapshot in zip(
+                [t for t in batch if t['kind'] == 'instagram_api'],
+                await asyncio.gather(*api_jobs)
+            ):
+                if snapshot is not None:
+                    outcomes[(target['platform'], target['url'])] = snapshot
+    finally:
+        parse_pool.shutdown(wait=False)
+    return outcomes
+
+
+def _freshness(targets, outcomes):
+    """Per-platform freshness of the targets' snapshots"""
+    store = get_store()
+    now = time.time()
+    platforms = {}
+    for target in targets:
+        stats = platforms.setdefault(target['platform'], {
+            'targets': 0, 'fresh': 0, 'stale': 0, 'missing': 0,
+            'refreshed': 0, 'failed': 0, 'oldest_fetched_at': None
+        })
+        stats['targets'] += 1
+        outcome = outcomes.get((target['platform'], target['url']))
+        if outcome is not None:
+            stats['refreshed' if outcome['ok'] else 'failed'] += 1
+
+        snapshot = store.peek(target['platform'], target['url'])
+        good = snapshot if snapshot and snapshot.get('ok') else (snapshot or {}).get('last_good')
+        if not good:
+            stats['missing'] += 1
+            continue
+        fetched_at = good.get('fetched_at', 0)
+        if now - fetched_at < ttl_for(target['platform']):
+            stats['fresh'] += 1
+        else:
+            stats['stale'] += 1
+        if stats['oldest_fetched_at'] is None or fetched_at < stats['oldest_fetched_at']:
+            stats['oldest_fetched_at'] = fetched_at
+    return platforms
+
+
+def _record_series(targets, outcomes):
+    """Append refreshed follower counts to each client's time series"""
+    from follower_series import get_series_store
+
+    per_client = {}
+    # API counts win over scraped ones for the same platform
+    for target in sorted(targets, key=lambda t: t['kind'] == 'instagram_api'):
+        snapshot = outcomes.get((target['platform'], target['url']))
+        if not snapshot or not snapshot['ok']:
+            continue
+        for client_id in target['client_ids']:
+            per_client.setdefault(client_id, {})[target['platform']] = snapshot.get('followers')
+    store = get_series_store()
+    for client_id, counts in per_client.items():
+        store.record_many(client_id, counts)
+
+
+def run_refresh(window=None, force=False, clients=None):
+    """
+    Refresh due follower snapshots for all active clients (blocking).
+
+    Returns the recorded status dict, or None if a run is already in progress.
+    """
+    if not _run_lock.acquire(blocking=False):
+        print("ℹ️ Follower refresh already running, skipping")
+        return None
+    try:
+        window = REFRESH_WINDOW_SECONDS if window is None else window
+        targets = collect_targets(clients)
+        due = due_targets(targets, window, force=force)
+        status = {
+            'started_at': time.time(),
+            'finished_at': None,
+            'window_seconds': window,
+            'targets': len(targets),
+            'due': len(due),
+            'platforms': {},
+        }
+        _save_status(status)
+        print(f"🔄 Refreshing {len(due)}/{len(targets)} follower snapshots over {window}s")
+
+        outcomes = asyncio.run(_refresh(due, window)) if due else {}
+
+        status['finished_at'] = time.time()
+        status['platforms'] = _freshness(targets, outcomes)
+        _save_status(status)
+        _record_series(due, outcomes)
+        failed = sum(1 for snapshot in outcomes.values() if not snapshot['ok'])
+        print(f"✅ Follower refresh done: {len(outcomes) - failed} refreshed, {failed} failed")
+        return status
+    except Exception as e:
+        print(f"❌ Follower refresh failed: {e}")
+        return None
+    finally:
+        _run_lock.release()
+
+
+def start_refresh_thread(window=None, force=False):
+    """Run run_refresh() on a daemon thread (no-op while a run is in progress)"""
+    if _run_lock.locked():
+        return False
+    threading.Thread(
+        target=run_refresh,
+        kwargs={'window': window, 'force': force},
+        name='follower-refresh',
+        daemon=True
+    ).start()
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Refresh follower snapshots for all active clients')
+    parser.add_argument('--window', type=int, default=None,
+                        help=f"seconds to spread the work over (default {REFRESH_WINDOW_SECONDS}, 0 = all at once)")
+    parser.add_argument('--force', action='store_true', help='refresh every profile, even fresh ones')
+    parser.add_argument('--client', action='append', help='only refresh these client ids')
+    args = parser.parse_args()
+
+    clients = None
+    if args.client:
+        from utils.client_registry import get_client
+        clients = [c for c in (get_client(cid) for cid in args.client) if c]
+
+    status = run_refresh(window=args.window, force=args.force, clients=clients)
+    if status:
+        for platform, stats in sorted(status['platforms'].items()):
+            print(f"  {platform:<10} {stats['fresh']} fresh, {stats['stale']} stale, "
+                  f"{stats['missing']} missing ({stats['refreshed']} refreshed, {stats['failed']} failed)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+"""
+Follower time series - per-client follower counts over time
+
+Each client has one compact document holding, per platform, the last
+follower count seen each day (kept SERIES_DAILY_RETENTION_DAYS days) and
+each month (kept for good):
+
+    {'platforms': {'instagram': {'daily': {'2025-03-14': 23412, ...},
+                                 'monthly': {'2025-03': 23412, ...}}},
+     'updated_at': 1741950000.0}
+
+Scrapes and API fetches append to it (record_many); the growth endpoint
+reads it with a single lookup and answers range queries in memory.
+
+Backends (SERIES_BACKEND), as in social_snapshots.py:
+- kv: the shared Redis/Vercel KV connection from content/storage.py
+- sqlite: a local SQLite file (SERIES_DB_PATH, WAL mode)
+- auto (default): kv when connected, else sqlite, else in-memory
+Concurrent writers for the same client are last-writer-wins; a lost sample
+is replaced by the next one.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+DAILY_RETENTION_DAYS = int(os.getenv('SERIES_DAILY_RETENTION_DAYS', '400'))
+SERIES_DB_PATH = os.getenv('SERIES_DB_PATH', 'follower_series.db')
+# KV entries are refreshed on every write; this only drops clients that stopped updating
+KV_RETENTION_SECONDS = 5 * 365 * 86400
+
+
+class SQLiteSeriesBackend:
+    """One JSON document per client in a local SQLite file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS follower_series ('
+            ' client_id TEXT PRIMARY KEY,'
+            ' data TEXT NOT NULL,'
+            ' updated_at REAL NOT NULL)'
+        )
+        self._conn.commit()
+
+    def get(self, client_id):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT data FROM follower_series WHERE client_id = ?', (client_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, client_id, doc):
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO follower_series (client_id, data, updated_at) VALUES (?, ?, ?)',
+                (client_id, json.dumps(doc, separators=(',', ':')), doc['updated_at'])
+            )
+            self._conn.commit()
+
+
+class CacheSeriesBackend:
+    """Documents in a utils.cache backend (shared KV, or in-memory)"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def get(self, client_id):
+        return self.backend.get(client_id)
+
+    def set(self, client_id, doc):
+        self.backend.set(client_id, doc, KV_RETENTION_SECONDS)
+
+
+def _make_backend():
+    from utils.cache import MemoryBackend, make_backend, RedisBackend
+
+    choice = os.getenv('SERIES_BACKEND', 'auto').lower()
+    if choice in ('auto', 'kv'):
+        backend = make_backend('follower_series', max_entries=1000)
+        if isinstance(backend, RedisBackend) or choice == 'kv':
+            return CacheSeriesBackend(backend)
+    try:
+        return SQLiteSeriesBackend(SERIES_DB_PATH)
+    except sqlite3.Error as e:
+        # e.g. read-only filesystem on serverless hosts
+        print(f"⚠️ Could not open follower series database {SERIES_DB_PATH}: {e}, using memory")
+        return CacheSeriesBackend(MemoryBackend('follower_series', max_entries=1000))
+
+
+def _in_range(key, start, end):
+    return (start is None or key >= start) and (end is None or key <= end)
+
+
+class FollowerSeries:
+    """Range queries over one client's follower document"""
+
+    def __init__(self, doc=None):
+        self.platforms = (doc or {}).get('platforms', {})
+        self.updated_at = (doc or {}).get('updated_at')
+
+    def __bool__(self):
+        return bool(self.platforms)
+
+    def _points(self, granularity, start, end, platform):
+        points = {}
+        for platform_id, series in self.platforms.items():
+            if platform and platform_id != platform:
+                continue
+            buckets = series.get(granularity, {})
+            points[platform_id] = [(key, buckets[key]) for key in sorted(buckets) if _in_range(key, start, end)]
+        return points
+
+    def daily(self, start=None, end=None, platform=None):
+        """{platform: [(YYYY-MM-DD, followers), ...]} between start and end (inclusive)"""
+        return self._points('daily', start, end, platform)
+
+    def monthly(self, start=None, end=None, platform=None):
+        """{platform: [(YYYY-MM, followers), ...]} between start and end (inclusive)"""
+        return self._points('monthly', start, end, platform)
+
+    def monthly_totals(self, months):
+        """
+        Total followers across platforms for each YYYY-MM in ``months``.
+
+        A platform without a point in some month counts with its last earlier
+        value; months before any data are None.
+        """
+        totals = []
+        history = {pid: sorted(series.get('monthly', {}).items()) for pid, series in self.platforms.items()}
+        for month in months:
+            total = None
+            for points in history.values():
+                value = None
+                for key, followers in points:
+                    if key > month:
+                        break
+                    value = followers
+                if value is not None:
+                    total = (total or 0) + value
+            totals.append(total)
+        return totals
+
+    def latest(self, platform=None):
+        """Most recent daily count for a platform, or the sum over all platforms"""
+        values = []
+        for platform_id, series in self.platforms.items():
+            if platform and platform_id != platform:
+                continue
+            daily = series.get('daily', {})
+            if daily:
+                values.append(daily[max(daily)])
+        return sum(values) if values else None
+
+
+class SeriesStore:
+    """Appends follower counts to per-client documents, downsampled per day and month"""
+
+    def __init__(self, backend=None):
+        self._backend = backend
+        self._backend_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            with self._backend_lock:
+                if self._backend is None:
+                    self._backend = _make_backend()
+        return self._backend
+
+    def _load(self, client_id):
+        try:
+            return self.backend.get(client_id)
+        except Exception as e:
+            print(f"⚠️ Follower series read failed for {client_id}: {e}")
+            return None
+
+    def get(self, client_id):
+        """FollowerSeries for a client (empty if none recorded)"""
+        return FollowerSeries(self._load(client_id) if client_id else None)
+
+    def record_many(self, client_id, counts, at=None):
+        """
+        Record {platform: followers} for a client; the last count in each
+        day/month wins. Zero/missing counts are ignored. Returns True if
+        anything changed (unchanged counts don't rewrite the document).
+        """
+        counts = {platform: int(n) for platform, n in (counts or {}).items() if n}
+        if not client_id or not counts:
+            return False
+        at = at or datetime.now()
+        day, month = at.strftime('%Y-%m-%d'), at.strftime('%Y-%m')
+        cutoff = (at - timedelta(days=DAILY_RETENTION_DAYS)).strftime('%Y-%m-%d')
+
+        with self._write_lock:
+            doc = self._load(client_id) or {'platforms': {}}
+            changed = False
+            for platform, followers in counts.items():
+                series = doc['platforms'].setdefault(platform, {'daily': {}, 'monthly': {}})
+                if series['daily'].get(day) != followers or series['monthly'].get(month) != followers:
+                    series['daily'][day] = followers
+                    series['monthly'][month] = followers
+                    changed = True
+                for old_day in [d for d in series['daily'] if d < cutoff]:
+                    del series['daily'][old_day]
+                    changed = True
+            if not changed:
+                return False
+            doc['updated_at'] = time.time()
+            try:
+                self.backend.set(client_id, doc)
+            except Exception as e:
+                print(f"⚠️ Follower series write failed for {client_id}: {e}")
+                return False
+        return True
+
+    def record(self, client_id, platform, followers, at=None):
+        return self.record_many(client_id, {platform: followers}, at=at)
+
+
+_store = SeriesStore()
+
+
+def get_series_store():
+    """Process-wide follower series store"""
+    return _store
@@ -0,0 +1,177 @@
+"""
+Instagram insights ledger - per-account daily insight values
+
+bot.get_instagram_metrics used to ask the Graph API for a week of daily
+insights on every call. The ledger keeps each day's values per account in a
+local SQLite file (INSIGHTS_DB_PATH, WAL mode), so a fetch only asks for the
+days it doesn't have yet:
+
+    ledger = get_ledger()
+    ledger.totals(user_id, start, end, fetch)   # {'impressions': ..., 'reach': ...}
+    ledger.days(user_id, start, end)            # {'2025-03-14': {'impressions': ...}, ...}
+
+``fetch(since, until)`` returns {YYYY-MM-DD: {metric: value}} for the days
+since..until (inclusive); it is only called for the span of days that are
+missing or not settled. Graph numbers for recent days still change for a
+while, so a day only counts as final once it was fetched INSIGHTS_SETTLE_HOURS
+after it ended; until then it is refetched at most every
+INSIGHTS_REFRESH_SECONDS. Only complete days (before today) are stored.
+
+Falls back to an in-memory ledger when the file can't be opened (e.g.
+read-only filesystem on serverless hosts).
+"""
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+INSIGHTS_DB_PATH = os.getenv('INSIGHTS_DB_PATH', 'instagram_insights.db')
+INSIGHTS_SETTLE_HOURS = float(os.getenv('INSIGHTS_SETTLE_HOURS', '48'))
+INSIGHTS_REFRESH_SECONDS = float(os.getenv('INSIGHTS_REFRESH_SECONDS', '21600'))
+
+DEFAULT_METRICS = ('impressions', 'reach')
+
+
+def _day(value):
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+def _day_range(start, end):
+    day = start
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+
+class InsightsLedger:
+    """Daily insight values per account, stored as one row per (account, day, metric)"""
+
+    def __init__(self, path=':memory:'):
+        self.path = path
+        self._lock = threading.Lock()
+        # One fetch at a time per account, so concurrent reports don't fetch the same days
+        self._account_locks = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        if path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS instagram_insights ('
+            ' account_id TEXT NOT NULL,'
+            ' day TEXT NOT NULL,'
+            ' metric TEXT NOT NULL,'
+            ' value INTEGER NOT NULL,'
+            ' fetched_at REAL NOT NULL,'
+            ' PRIMARY KEY (account_id, day, metric))'
+        )
+        self._conn.commit()
+
+    def _account_lock(self, account_id):
+        with self._lock:
+            return self._account_locks.setdefault(account_id, threading.Lock())
+
+    def days(self, account_id, start, end):
+        """{YYYY-MM-DD: {metric: value}} stored for start..end (inclusive)"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT day, metric, value FROM instagram_insights'
+                ' WHERE account_id = ? AND day >= ? AND day <= ? ORDER BY day',
+                (str(account_id), _day(start).isoformat(), _day(end).isoformat())
+            ).fetchall()
+        days = {}
+        for day, metric, value in rows:
+            days.setdefault(day, {})[metric] = value
+        return days
+
+    def record(self, account_id, daily, metrics=DEFAULT_METRICS, fetched_at=None):
+        """Store {YYYY-MM-DD: {metric: value}}; metrics missing from a day are stored as 0"""
+        fetched_at = fetched_at or time.time()
+        rows = [
+            (str(account_id), _day(day).isoformat(), metric, int(values.get(metric) or 0), fetched_at)
+            for day, values in daily.items()
+            for metric in metrics
+        ]
+        with self._lock:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO instagram_insights (account_id, day, metric, value, fetched_at)'
+                ' VALUES (?, ?, ?, ?, ?)', rows
+            )
+            self._conn.commit()
+
+    def due_days(self, account_id, start, end, metrics=DEFAULT_METRICS, now=None):
+        """Complete days in start..end that are missing, or unsettled and due a refetch"""
+        now = now or time.time()
+        end = min(_day(end), date.today() - timedelta(days=1))
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT day, COUNT(*), MIN(fetched_at) FROM instagram_insights'
+                ' WHERE account_id = ? AND day >= ? AND day <= ? AND metric IN (%s)'
+                ' GROUP BY day' % ','.join('?' * len(metrics)),
+                (str(account_id), _day(start).isoformat(), end.isoformat(), *metrics)
+            ).fetchall()
+        stored = {day: (count, fetched_at) for day, count, fetched_at in rows}
+
+        due = []
+        for day in _day_range(_day(start), end):
+            count, fetched_at = stored.get(day.isoformat(), (0, 0))
+            if count < len(metrics):
+                due.append(day)
+                continue
+            day_end = datetime.combine(day + timedelta(days=1), datetime.min.time()).timestamp()
+            settled = fetched_at >= day_end + INSIGHTS_SETTLE_HOURS * 3600
+            if not settled and now - fetched_at >= INSIGHTS_REFRESH_SECONDS:
+                due.append(day)
+        return due
+
+    def ensure(self, account_id, start, end, fetch, metrics=DEFAULT_METRICS):
+        """Fetch and store the due days of start..end in one call; returns the number of days fetched"""
+        with self._account_lock(str(account_id)):
+            due = self.due_days(account_id, start, end, metrics)
+            if not due:
+                return 0
+            since, until = min(due), max(due)
+            fetched = fetch(since, until)
+            self.record(account_id, {
+                day.isoformat(): fetched.get(day.isoformat(), {})
+                for day in _day_range(since, until)
+            }, metrics)
+            return len(due)
+
+    def totals(self, account_id, start, end, fetch=None, metrics=DEFAULT_METRICS):
+        """{metric: sum over start..end}, fetching due days first when ``fetch`` is given"""
+        if fetch is not None:
+            self.ensure(account_id, start, end, fetch, metrics)
+        totals = dict.fromkeys(metrics, 0)
+        for values in self.days(account_id, start, end).values():
+            for metric in metrics:
+                totals[metric] += values.get(metric, 0)
+        return totals
+
+    def monthly_totals(self, account_id, start_month, end_month, metrics=DEFAULT_METRICS):
+        """{YYYY-MM: {metric: sum}} of stored days between two months (inclusive)"""
+        end = _day(f"{end_month}-01")
+        end = (end.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+        months = {}
+        for day, values in self.days(account_id, f"{start_month}-01", end).items():
+            month = months.setdefault(day[:7], dict.fromkeys(metrics, 0))
+            for metric in metrics:
+                month[metric] += values.get(metric, 0)
+        return months
+
+
+_ledger = None
+_ledger_lock = threading.Lock()
+
+
+def get_ledger():
+    """Process-wide insights ledger"""
+    global _ledger
+    if _ledger is None:
+        with _ledger_lock:
+            if _ledger is None:
+                try:
+                    _ledger = InsightsLedger(INSIGHTS_DB_PATH)
+                except sqlite3.Error as e:
+                    print(f"⚠️ Could not open insights database {INSIGHTS_DB_PATH}: {e}, using memory")
+                    _ledger = InsightsLedger()
+    return _ledger
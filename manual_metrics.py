@@ -0,0 +1,99 @@
+"""
+Manual metrics reader - one parsed, indexed copy of manual_metrics.json
+
+Report collection looks up many manual metrics per scope (every manual
+channel, conversion touchpoint, subscriber count and revenue). Instead of
+reopening and parsing the file for each lookup, load_manual_metrics()
+returns a ManualMetrics index that is only rebuilt when the file's mtime or
+size changes:
+
+    manual = load_manual_metrics()
+    manual.get(scope_id, 'calls_booked', '2025-03-10')
+    manual.range(scope_id, 'calls_booked', start='2025-01-01')
+
+File structure: {scope_id: {week_key: {metric_name: value}}}, plus the
+legacy flat structure {week_key: {metric_name: value}} for scopes that have
+no entry of their own.
+"""
+import bisect
+import json
+import os
+import threading
+
+MANUAL_METRICS_PATH = 'manual_metrics.json'
+
+
+class ManualMetrics:
+    """In-memory index of manual metric values keyed by (scope_id, week_key, metric)"""
+
+    def __init__(self, data=None):
+        self._values = {}
+        self._legacy = {}
+        self._series = {}
+        self._weeks = {}
+        for top_key, entries in (data or {}).items():
+            if not isinstance(entries, dict):
+                continue
+            for key, value in entries.items():
+                if isinstance(value, dict):
+                    # {scope_id: {week_key: {metric: value}}}
+                    self._weeks[(top_key, key)] = value
+                    for metric, metric_value in value.items():
+                        self._values[(top_key, key, metric)] = metric_value
+                        self._series.setdefault((top_key, metric), []).append((key, metric_value))
+                else:
+                    # Legacy {week_key: {metric: value}}
+                    self._legacy[(top_key, key)] = value
+        self._scopes = set(data or {})
+        for points in self._series.values():
+            points.sort(key=lambda point: point[0])
+
+    def get(self, scope_id, metric_name, week_key, default=0):
+        """Value of metric_name for a scope's week (legacy entries when the scope has none)"""
+        if scope_id in self._scopes:
+            return self._values.get((scope_id, week_key, metric_name), default)
+        return self._legacy.get((week_key, metric_name), default)
+
+    def week(self, scope_id, week_key):
+        """{metric: value} entered for a scope's week"""
+        return dict(self._weeks.get((scope_id, week_key), {}))
+
+    def range(self, scope_id, metric_name, start=None, end=None):
+        """[(week_key, value), ...] for a scope's metric between start and end (inclusive), oldest first"""
+        points = self._series.get((scope_id, metric_name), [])
+        keys = [key for key, _ in points]
+        lo = bisect.bisect_left(keys, start) if start is not None else 0
+        hi = bisect.bisect_right(keys, end) if end is not None else len(points)
+        return points[lo:hi]
+
+
+_cache = {'signature': None, 'index': ManualMetrics()}
+_cache_lock = threading.Lock()
+
+
+def load_manual_metrics(path=None):
+    """Indexed manual metrics, re-read only when the file has changed"""
+    path = path or MANUAL_METRICS_PATH
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return ManualMetrics()
+    signature = (path, stat.st_mtime_ns, stat.st_size)
+
+    with _cache_lock:
+        if _cache['signature'] == signature:
+            return _cache['index']
+        try:
+            with open(path, 'r') as f:
+                index = ManualMetrics(json.load(f))
+        except Exception as e:
+            print(f"⚠️ Error loading manual metrics: {e}")
+            return ManualMetrics()
+        _cache.update(signature=signature, index=index)
+        return index
+
+
+def invalidate():
+    """Drop the cached index (after writing the file)"""
+    with _cache_lock:
+        _cache.update(signature=None, index=ManualMetrics())
@@ -2,10 +2,106 @@
 Dynamic metric collection system - fetches metrics based on client's funnel structure
 """
 import os
-import json
 import requests
 from datetime import datetime, timedelta
-from bot import get_beehiiv_metrics, get_instagram_metrics, get_vercel_metrics
+from bot import get_beehiiv_metrics, get_instagram_metrics, get_vercel_metrics, instagram_window
+from metrics_store import get_metrics_store
+from utils.cache import SWRCache, make_backend
+from utils.executor import Deadline, fan_out
+
+# Whole collection (all API sources together) never waits longer than this
+METRICS_COLLECT_DEADLINE_SECONDS = float(os.getenv('METRICS_COLLECT_DEADLINE', '30'))
+METRICS_SOURCE_TIMEOUT = float(os.getenv('METRICS_SOURCE_TIMEOUT', '15'))
+# Per-source overrides, e.g. METRICS_TIMEOUT_INSTAGRAM=20
+SOURCE_TIMEOUTS = {
+    source: float(os.getenv(f'METRICS_TIMEOUT_{source.upper()}', METRICS_SOURCE_TIMEOUT))
+    for source in ('instagram', 'vercel', 'beehiiv')
+}
+
+# API responses shared across projects/clients on the same account, keyed by
+# (source, account, window start, window end); 0 disables
+METRICS_CACHE_TTL_SECONDS = float(os.getenv('METRICS_CACHE_TTL', '900'))
+# Shared KV when available, so every instance and the scheduler reuse responses;
+# identical concurrent fetches wait on one call
+_api_cache = SWRCache(
+    soft_ttl=METRICS_CACHE_TTL_SECONDS,
+    hard_ttl=METRICS_CACHE_TTL_SECONDS,
+    backend=make_backend('api_metrics', max_entries=500)
+)
+
+
+def _source_window(source):
+    """(start, end) dates of the data the source's bot.py fetcher returns"""
+    if source == 'instagram':
+        # The last 7 complete days (yesterday back), not the 7 days up to today
+        return instagram_window()
+    today = datetime.now().date()
+    if source == 'vercel':
+        return today - timedelta(days=7), today
+    # Beehiiv stats are current totals
+    return today, today
+
+
+def _cached(source, account, fetch, *args):
+    """fetch(*args) through the API response cache for the source's current window"""
+    if METRICS_CACHE_TTL_SECONDS <= 0:
+        return fetch(*args)
+    start, end = _source_window(source)
+    return _api_cache.get_or_compute(f"{source}:{account}:{start}:{end}", lambda: fetch(*args))
+
+
+def _source_request(source, connection):
+    """
+    (key, fetch) for one API source, or None when credentials are missing.
+
+    ``key`` names the account, so channels sharing one (e.g. a Beehiiv
+    awareness channel and the Beehiiv capture) share one call; responses are
+    also cached across collections (METRICS_CACHE_TTL).
+    """
+    if source == 'instagram':
+        user_id = connection.get('user_id')
+        access_token = connection.get('access_token') or os.getenv('INSTAGRAM_ACCESS_TOKEN')
+        if not user_id or not access_token:
+            return None
+        return f"instagram:{user_id}", lambda: _cached('instagram', user_id, get_instagram_metrics, user_id, access_token)
+
+    elif source == 'vercel':
+        project_id = connection.get('project_id')
+        token = connection.get('token') or os.getenv('VERCEL_TOKEN')
+        if not project_id or not token:
+            return None
+        return f"vercel:{project_id}", lambda: _cached('vercel', project_id, get_vercel_metrics, project_id, token)
+
+    elif source == 'beehiiv':
+        pub_id = connection.get('pub_id')
+        api_key = connection.get('api_key') or os.getenv('BEEHIIV_API_KEY')
+        if not pub_id or not api_key:
+            return None
+        return f"beehiiv:{pub_id}", lambda: _cached('beehiiv', pub_id, get_beehiiv_metrics, pub_id, api_key)
+
+    raise ValueError(f"Unknown source: {source}")
+
+
+def _pick_metric(source, data, metric_name):
+    """The value for metric_name out of a source's metrics dict"""
+    metric_name = (metric_name or '').lower()
+    if source == 'instagram':
+        # Return impressions for ig_impressions, reach for ig_reach, etc.
+        if 'impressions' in metric_name:
+            return data.get('impressions', 0)
+        elif 'reach' in metric_name:
+            return data.get('reach', 0)
+        return data.get('impressions', 0)
+
+    elif source == 'vercel':
+        if 'visitors' in metric_name:
+            return data.get('visitors', 0)
+        elif 'pageviews' in metric_name:
+            return data.get('pageviews', 0)
+        return data.get('visitors', 0)
+
+    return data  # Beehiiv: dict with subscribers, open_rate, click_rate
+
 
 def fetch_from_api(source, connection, metric_name=None):
     """
@@ -13,97 +109,60 @@ def fetch_from_api(source, connection, metric_name=None):
     Returns the metric value for the specified metric_name.
     """
     try:
-        if source == 'instagram':
-            user_id = connection.get('user_id')
-            access_token = connection.get('access_token') or os.getenv('INSTAGRAM_ACCESS_TOKEN')
-            if not user_id or not access_token:
-                return 0
-            data = get_instagram_metrics(user_id, access_token)
-            # Return impressions for ig_impressions, reach for ig_reach, etc.
-            if 'impressions' in metric_name.lower():
-                return data.get('impressions', 0)
-            elif 'reach' in metric_name.lower():
-                return data.get('reach', 0)
-            return data.get('impressions', 0)
-        
-        elif source == 'vercel':
-            project_id = connection.get('project_id')
-            token = connection.get('token') or os.getenv('VERCEL_TOKEN')
-            if not project_id or not token:
-                return 0
-            data = get_vercel_metrics(project_id, token)
-            if 'visitors' in metric_name.lower():
-                return data.get('visitors', 0)
-            elif 'pageviews' in metric_name.lower():
-                return data.get('pageviews', 0)
-            return data.get('visitors', 0)
-        
-        elif source == 'beehiiv':
-            pub_id = connection.get('pub_id')
-            api_key = connection.get('api_key') or os.getenv('BEEHIIV_API_KEY')
-            if not pub_id or not api_key:
-                return 0
-            data = get_beehiiv_metrics(pub_id, api_key)
-            return data  # Returns dict with subscribers, open_rate, click_rate
-        
-        else:
-            raise ValueError(f"Unknown source: {source}")
-    
+        request = _source_request(source, connection)
+        if request is None:
+            return 0
+        _, fetch = request
+        return _pick_metric(source, fetch(), metric_name)
+
     except Exception as e:
         print(f"❌ Error fetching from {source}: {e}")
         raise
 
+
+def _fetch_sources(requests_by_key, deadline):
+    """
+    Fetch every (source, fetch) in ``requests_by_key`` concurrently.
+
+    Each source gets its SOURCE_TIMEOUTS budget and none waits past
+    ``deadline``; returns fan_out's {key: TaskResult}.
+    """
+    if not requests_by_key:
+        return {}
+    return fan_out(
+        {key: fetch for key, (source, fetch) in requests_by_key.items()},
+        timeout=METRICS_SOURCE_TIMEOUT,
+        deadline=deadline,
+        timeouts={key: SOURCE_TIMEOUTS.get(source, METRICS_SOURCE_TIMEOUT)
+                  for key, (source, fetch) in requests_by_key.items()}
+    )
+
+
+def _source_value(results, key, source):
+    """A fetched source's metrics dict; raises if the fetch failed or timed out"""
+    result = results[key]
+    if not result.ok:
+        raise RuntimeError(f"{source} {result.status}: {result.error}")
+    return result.value
+
 def get_manual_metric(scope_id, metric_name, week_key=None):
     """
-    Get manually entered metric from manual_metrics.json
+    Get manually entered metric from the metrics store (metrics_store.py)
     Structure: {client_id: {week_key: {metric_name: value}}}
     Falls back to old structure: {week_key: {metric_name: value}} for backward compatibility
     """
     if week_key is None:
         week_key = datetime.now().strftime('%Y-%m-%d')
-    
-    try:
-        if os.path.exists('manual_metrics.json'):
-            with open('manual_metrics.json', 'r') as f:
-                data = json.load(f)
-                if scope_id in data:
-                    return data.get(scope_id, {}).get(week_key, {}).get(metric_name, 0)
-                # Fall back to old structure (legacy)
-                return data.get(week_key, {}).get(metric_name, 0)
-    except Exception as e:
-        print(f"⚠️ Error loading manual metric: {e}")
-    return 0
+    return get_metrics_store().manual_index().get(scope_id, metric_name, week_key)
 
 def save_manual_metric(scope_id, metric_name, value, week_key=None):
     """
-    Save manual metric to JSON file.
+    Save manual metric to the metrics store (one row per entry).
     Structure: {client_id: {week_key: {metric_name: value}}}
     """
     if week_key is None:
         week_key = datetime.now().strftime('%Y-%m-%d')
-    
-    try:
-        data = {}
-        if os.path.exists('manual_metrics.json'):
-            with open('manual_metrics.json', 'r') as f:
-                data = json.load(f)
-        
-        if scope_id not in data:
-            data[scope_id] = {}
-        
-        if week_key not in data[scope_id]:
-            data[scope_id][week_key] = {}
-        
-        data[scope_id][week_key][metric_name] = value
-        data[scope_id][week_key]['last_updated'] = datetime.now().isoformat()
-        
-        with open('manual_metrics.json', 'w') as f:
-            json.dump(data, f, indent=2)
-        
-        return True
-    except Exception as e:
-        print(f"⚠️ Error saving manual metric: {e}")
-        return False
+    return get_metrics_store().save_manual(scope_id, metric_name, value, week_key)
 
 def get_manual_metrics_list(client_data, project_data=None):
     """
@@ -148,11 +207,17 @@ def is_valid_metric(client_data, metric_name, project_data=None):
     
     return False
 
-def collect_all_metrics(client_data, project_data=None):
+def collect_all_metrics(client_data, project_data=None, deadline=None):
     """
     Dynamically collect metrics based on client's funnel structure.
     Handles any combination of channels, platforms, tracking methods.
     Returns metrics dict with graceful error handling.
+
+    API sources (awareness channels and the capture platform) are fetched
+    concurrently, so collection takes as long as the slowest source. Sources
+    still running at their SOURCE_TIMEOUTS budget or ``deadline`` (default
+    METRICS_COLLECT_DEADLINE) count as 0 and are listed in ``errors``;
+    ``source_status`` has each source's status and elapsed_ms.
     """
     client_id = client_data.get('client_id', 'unknown')
     project = project_data or {}
@@ -166,17 +231,53 @@ def collect_all_metrics(client_data, project_data=None):
     }
     
     funnel_structure = project.get('funnel_structure', {}) or client_data.get('funnel_structure', {})
-    
+    channels = funnel_structure.get('awareness', {}).get('channels', [])
+    capture_config = funnel_structure.get('capture', {})
+    deadline = deadline or Deadline(METRICS_COLLECT_DEADLINE_SECONDS)
+    # One index of the manual metrics for every manual lookup below
+    manual = get_metrics_store().manual_index()
+    week_key = datetime.now().strftime('%Y-%m-%d')
+
+    # Start every API source up front; channels then read their results
+    source_requests = {}
+    request_errors = {}
+
+    def plan(slot, source, connection):
+        try:
+            request = _source_request(source, connection)
+        except ValueError as e:
+            request_errors[slot] = e
+            return None
+        if request is None:
+            return None
+        key, fetch = request
+        source_requests.setdefault(key, (source, fetch))
+        return key
+
+    channel_keys = {}
+    for i, channel in enumerate(channels):
+        if channel.get('tracking', 'manual') == 'auto' and channel.get('source') and channel.get('api_connection'):
+            channel_keys[i] = plan(i, channel['source'], channel['api_connection'])
+    capture_key = None
+    if capture_config.get('tracking') == 'auto' and capture_config.get('platform_id', 'beehiiv') == 'beehiiv':
+        capture_key = plan('capture', 'beehiiv', capture_config.get('api_connection', {}))
+
+    results = _fetch_sources(source_requests, deadline)
+    metrics['source_status'] = {
+        key: {'status': result.status, 'elapsed_ms': result.elapsed_ms, 'error': result.error}
+        for key, result in results.items()
+    }
+
     # AWARENESS - loop through all channels
     total_reach = 0
-    for channel in funnel_structure.get('awareness', {}).get('channels', []):
+    for i, channel in enumerate(channels):
         try:
             channel_name = channel.get('name', 'Unknown')
             tracking = channel.get('tracking', 'manual')
             metric_name = channel.get('metric_name', '')
             
             if tracking == 'auto':
-                # Fetch from API based on source
+                # Fetched from the API source above
                 source = channel.get('source')
                 api_connection = channel.get('api_connection', {})
                 
@@ -185,13 +286,16 @@ def collect_all_metrics(client_data, project_data=None):
                     metrics['awareness'][channel_name] = 0
                     continue
                 
-                value = fetch_from_api(source, api_connection, metric_name)
+                if i in request_errors:
+                    raise request_errors[i]
+                key = channel_keys.get(i)
+                value = _pick_metric(source, _source_value(results, key, source), metric_name) if key else 0
                 metrics['awareness'][channel_name] = value
                 total_reach += value
                 
             else:
                 # Get from manual_metrics.json
-                value = get_manual_metric(scope_id, metric_name)
+                value = manual.get(scope_id, metric_name, week_key)
                 metrics['awareness'][channel_name] = value
                 total_reach += value
                 
@@ -205,17 +309,12 @@ def collect_all_metrics(client_data, project_data=None):
     
     # CAPTURE
     try:
-        capture_config = funnel_structure.get('capture', {})
         if capture_config.get('tracking') == 'auto':
             platform_id = capture_config.get('platform_id', 'beehiiv')
-            api_connection = capture_config.get('api_connection', {})
             
             if platform_id == 'beehiiv':
-                pub_id = api_connection.get('pub_id')
-                api_key = api_connection.get('api_key') or os.getenv('BEEHIIV_API_KEY')
-                
-                if pub_id and api_key:
-                    capture_data = get_beehiiv_metrics(pub_id, api_key)
+                if capture_key:
+                    capture_data = _source_value(results, capture_key, 'beehiiv')
                     # Calculate new subscribers (would need last week's data)
                     metrics['capture'] = {
                         'total_subscribers': capture_data.get('subscribers', 0),
@@ -232,8 +331,8 @@ def collect_all_metrics(client_data, project_data=None):
         else:
             # Manual capture tracking
             metrics['capture'] = {
-                'total_subscribers': get_manual_metric(scope_id, 'total_subscribers'),
-                'new_subscribers': get_manual_metric(scope_id, 'new_subscribers'),
+                'total_subscribers': manual.get(scope_id, 'total_subscribers', week_key),
+                'new_subscribers': manual.get(scope_id, 'new_subscribers', week_key),
                 'open_rate': 0,
                 'click_rate': 0,
                 'opens': 0,
@@ -263,7 +362,7 @@ def collect_all_metrics(client_data, project_data=None):
         try:
             tp_name = touchpoint.get('name', 'Unknown')
             metric_name = touchpoint.get('metric_name', '')
-            value = get_manual_metric(scope_id, metric_name)
+            value = manual.get(scope_id, metric_name, week_key)
             metrics['conversion'][tp_name] = value
         except Exception as e:
             metrics['errors'].append(f"{touchpoint.get('name')}: {str(e)}")
@@ -292,7 +391,7 @@ def collect_all_metrics(client_data, project_data=None):
     }
     
     metrics['fans_total'] = metrics['capture'].get('total_subscribers', 0)
-    revenue_manual = get_manual_metric(scope_id, 'monthly_revenue')
+    revenue_manual = manual.get(scope_id, 'monthly_revenue', week_key)
     metrics['monthly_revenue'] = revenue_manual or 0
     metrics['scope_id'] = scope_id
     metrics['project_name'] = project.get('project_name', client_data.get('name'))
@@ -0,0 +1,395 @@
+"""
+Metrics store - manual metric entries and saved report snapshots
+
+Manual metrics (/update) and the metrics saved after each report
+(scheduler.save_metrics) used to live in manual_metrics.json and
+metrics_history.json, each rewritten in full on every save and keeping only
+the last snapshot per scope. With the SQLite backend every save is a
+single-row insert into a local file (METRICS_DB_PATH, WAL mode):
+
+- manual_metrics: one row per entry (scope_id, period, metric, value); the
+  latest row for a (scope_id, period, metric) wins
+- metric_snapshots: one row per saved report (scope_id, period, data), so
+  the full history is kept for trend reports
+
+Both tables are indexed on (scope_id, period). Legacy flat manual entries
+({week_key: {metric: value}}) are stored with an empty scope_id.
+
+Backends (METRICS_BACKEND):
+- sqlite: the SQLite file; the JSON files are imported into it once, the
+  first time it is opened
+- json: the original JSON files
+- auto (default): sqlite, else json (e.g. read-only filesystem on serverless
+  hosts)
+
+Migrate explicitly (or re-import) with:
+    python metrics_store.py --import-json [--force]
+
+Importing again only adds rows that aren't in the tables yet.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from manual_metrics import MANUAL_METRICS_PATH, ManualMetrics, invalidate, load_manual_metrics
+
+METRICS_DB_PATH = os.getenv('METRICS_DB_PATH', 'metrics.db')
+METRICS_HISTORY_PATH = 'metrics_history.json'
+LEGACY_SCOPE = ''
+
+JSON_IMPORT = 'json_import'
+
+
+def _period_of(snapshot):
+    """YYYY-MM-DD a snapshot was taken (from its 'date')"""
+    return (snapshot.get('date') or datetime.now().isoformat())[:10]
+
+
+class SQLiteMetricsBackend:
+    """Manual metric entries and report snapshots in a local SQLite file"""
+
+    name = 'sqlite'
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._index = None
+        self._index_version = None
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(
+            'CREATE TABLE IF NOT EXISTS manual_metrics ('
+            ' id INTEGER PRIMARY KEY,'
+            ' scope_id TEXT NOT NULL,'
+            ' period TEXT NOT NULL,'
+            ' metric TEXT NOT NULL,'
+            ' value TEXT NOT NULL,'
+            ' recorded_at TEXT NOT NULL);'
+            'CREATE INDEX IF NOT EXISTS manual_metrics_scope_period'
+            ' ON manual_metrics (scope_id, period, metric);'
+            'CREATE TABLE IF NOT EXISTS metric_snapshots ('
+            ' id INTEGER PRIMARY KEY,'
+            ' scope_id TEXT NOT NULL,'
+            ' period TEXT NOT NULL,'
+            ' data TEXT NOT NULL,'
+            ' recorded_at TEXT NOT NULL);'
+            'CREATE INDEX IF NOT EXISTS metric_snapshots_scope_period'
+            ' ON metric_snapshots (scope_id, period);'
+            'CREATE TABLE IF NOT EXISTS migrations ('
+            ' name TEXT PRIMARY KEY,'
+            ' applied_at TEXT NOT NULL);'
+        )
+        self._conn.commit()
+        # So a repeated import skips rows it already copied (INSERT OR IGNORE)
+        self._unique_index('manual_metrics_entry', 'manual_metrics', 'scope_id, period, metric, recorded_at')
+        self._unique_index('metric_snapshots_entry', 'metric_snapshots', 'scope_id, period, recorded_at')
+
+    def _unique_index(self, name, table, columns):
+        if self._conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (name,)).fetchone():
+            return
+        with self._conn:
+            # Databases from before the index may hold duplicate imports; keep the first copy
+            self._conn.execute(
+                f'DELETE FROM {table} WHERE id NOT IN (SELECT MIN(id) FROM {table} GROUP BY {columns})'
+            )
+            self._conn.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS {name} ON {table} ({columns})')
+
+    # ---------- manual metrics ----------
+
+    def add_manual(self, scope_id, period, metric, value, recorded_at):
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO manual_metrics (scope_id, period, metric, value, recorded_at) VALUES (?, ?, ?, ?, ?)',
+                (scope_id, period, metric, json.dumps(value), recorded_at)
+            )
+            self._conn.commit()
+            self._writes += 1
+
+    def manual_index(self):
+        with self._lock:
+            # data_version moves when other connections (processes) commit
+            version = (self._conn.execute('PRAGMA data_version').fetchone()[0], self._writes)
+            if self._index is not None and self._index_version == version:
+                return self._index
+            rows = self._conn.execute(
+                'SELECT scope_id, period, metric, value, recorded_at FROM manual_metrics ORDER BY id'
+            ).fetchall()
+            data = {}
+            for scope_id, period, metric, value, recorded_at in rows:
+                # Same shape as manual_metrics.json; later rows overwrite earlier ones
+                entries = data.setdefault(period, {}) if scope_id == LEGACY_SCOPE \
+                    else data.setdefault(scope_id, {}).setdefault(period, {})
+                entries[metric] = json.loads(value)
+                entries['last_updated'] = recorded_at
+            self._index, self._index_version = ManualMetrics(data), version
+            return self._index
+
+    # ---------- report snapshots ----------
+
+    def add_snapshot(self, scope_id, snapshot):
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO metric_snapshots (scope_id, period, data, recorded_at) VALUES (?, ?, ?, ?)',
+                (scope_id, _period_of(snapshot), json.dumps(snapshot, separators=(',', ':')),
+                 datetime.now().isoformat())
+            )
+            self._conn.commit()
+
+    def last_snapshot(self, scope_id):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT data FROM metric_snapshots WHERE scope_id = ? ORDER BY period DESC, id DESC LIMIT 1',
+                (scope_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def history(self, scope_prefix=None, start=None, end=None):
+        query = 'SELECT scope_id, data FROM metric_snapshots WHERE 1 = 1'
+        params = []
+        if scope_prefix:
+            query += " AND scope_id >= ? AND scope_id < ?"
+            params += [scope_prefix, scope_prefix + '\uffff']
+        if start:
+            query += ' AND period >= ?'
+            params.append(start)
+        if end:
+            query += ' AND period <= ?'
+            params.append(end)
+        with self._lock:
+            rows = self._conn.execute(query + ' ORDER BY period, id', params).fetchall()
+        return [(scope_id, json.loads(data)) for scope_id, data in rows]
+
+    # ---------- migration ----------
+
+    def migrated(self, name):
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM migrations WHERE name = ?', (name,)).fetchone() is not None
+
+    def import_json(self, manual_path=MANUAL_METRICS_PATH, history_path=METRICS_HISTORY_PATH, force=False):
+        """
+        Copy the JSON files' contents into the tables.
+
+        Returns (manual rows, snapshots) added, or None when the files were
+        already imported and ``force`` isn't set. Rows that are already in
+        the tables are skipped, so importing again never duplicates them.
+        """
+        manual_rows, snapshot_rows = [], []
+        if os.path.exists(manual_path):
+            with open(manual_path, 'r') as f:
+                manual = json.load(f)
+            for top_key, entries in manual.items():
+                if not isinstance(entries, dict):
+                    continue
+                if entries and all(isinstance(v, dict) for v in entries.values()):
+                    weeks = [(top_key, period, values) for period, values in entries.items()]
+                else:
+                    weeks = [(LEGACY_SCOPE, top_key, entries)]
+                for scope_id, period, values in weeks:
+                    # Stable without last_updated, so re-imports match the same rows
+                    recorded_at = values.get('last_updated') or period
+                    manual_rows += [
+                        (scope_id, period, metric, json.dumps(value), recorded_at)
+                        for metric, value in values.items() if metric != 'last_updated'
+                    ]
+        if os.path.exists(history_path):
+            with open(history_path, 'r') as f:
+                history = json.load(f)
+            snapshot_rows = [
+                (scope_id, _period_of(snapshot), json.dumps(snapshot, separators=(',', ':')),
+                 snapshot.get('date') or _period_of(snapshot))
+                for scope_id, snapshot in history.items() if isinstance(snapshot, dict)
+            ]
+
+        with self._lock:
+            # Write lock before the check, so two processes opening a fresh
+            # database don't both import
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                done = self._conn.execute('SELECT 1 FROM migrations WHERE name = ?', (JSON_IMPORT,)).fetchone()
+                if done and not force:
+                    self._conn.rollback()
+                    return None
+                manual_added = self._conn.executemany(
+                    'INSERT OR IGNORE INTO manual_metrics (scope_id, period, metric, value, recorded_at)'
+                    ' VALUES (?, ?, ?, ?, ?)', manual_rows
+                ).rowcount
+                snapshots_added = self._conn.executemany(
+                    'INSERT OR IGNORE INTO metric_snapshots (scope_id, period, data, recorded_at) VALUES (?, ?, ?, ?)',
+                    snapshot_rows
+                ).rowcount
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO migrations (name, applied_at) VALUES (?, ?)',
+                    (JSON_IMPORT, datetime.now().isoformat())
+                )
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+            self._writes += 1
+        return max(manual_added, 0), max(snapshots_added, 0)
+
+
+class JSONMetricsBackend:
+    """The original manual_metrics.json / metrics_history.json files (last snapshot per scope only)"""
+
+    name = 'json'
+
+    def __init__(self, manual_path=MANUAL_METRICS_PATH, history_path=METRICS_HISTORY_PATH):
+        self.manual_path = manual_path
+        self.history_path = history_path
+        self._lock = threading.Lock()
+
+    def _read(self, path):
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def add_manual(self, scope_id, period, metric, value, recorded_at):
+        with self._lock:
+            data = self._read(self.manual_path)
+            entries = data.setdefault(period, {}) if scope_id == LEGACY_SCOPE \
+                else data.setdefault(scope_id, {}).setdefault(period, {})
+            entries[metric] = value
+            entries['last_updated'] = recorded_at
+            with open(self.manual_path, 'w') as f:
+                json.dump(data, f, indent=2)
+            invalidate()
+
+    def manual_index(self):
+        return load_manual_metrics(self.manual_path)
+
+    def add_snapshot(self, scope_id, snapshot):
+        with self._lock:
+            history = self._read(self.history_path)
+            history[scope_id] = snapshot
+            with open(self.history_path, 'w') as f:
+                json.dump(history, f, indent=2)
+
+    def last_snapshot(self, scope_id):
+        return self._read(self.history_path).get(scope_id, {})
+
+    def history(self, scope_prefix=None, start=None, end=None):
+        snapshots = [
+            (scope_id, snapshot) for scope_id, snapshot in self._read(self.history_path).items()
+            if (not scope_prefix or scope_id.startswith(scope_prefix))
+            and (not start or _period_of(snapshot) >= start)
+            and (not end or _period_of(snapshot) <= end)
+        ]
+        return sorted(snapshots, key=lambda item: _period_of(item[1]))
+
+
+def _make_backend():
+    choice = os.getenv('METRICS_BACKEND', 'auto').lower()
+    if choice == 'json':
+        return JSONMetricsBackend()
+    try:
+        backend = SQLiteMetricsBackend(METRICS_DB_PATH)
+    except sqlite3.Error as e:
+        print(f"⚠️ Could not open metrics database {METRICS_DB_PATH}: {e}, using JSON files")
+        return JSONMetricsBackend()
+    if not backend.migrated(JSON_IMPORT):
+        try:
+            # Re-checked inside import_json's transaction (another process may have imported since)
+            imported = backend.import_json()
+            if imported and any(imported):
+                print(f"✅ Imported {imported[0]} manual metrics and {imported[1]} report snapshots into {METRICS_DB_PATH}")
+        except Exception as e:
+            print(f"⚠️ Could not import JSON metrics into {METRICS_DB_PATH}: {e}")
+    return backend
+
+
+class MetricsStore:
+    """Manual metrics and report snapshots on the configured backend"""
+
+    def __init__(self, backend=None):
+        self._backend = backend
+        self._backend_lock = threading.Lock()
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            with self._backend_lock:
+                if self._backend is None:
+                    self._backend = _make_backend()
+        return self._backend
+
+    def manual_index(self):
+        """ManualMetrics index of the current manual entries"""
+        try:
+            return self.backend.manual_index()
+        except Exception as e:
+            print(f"⚠️ Error loading manual metrics: {e}")
+            return ManualMetrics()
+
+    def save_manual(self, scope_id, metric_name, value, period):
+        """Record one manual metric value; scope_id None stores a legacy (unscoped) entry"""
+        try:
+            self.backend.add_manual(scope_id or LEGACY_SCOPE, period, metric_name, value,
+                                    datetime.now().isoformat())
+            return True
+        except Exception as e:
+            print(f"⚠️ Error saving manual metric: {e}")
+            return False
+
+    def save_snapshot(self, scope_id, snapshot):
+        """Append a report's metrics snapshot (a dict with a 'date') for a scope"""
+        try:
+            self.backend.add_snapshot(scope_id, snapshot)
+        except Exception as e:
+            print(f"⚠️ Error saving metrics history: {e}")
+            return False
+        from content.data_version import bump_version
+        bump_version('metrics_history')
+        return True
+
+    def last_snapshot(self, scope_id):
+        """Most recent snapshot for a scope, or {}"""
+        try:
+            return self.backend.last_snapshot(scope_id)
+        except Exception as e:
+            print(f"⚠️ Error loading metrics history: {e}")
+            return {}
+
+    def history(self, scope_prefix=None, start=None, end=None):
+        """[(scope_id, snapshot), ...] oldest first, for scopes starting with scope_prefix and periods in range"""
+        try:
+            return self.backend.history(scope_prefix, start, end)
+        except Exception as e:
+            print(f"⚠️ Error loading metrics history: {e}")
+            return []
+
+
+_store = MetricsStore()
+
+
+def get_metrics_store():
+    """Process-wide metrics store"""
+    return _store
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import manual_metrics.json and metrics_history.json into SQLite')
+    parser.add_argument('--import-json', action='store_true', help='import the JSON files')
+    parser.add_argument('--force', action='store_true', help='import even if they were imported before')
+    args = parser.parse_args()
+
+    backend = SQLiteMetricsBackend(METRICS_DB_PATH)
+    if not args.import_json:
+        state = 'imported' if backend.migrated(JSON_IMPORT) else 'not imported yet'
+        print(f"ℹ️ {METRICS_DB_PATH}: JSON files {state}")
+        return
+    imported = backend.import_json(force=args.force)
+    if imported is None:
+        print(f"ℹ️ JSON files were already imported into {METRICS_DB_PATH} (use --force to import again)")
+        return
+    manual_rows, snapshots = imported
+    print(f"✅ Imported {manual_rows} manual metrics and {snapshots} report snapshots into {METRICS_DB_PATH}")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,8 +4,6 @@ EXACT working format - no changes to layout
 """
 from datetime import datetime, timedelta
 from report_formatter import generate_action_plan
-import json
-import os
 from content.pillar_tracker import get_pillars, get_pillar_performance
 from content.center_post import list_posts
 
@@ -40,14 +38,8 @@ def build_stat_box(label, value_str, delta_str):
 
 def get_last_week_metrics(client_id):
     """Load last week's metrics for comparison"""
-    try:
-        if os.path.exists('metrics_history.json'):
-            with open('metrics_history.json', 'r') as f:
-                history = json.load(f)
-                return history.get(client_id, {})
-    except:
-        pass
-    return {}
+    from metrics_store import get_metrics_store
+    return get_metrics_store().last_snapshot(client_id)
 
 def get_channel_emoji(channel_type):
     """Map channel type to emoji"""
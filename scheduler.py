@@ -4,46 +4,29 @@ Auto-report scheduling system - sends reports based on client settings
 import schedule
 import time
 import json
-import os
 from datetime import datetime
 import pytz
 from bot import send_telegram_message
 from metrics_collector import collect_all_metrics
+from metrics_store import get_metrics_store
 from report_formatter_dynamic import generate_full_report
 from utils.projects import extract_projects
+from utils.client_registry import get_client
 
 def load_last_period_metrics(scope_id):
     """Load last saved metrics for comparison"""
-    try:
-        if os.path.exists('metrics_history.json'):
-            with open('metrics_history.json', 'r') as f:
-                history = json.load(f)
-                return history.get(scope_id, {})
-    except:
-        pass
-    return {}
+    return get_metrics_store().last_snapshot(scope_id)
 
 def save_metrics(scope_id, metrics):
-    """Save current metrics for next comparison"""
-    try:
-        history = {}
-        if os.path.exists('metrics_history.json'):
-            with open('metrics_history.json', 'r') as f:
-                history = json.load(f)
-        
-        history[scope_id] = {
-            'awareness': metrics.get('awareness', {}),
-            'capture': metrics.get('capture', {}),
-            'conversion': metrics.get('conversion', {}),
-            'fans_total': metrics.get('fans_total'),
-            'monthly_revenue': metrics.get('monthly_revenue'),
-            'date': datetime.now().isoformat()
-        }
-        
-        with open('metrics_history.json', 'w') as f:
-            json.dump(history, f, indent=2)
-    except Exception as e:
-        print(f"⚠️ Error saving metrics history: {e}")
+    """Save current metrics for next comparison (and trend history)"""
+    get_metrics_store().save_snapshot(scope_id, {
+        'awareness': metrics.get('awareness', {}),
+        'capture': metrics.get('capture', {}),
+        'conversion': metrics.get('conversion', {}),
+        'fans_total': metrics.get('fans_total'),
+        'monthly_revenue': metrics.get('monthly_revenue'),
+        'date': datetime.now().isoformat()
+    })
 
 def send_weekly_report(client_id):
     """
@@ -51,15 +34,7 @@ def send_weekly_report(client_id):
     """
     try:
         # Load client data
-        with open('clients.json', 'r') as f:
-            data = json.load(f)
-        
-        client = None
-        for c in data['clients']:
-            if c.get('client_id') == client_id:
-                client = c
-                break
-        
+        client = get_client(client_id)
         if not client:
             print(f"❌ Client {client_id} not found")
             return
@@ -166,6 +141,21 @@ def schedule_client_reports():
     except Exception as e:
         print(f"❌ Error setting up schedules: {e}")
 
+def schedule_follower_refresh(run_now=False):
+    """
+    Refresh follower snapshots for all clients every refresh window.
+
+    Runs on a background thread so long (spread-out) refreshes don't delay reports.
+    """
+    from follower_refresh import REFRESH_ENABLED, REFRESH_WINDOW_SECONDS, start_refresh_thread
+    if not REFRESH_ENABLED:
+        print("⏸️ Follower refresh disabled (FOLLOWER_REFRESH=false)")
+        return
+    schedule.every(REFRESH_WINDOW_SECONDS).seconds.do(start_refresh_thread).tag('follower_refresh')
+    print(f"📅 Scheduled follower refresh every {REFRESH_WINDOW_SECONDS}s")
+    if run_now:
+        start_refresh_thread()
+
 def run_scheduler():
     """
     Main loop that runs the scheduler continuously.
@@ -174,6 +164,7 @@ def run_scheduler():
     
     # Initial setup
     schedule_client_reports()
+    schedule_follower_refresh(run_now=True)
     
     # Run forever
     while True:
@@ -185,6 +176,7 @@ def run_scheduler():
         if current_time.hour == 0 and current_time.minute == 0:
             schedule.clear()
             schedule_client_reports()
+            schedule_follower_refresh()
             print("🔄 Resynced client schedules")
 
 if __name__ == "__main__":
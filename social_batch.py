@@ -0,0 +1,242 @@
+"""
+Batch profile scraping on asyncio - bulk follower refreshes
+
+scrape_many() fetches many (platform, url) profiles concurrently and yields
+each result as soon as it finishes:
+
+    async for result in scrape_many(targets, concurrency=20):
+        print(result['platform'], result['url'], result['data'], result['error'])
+
+- at most ``concurrency`` profiles are in flight, and at most ``per_host``
+  per host
+- every request goes through the host's rate limiter and circuit breaker
+  (utils/throttle.py); batch requests wait up to SCRAPE_TOKEN_WAIT for a
+  rate token instead of failing fast like request-time scrapes
+- pages are streamed (stopping at the platform's marker, with conditional
+  requests) like social_scraper.get_followers_from_url, with aiohttp when
+  it's installed, otherwise with the pooled session on a thread pool
+- pages are parsed by social_scraper.parse_profile in a process pool, so
+  parsing never blocks the event loop (SCRAPE_PARSE_POOL=thread uses
+  threads instead, e.g. where processes can't be forked)
+
+scrape_all() is the blocking wrapper for scripts and cron jobs.
+"""
+import asyncio
+import contextlib
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import social_scraper
+from utils.throttle import ThrottleRejected, get_guard, host_of
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    aiohttp = None
+    AIOHTTP_AVAILABLE = False
+
+SCRAPE_CONCURRENCY = int(os.getenv('SCRAPE_CONCURRENCY', '20'))
+SCRAPE_PER_HOST = int(os.getenv('SCRAPE_PER_HOST', '2'))
+SCRAPE_PARSE_POOL = os.getenv('SCRAPE_PARSE_POOL', 'process').lower()
+SCRAPE_PARSE_WORKERS = int(os.getenv('SCRAPE_PARSE_WORKERS', str(min(4, os.cpu_count() or 1))))
+SCRAPE_TOKEN_WAIT = float(os.getenv('SCRAPE_TOKEN_WAIT', '120'))
+
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+def make_parse_pool():
+    """Executor for parse_profile per SCRAPE_PARSE_POOL; pass it to scrape_many to reuse it across batches"""
+    if SCRAPE_PARSE_POOL == 'thread':
+        return ThreadPoolExecutor(max_workers=SCRAPE_PARSE_WORKERS, thread_name_prefix='scrape-parse')
+    return ProcessPoolExecutor(max_workers=SCRAPE_PARSE_WORKERS)
+
+
+def _aiohttp_session(concurrency, per_host):
+    headers = dict(social_scraper.BROWSER_HEADERS)
+    # aiohttp negotiates the encodings it can decode itself
+    headers.pop('Accept-Encoding', None)
+    return aiohttp.ClientSession(
+        headers=headers,
+        connector=aiohttp.TCPConnector(limit=concurrency, limit_per_host=per_host),
+        timeout=aiohttp.ClientTimeout(
+            sock_connect=social_scraper.SCRAPER_CONNECT_TIMEOUT,
+            sock_read=social_scraper.SCRAPER_READ_TIMEOUT
+        )
+    )
+
+
+async def _fetch_aiohttp(session, platform, url, validators=None, slot=None):
+    """
+    Streamed PageReader via aiohttp, with the same retry policy as the pooled session.
+
+    ``slot`` (a semaphore) is only held while a request is in flight, not
+    while waiting for a rate token or backing off.
+    """
+    guard = get_guard(url)
+    attempt = 0
+    while True:
+        await guard.before_request_async(SCRAPE_TOKEN_WAIT)
+        try:
+            async with slot or contextlib.nullcontext(), session.get(
+                social_scraper.fetch_url_for(url),
+                headers=social_scraper.conditional_headers(validators)
+            ) as response:
+                status = response.status
+                if status >= 400:
+                    guard.record_response(response)
+                else:
+                    page = social_scraper.PageReader(
+                        platform if status != 304 else None,
+                        encoding=social_scraper.response_encoding(response.headers.get('Content-Type'))
+                    )
+                    page.not_modified = status == 304
+                    page.etag = response.headers.get('ETag')
+                    page.last_modified = response.headers.get('Last-Modified')
+                    if not page.not_modified:
+                        async for chunk in response.content.iter_chunked(social_scraper.SCRAPER_CHUNK_SIZE):
+                            if page.feed(chunk):
+                                break
+                    # Only once the body was read, so read errors count as failures
+                    guard.record_response(response)
+                    return page
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            guard.record_failure(f"{type(e).__name__}: {e}")
+            if attempt >= social_scraper.SCRAPER_MAX_RETRIES:
+                raise
+        else:
+            if status not in RETRY_STATUSES or attempt >= social_scraper.SCRAPER_MAX_RETRIES:
+                raise RuntimeError(f"HTTP {status} for {url}")
+        attempt += 1
+        # Full jitter, like social_scraper's retries
+        await asyncio.sleep(random.uniform(0, social_scraper.SCRAPER_BACKOFF_FACTOR * (2 ** attempt)))
+
+
+def _read_page(platform, url, validators):
+    """Blocking streamed GET through the pooled session (runs on the I/O pool)"""
+    guard = get_guard(url)
+    try:
+        response = social_scraper.get_session().get(
+            social_scraper.fetch_url_for(url),
+            headers=social_scraper.conditional_headers(validators),
+            stream=True,
+            timeout=(social_scraper.SCRAPER_CONNECT_TIMEOUT, social_scraper.SCRAPER_READ_TIMEOUT)
+        )
+    except Exception as e:
+        guard.record_failure(f"{type(e).__name__}: {e}")
+        raise
+    if response.status_code >= 400:
+        guard.record_response(response)
+        return social_scraper.read_response(response, platform)
+    try:
+        page = social_scraper.read_response(response, platform)
+    except Exception as e:
+        guard.record_failure(f"{type(e).__name__}: {e}")
+        raise
+    guard.record_response(response)
+    return page
+
+
+async def _fetch_threaded(io_pool, platform, url, validators=None, slot=None):
+    """Streamed PageReader via the pooled requests session on a worker thread (``slot`` as in _fetch_aiohttp)"""
+    await get_guard(url).before_request_async(SCRAPE_TOKEN_WAIT)
+    async with slot or contextlib.nullcontext():
+        return await asyncio.get_running_loop().run_in_executor(io_pool, _read_page, platform, url, validators)
+
+
+async def scrape_many(targets, concurrency=None, per_host=None, parse_executor=None):
+    """
+    Scrape (platform, url) profiles concurrently, yielding results as they finish.
+
+    Each result is a dict with platform, url (as given), data (the
+    get_followers_from_url dict, or None), error (None on success),
+    throttled (True when the host's rate limiter or circuit breaker refused
+    the request, so nothing was sent) and elapsed_ms. Pass ``parse_executor``
+    to reuse a pool across batches; otherwise one is created and shut down
+    per call.
+    """
+    targets = [(platform, url) for platform, url in targets if url]
+    if not targets:
+        return
+    concurrency = concurrency or SCRAPE_CONCURRENCY
+    per_host = per_host or SCRAPE_PER_HOST
+
+    loop = asyncio.get_running_loop()
+    limit = asyncio.Semaphore(concurrency)
+    host_limits = {}
+    parse_pool = parse_executor or make_parse_pool()
+    session = _aiohttp_session(concurrency, per_host) if AIOHTTP_AVAILABLE else None
+    io_pool = None if session else ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='scrape-io')
+
+    async def scrape_one(platform, url):
+        start = time.perf_counter()
+        result = {'platform': platform, 'url': url, 'data': None, 'error': None, 'throttled': False}
+        try:
+            profile_url = social_scraper.normalize_profile_url(url)
+            host = host_of(profile_url)
+            if host not in host_limits:
+                host_limits[host] = asyncio.Semaphore(per_host)
+
+            async def fetch(stop_early=True, validators=None):
+                # Host slot first; a global slot only once the rate token is in hand,
+                # so targets waiting on one slow host don't block other hosts
+                async with host_limits[host]:
+                    page_platform = platform if stop_early and social_scraper.SCRAPER_STREAM else None
+                    if session:
+                        return await _fetch_aiohttp(session, page_platform, profile_url, validators, slot=limit)
+                    return await _fetch_threaded(io_pool, page_platform, profile_url, validators, slot=limit)
+
+            async def parse(page):
+                return await loop.run_in_executor(
+                    parse_pool, social_scraper.parse_profile, platform, page.text, profile_url
+                )
+
+            # Same streaming/conditional flow as social_scraper.get_followers_from_url
+            validators = social_scraper.get_validators(profile_url)
+            page = await fetch(validators=validators)
+            if page.not_modified and validators:
+                data = dict(validators['result'])
+            else:
+                if page.not_modified:
+                    page = await fetch()
+                data = await parse(page)
+                if social_scraper.needs_full_page(page, data):
+                    page = await fetch(stop_early=False)
+                    data = await parse(page)
+                social_scraper.remember_validators(profile_url, page, data)
+            if data is None:
+                result['error'] = f"Could not parse {platform} profile"
+            result['data'] = data
+        except ThrottleRejected as e:
+            # Refused locally, nothing was sent
+            result['error'] = f"{type(e).__name__}: {e}"
+            result['throttled'] = True
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+        result['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 1)
+        return result
+
+    tasks = [asyncio.ensure_future(scrape_one(platform, url)) for platform, url in targets]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # The consumer may stop early; don't leave fetches running
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if session:
+            await session.close()
+        if io_pool:
+            io_pool.shutdown(wait=False)
+        if parse_executor is None:
+            parse_pool.shutdown(wait=False)
+
+
+def scrape_all(targets, **kwargs):
+    """Blocking scrape_many(): list of results in completion order"""
+    async def collect():
+        return [result async for result in scrape_many(targets, **kwargs)]
+    return asyncio.run(collect())
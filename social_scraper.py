@@ -1,14 +1,316 @@
 """
 Web scraper for social media follower counts
 Scrapes public profile pages to get follower counts without OAuth
+
+All requests go through one pooled session (keep-alive connections per host,
+bounded retries with jittered backoff on connection errors and 5xx, split
+connect/read timeouts). Tests can swap the transport with set_session(),
+mount_transport() or set_url_rewriter() to point at a local HTTP stub.
+Each host is rate limited and circuit-broken via utils/throttle.py.
+
+Parsers read og: meta tags and embedded counters with precompiled regexes
+first and only build a (body-only) tree when that finds no follower count.
+Pages are streamed and reading stops at the platform's stop marker (usually
+</head>) or SCRAPER_MAX_BYTES; ETag/Last-Modified validators are kept so
+repeat scrapes of an unchanged page get a body-less 304.
 """
+import codecs
+import os
+import random
 import requests
 import re
-import json
-from bs4 import BeautifulSoup
+import threading
+from html import unescape
+from bs4 import BeautifulSoup, SoupStrainer
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utils.throttle import ThrottleRejected, guarded
+from collections import OrderedDict
 from urllib.parse import urlparse
 import time
 
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Split timeouts: fail fast on unreachable hosts, allow slow page bodies
+SCRAPER_CONNECT_TIMEOUT = float(os.getenv('SCRAPER_CONNECT_TIMEOUT', '3.05'))
+SCRAPER_READ_TIMEOUT = float(os.getenv('SCRAPER_READ_TIMEOUT', '10'))
+SCRAPER_MAX_RETRIES = int(os.getenv('SCRAPER_MAX_RETRIES', '2'))
+SCRAPER_BACKOFF_FACTOR = float(os.getenv('SCRAPER_BACKOFF_FACTOR', '0.5'))
+# Keep-alive connections kept per host, and number of hosts with pools
+SCRAPER_POOL_PER_HOST = int(os.getenv('SCRAPER_POOL_PER_HOST', '4'))
+SCRAPER_POOL_HOSTS = int(os.getenv('SCRAPER_POOL_HOSTS', '16'))
+# Stream profile pages and stop reading once the parser's data has arrived
+SCRAPER_STREAM = os.getenv('SCRAPER_STREAM', 'true').lower() not in ('false', '0', 'no')
+SCRAPER_MAX_BYTES = int(os.getenv('SCRAPER_MAX_BYTES', str(2 * 1024 * 1024)))
+SCRAPER_CHUNK_SIZE = 16 * 1024
+# Profile URLs whose ETag/Last-Modified (and parsed result) are kept for conditional requests
+SCRAPER_VALIDATOR_CACHE = int(os.getenv('SCRAPER_VALIDATOR_CACHE', '1024'))
+
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+
+class _JitteredRetry(Retry):
+    """Retry with full jitter, so parallel scrapes don't retry in lockstep"""
+
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        return random.uniform(0, backoff) if backoff > 0 else 0
+
+
+def _build_session():
+    retry = _JitteredRetry(
+        total=SCRAPER_MAX_RETRIES,
+        connect=SCRAPER_MAX_RETRIES,
+        read=SCRAPER_MAX_RETRIES,
+        status=SCRAPER_MAX_RETRIES,
+        backoff_factor=SCRAPER_BACKOFF_FACTOR,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=SCRAPER_POOL_HOSTS,
+        pool_maxsize=SCRAPER_POOL_PER_HOST,
+        pool_block=False,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.headers.update(BROWSER_HEADERS)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+_session = None
+_session_lock = threading.Lock()
+_url_rewriter = None
+
+
+def get_session():
+    """Shared pooled session used for all scraping requests"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def set_session(session):
+    """Replace the shared session (tests/stubs); None rebuilds the default on next use"""
+    global _session
+    with _session_lock:
+        _session = session
+
+
+def mount_transport(prefix, adapter):
+    """Route URLs starting with prefix through a custom transport adapter (e.g. a test stub)"""
+    get_session().mount(prefix, adapter)
+
+
+def set_url_rewriter(rewriter):
+    """
+    Rewrite fetch URLs before requesting them, e.g. to a local stub server.
+
+    Parsers still receive the original profile URL. Pass None to disable.
+    """
+    global _url_rewriter
+    _url_rewriter = rewriter
+
+
+def fetch_page(url, timeout=None):
+    """
+    GET a page through the pooled session; raises for HTTP errors.
+
+    Requests are rate limited per host and fail fast with CircuitOpenError
+    while the host's circuit breaker is open (see utils/throttle.py).
+    """
+    fetch_url = fetch_url_for(url)
+    with guarded(url) as guard:
+        response = get_session().get(
+            fetch_url,
+            timeout=timeout or (SCRAPER_CONNECT_TIMEOUT, SCRAPER_READ_TIMEOUT)
+        )
+        guard.record_response(response)
+    response.raise_for_status()
+    return response
+
+
+def normalize_profile_url(url):
+    """Stripped profile URL with a scheme (https:// when missing)"""
+    url = url.strip()
+    if not url.startswith('http'):
+        url = 'https://' + url
+    return url
+
+
+def fetch_url_for(url):
+    """URL actually requested for a profile URL (after any test rewriter)"""
+    return _url_rewriter(url) if _url_rewriter else url
+
+
+class PageReader:
+    """
+    Accumulates a streamed page until the platform's stop marker or the byte cap.
+
+    ``stopped`` is 'marker' when reading stopped early, 'cap' when the page
+    was cut at SCRAPER_MAX_BYTES, and None when the whole page was read.
+    A 304 response is a reader with ``not_modified`` set and no text.
+    """
+
+    # Markers may straddle chunk boundaries; re-scan this much of the previous text
+    OVERLAP = 512
+
+    def __init__(self, platform=None, encoding='utf-8', max_bytes=None):
+        self.marker = STOP_MARKERS.get(platform, _HEAD_END_RE) if platform else None
+        self.max_bytes = max_bytes or SCRAPER_MAX_BYTES
+        self.bytes_read = 0
+        self.stopped = None
+        self.not_modified = False
+        self.etag = None
+        self.last_modified = None
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        self._parts = []
+        self._tail = ''
+
+    def feed(self, chunk):
+        """Add a chunk of the body; returns True once reading can stop"""
+        if self.bytes_read + len(chunk) >= self.max_bytes:
+            chunk = chunk[:self.max_bytes - self.bytes_read]
+            self.stopped = 'cap'
+        self.bytes_read += len(chunk)
+        text = self._decoder.decode(chunk)
+        self._parts.append(text)
+        if self.stopped:
+            return True
+        if self.marker:
+            window = self._tail + text
+            match = self.marker.search(window)
+            # A match touching the end may still grow (e.g. a number cut mid-digits)
+            if match and match.end() < len(window):
+                self.stopped = 'marker'
+                return True
+            self._tail = window[-self.OVERLAP:]
+        return False
+
+    @property
+    def text(self):
+        return ''.join(self._parts) + self._decoder.decode(b'', final=True)
+
+
+def response_encoding(content_type):
+    """charset from a Content-Type header, defaulting to UTF-8"""
+    for param in (content_type or '').split(';')[1:]:
+        name, _, value = param.strip().partition('=')
+        if name.lower() == 'charset' and value:
+            encoding = value.strip('"\' ')
+            try:
+                codecs.lookup(encoding)
+                return encoding
+            except LookupError:
+                break
+    return 'utf-8'
+
+
+_validators = OrderedDict()
+_validators_lock = threading.Lock()
+
+
+def get_validators(url):
+    """Stored {'etag', 'last_modified', 'result'} for a profile URL, or None"""
+    with _validators_lock:
+        entry = _validators.get(url)
+        if entry:
+            _validators.move_to_end(url)
+        return entry
+
+
+def conditional_headers(validators):
+    """If-None-Match / If-Modified-Since headers for stored validators"""
+    headers = {}
+    if validators:
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+    return headers
+
+
+def remember_validators(url, page, result):
+    """Keep a page's validators with its parsed result, if the host sent any"""
+    if not (page.etag or page.last_modified) or not result or not result.get('followers'):
+        return
+    with _validators_lock:
+        _validators[url] = {'etag': page.etag, 'last_modified': page.last_modified, 'result': dict(result)}
+        _validators.move_to_end(url)
+        while len(_validators) > SCRAPER_VALIDATOR_CACHE:
+            _validators.popitem(last=False)
+
+
+def needs_full_page(page, result):
+    """Whether a page cut short at its stop marker should be re-read in full"""
+    return page.stopped == 'marker' and not (result and result.get('followers'))
+
+
+def read_response(response, platform=None):
+    """
+    Stream a requests response into a PageReader (stopping early for ``platform``).
+
+    Closes the response; a connection whose body wasn't fully read is
+    dropped from the pool rather than reused.
+    """
+    try:
+        if response.status_code == 304:
+            page = PageReader()
+            page.not_modified = True
+        else:
+            response.raise_for_status()
+            page = PageReader(platform, encoding=response_encoding(response.headers.get('Content-Type')))
+            for chunk in response.iter_content(SCRAPER_CHUNK_SIZE):
+                if page.feed(chunk):
+                    break
+        page.etag = response.headers.get('ETag')
+        page.last_modified = response.headers.get('Last-Modified')
+        return page
+    finally:
+        response.close()
+
+
+def fetch_profile_page(platform, url, stop_early=True, validators=None):
+    """
+    Stream a profile page, stopping once ``platform``'s data has arrived.
+
+    Reads at most SCRAPER_MAX_BYTES. With ``validators`` the request is
+    conditional; an unchanged page comes back with ``not_modified`` set.
+    """
+    with guarded(url) as guard:
+        response = get_session().get(
+            fetch_url_for(url),
+            headers=conditional_headers(validators),
+            stream=True,
+            timeout=(SCRAPER_CONNECT_TIMEOUT, SCRAPER_READ_TIMEOUT)
+        )
+        if response.status_code < 400:
+            # Body read errors and timeouts count toward the breaker too
+            page = read_response(response, platform if stop_early else None)
+            guard.record_response(response)
+            return page
+        guard.record_response(response)
+    # Raises the HTTP error (and closes the response)
+    return read_response(response)
+
 
 def get_followers_from_url(platform, url):
     """
@@ -20,118 +322,171 @@ def get_followers_from_url(platform, url):
     
     Returns:
         dict with 'followers', 'username', 'description', 'profile_pic' or None on error
+
+    Raises ThrottleRejected when the host's rate limiter or circuit breaker
+    refused the request (nothing was sent).
     """
     if not url:
         return None
     
     try:
-        # Normalize URL
-        url = url.strip()
-        if not url.startswith('http'):
-            url = 'https://' + url
-        
-        # Set headers to mimic a browser
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        }
-        
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        # Parse based on platform
-        if platform == 'linkedin':
-            return _scrape_linkedin(response.text, url)
-        elif platform == 'x':
-            return _scrape_x(response.text, url)
-        elif platform == 'threads':
-            return _scrape_threads(response.text, url)
-        elif platform == 'instagram':
-            return _scrape_instagram(response.text, url)
-        elif platform == 'substack':
-            return _scrape_substack(response.text, url)
-        elif platform == 'telegram':
-            return _scrape_telegram(response.text, url)
-        else:
-            return None
-            
+        url = normalize_profile_url(url)
+
+        if not SCRAPER_STREAM:
+            # Pooled session sends browser-like headers
+            response = fetch_page(url)
+            return parse_profile(platform, response.text, url)
+
+        # Stream only as much of the page as the parser needs; conditional
+        # requests skip the body entirely when the page hasn't changed
+        validators = get_validators(url)
+        page = fetch_profile_page(platform, url, validators=validators)
+        if page.not_modified and validators:
+            return dict(validators['result'])
+        if page.not_modified:
+            page = fetch_profile_page(platform, url)
+
+        result = parse_profile(platform, page.text, url)
+        if needs_full_page(page, result):
+            page = fetch_profile_page(platform, url, stop_early=False)
+            result = parse_profile(platform, page.text, url)
+        remember_validators(url, page, result)
+        return result
+
+    except ThrottleRejected:
+        # Never sent; callers can tell this from a failed fetch
+        raise
     except Exception as e:
         print(f"❌ Error scraping {platform} from {url}: {e}")
         return None
 
 
+def parse_profile(platform, html, url):
+    """
+    Parse a fetched profile page with the platform's parser.
+
+    Pure function of its arguments (no I/O), so it can run in a worker process.
+    Returns the profile dict, or None for unknown platforms and parse errors.
+    """
+    if platform == 'linkedin':
+        return _scrape_linkedin(html, url)
+    elif platform == 'x':
+        return _scrape_x(html, url)
+    elif platform == 'threads':
+        return _scrape_threads(html, url)
+    elif platform == 'instagram':
+        return _scrape_instagram(html, url)
+    elif platform == 'substack':
+        return _scrape_substack(html, url)
+    elif platform == 'telegram':
+        return _scrape_telegram(html, url)
+    else:
+        return None
+
+
+# Parsing is two-tier. Tier 1 reads og: meta tags from the <head> region and
+# counters from inline JSON with precompiled regexes - no tree at all. Only
+# when that finds no follower count does tier 2 parse the <body> (with lxml
+# when installed) for counters shown in the page text.
+
+# Pages without a closing </head> are only scanned this far for meta tags
+HEAD_SCAN_LIMIT = 256 * 1024
+TREE_PARSER = 'lxml' if LXML_AVAILABLE else 'html.parser'
+
+_HEAD_END_RE = re.compile(r'</head\s*>', re.IGNORECASE)
+_META_TAG_RE = re.compile(r'<meta\b[^>]*>', re.IGNORECASE)
+_ATTR_RE = re.compile(r'''([^\s=/>"']+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))''')
+
+# "1,234", "1.2K", "12M" followed by a label
+_COUNT = r'(\d[\d,]*(?:\.\d+)?[KMB]?)'
+_FOLLOWERS_RE = re.compile(_COUNT + r'\s+followers', re.IGNORECASE)
+_CONNECTIONS_RE = re.compile(_COUNT + r'\s+connections', re.IGNORECASE)
+_SUBSCRIBERS_RE = re.compile(_COUNT + r'\s+subscribers', re.IGNORECASE)
+_MEMBERS_RE = re.compile(_COUNT + r'\s+members', re.IGNORECASE)
+
+# Counters embedded as JSON in inline scripts
+_X_FOLLOWERS_JSON_RE = re.compile(r'"followers_count":\s*(\d+)')
+_THREADS_FOLLOWERS_JSON_RE = re.compile(r'"follower_count":\s*(\d+)')
+_THREADS_FOLLOWERS_ALT_JSON_RE = re.compile(r'"followers":\s*(\d+)')
+_INSTAGRAM_FOLLOWERS_JSON_RE = re.compile(r'"edge_followed_by":\s*{\s*"count":\s*(\d+)')
+
+# t.me channel pages show "12 345 subscribers" (space-separated thousands)
+_TELEGRAM_EXTRA_RE = re.compile(r'class="tgme_page_extra"[^>]*>([^<]+)<')
+_TELEGRAM_COUNT_RE = re.compile(r'(\d[\d ,]*(?:\.\d+)?[KMB]?)\s+(?:members|subscribers)', re.IGNORECASE)
+
+_COUNT_SUFFIXES = {'K': 1000, 'M': 1000000, 'B': 1000000000}
+
+# Streamed fetches stop once this matches: where each parser's tier-1 data ends
+# (</head> for og: meta tags) or the counter the parser looks for in the body
+STOP_MARKERS = {
+    'linkedin': _HEAD_END_RE,
+    'x': _X_FOLLOWERS_JSON_RE,
+    'threads': _HEAD_END_RE,
+    'instagram': _HEAD_END_RE,
+    'substack': _SUBSCRIBERS_RE,
+    'telegram': _TELEGRAM_EXTRA_RE,
+}
+
+
+def _head_meta(html):
+    """property/name -> content of the <meta> tags in the page head (first one wins)"""
+    end = _HEAD_END_RE.search(html, 0, HEAD_SCAN_LIMIT)
+    head = html[:end.start()] if end else html[:HEAD_SCAN_LIMIT]
+    meta = {}
+    for tag in _META_TAG_RE.findall(head):
+        attrs = {}
+        for name, double_quoted, single_quoted, bare in _ATTR_RE.findall(tag, 5):
+            attrs.setdefault(name.lower(), double_quoted or single_quoted or bare)
+        key = attrs.get('property') or attrs.get('name')
+        if key and 'content' in attrs:
+            meta.setdefault(key.lower(), unescape(attrs['content']))
+    return meta
+
+
+def _first_count(patterns, text):
+    """First non-zero count captured by the patterns, tried in order"""
+    if not text:
+        return None
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match:
+            count = _parse_count(match.group(1))
+            if count:
+                return count
+    return None
+
+
+def _body_text(html):
+    """Text of the page <body> (tier 2: builds a tree of the body only)"""
+    soup = BeautifulSoup(html, TREE_PARSER, parse_only=SoupStrainer('body'))
+    return soup.get_text()
+
+
+def _profile(username, meta, followers, with_picture=True):
+    description = meta.get('og:description')
+    return {
+        'followers': followers or 0,
+        'username': username,
+        'description': description[:200] if description is not None else None,
+        'profile_pic': meta.get('og:image') if with_picture else None
+    }
+
+
 def _scrape_linkedin(html, url):
     """Scrape LinkedIn profile"""
     try:
-        soup = BeautifulSoup(html, 'html.parser')
-        
         # Extract username from URL
         username = url.split('/in/')[-1].split('/')[0] if '/in/' in url else None
-        
-        # LinkedIn stores follower count in various places
-        # Try to find it in meta tags or JSON-LD
-        followers = None
-        
-        # Method 1: Look for JSON-LD structured data
-        json_scripts = soup.find_all('script', type='application/ld+json')
-        for script in json_scripts:
-            try:
-                data = json.loads(script.string)
-                if isinstance(data, dict) and 'mainEntity' in data:
-                    # LinkedIn structured data
-                    pass
-            except:
-                pass
-        
-        # Method 2: Look for follower count in text
-        # LinkedIn shows "XXX followers" or "XXX connections"
-        follower_patterns = [
-            r'(\d+(?:,\d+)*)\s+followers',
-            r'(\d+(?:,\d+)*)\s+connections',
-        ]
-        
-        page_text = soup.get_text()
-        for pattern in follower_patterns:
-            match = re.search(pattern, page_text, re.IGNORECASE)
-            if match:
-                followers_str = match.group(1).replace(',', '')
-                try:
-                    followers = int(followers_str)
-                    break
-                except:
-                    pass
-        
-        # Method 3: Look in meta tags
+
+        # og:description reads "... | 1,234 followers on LinkedIn"
+        meta = _head_meta(html)
+        followers = _first_count((_FOLLOWERS_RE,), meta.get('og:description'))
+
+        # Fallback: "XXX followers" or "XXX connections" in the page text
         if not followers:
-            meta_followers = soup.find('meta', {'property': 'og:description'})
-            if meta_followers:
-                desc = meta_followers.get('content', '')
-                match = re.search(r'(\d+(?:,\d+)*)\s+followers', desc, re.IGNORECASE)
-                if match:
-                    followers = int(match.group(1).replace(',', ''))
-        
-        # Get profile picture
-        profile_pic = None
-        og_image = soup.find('meta', {'property': 'og:image'})
-        if og_image:
-            profile_pic = og_image.get('content')
-        
-        # Get description
-        description = None
-        og_desc = soup.find('meta', {'property': 'og:description'})
-        if og_desc:
-            description = og_desc.get('content', '')[:200]  # Limit length
-        
-        return {
-            'followers': followers or 0,
-            'username': username,
-            'description': description,
-            'profile_pic': profile_pic
-        }
+            followers = _first_count((_FOLLOWERS_RE, _CONNECTIONS_RE), _body_text(html))
+
+        return _profile(username, meta, followers)
     except Exception as e:
         print(f"Error parsing LinkedIn: {e}")
         return None
@@ -140,62 +495,18 @@ def _scrape_linkedin(html, url):
 def _scrape_x(html, url):
     """Scrape X (Twitter) profile"""
     try:
-        soup = BeautifulSoup(html, 'html.parser')
-        
         # Extract username from URL
         username = url.split('x.com/')[-1].split('/')[0] if 'x.com/' in url else url.split('twitter.com/')[-1].split('/')[0] if 'twitter.com/' in url else None
-        
-        # X/Twitter stores data in JSON in script tags
-        followers = None
-        
-        # Look for data in script tags (X uses React, data is in JSON)
-        scripts = soup.find_all('script')
-        for script in scripts:
-            if script.string and 'followers_count' in script.string:
-                # Try to extract from JSON
-                try:
-                    # X embeds data in various formats
-                    match = re.search(r'"followers_count":\s*(\d+)', script.string)
-                    if match:
-                        followers = int(match.group(1))
-                        break
-                except:
-                    pass
-        
-        # Alternative: Look for follower count in text
+
+        # X uses React, profile data is embedded as JSON in script tags
+        meta = _head_meta(html)
+        followers = _first_count((_X_FOLLOWERS_JSON_RE,), html)
+
+        # Fallback: "1.2K Followers" or "1,234 Followers" in the page text
         if not followers:
-            page_text = soup.get_text()
-            # Look for patterns like "1.2K Followers" or "1,234 Followers"
-            patterns = [
-                r'([\d.]+[KMB]?)\s+[Ff]ollowers',
-                r'(\d+(?:,\d+)*)\s+[Ff]ollowers',
-            ]
-            for pattern in patterns:
-                match = re.search(pattern, page_text)
-                if match:
-                    count_str = match.group(1)
-                    followers = _parse_count(count_str)
-                    if followers:
-                        break
-        
-        # Get profile picture
-        profile_pic = None
-        og_image = soup.find('meta', {'property': 'og:image'})
-        if og_image:
-            profile_pic = og_image.get('content')
-        
-        # Get description
-        description = None
-        og_desc = soup.find('meta', {'property': 'og:description'})
-        if og_desc:
-            description = og_desc.get('content', '')[:200]
-        
-        return {
-            'followers': followers or 0,
-            'username': username,
-            'description': description,
-            'profile_pic': profile_pic
-        }
+            followers = _first_count((_FOLLOWERS_RE,), _body_text(html))
+
+        return _profile(username, meta, followers)
     except Exception as e:
         print(f"Error parsing X: {e}")
         return None
@@ -204,46 +515,17 @@ def _scrape_x(html, url):
 def _scrape_threads(html, url):
     """Scrape Threads profile"""
     try:
-        soup = BeautifulSoup(html, 'html.parser')
-        
         # Extract username from URL
         username = url.split('threads.net/@')[-1].split('/')[0] if 'threads.net/@' in url else None
-        
-        # Threads is similar to Instagram (Meta)
-        followers = None
-        
-        # Look for JSON data in script tags
-        scripts = soup.find_all('script')
-        for script in scripts:
-            if script.string and ('follower_count' in script.string or 'followers' in script.string):
-                try:
-                    match = re.search(r'"follower_count":\s*(\d+)', script.string)
-                    if not match:
-                        match = re.search(r'"followers":\s*(\d+)', script.string)
-                    if match:
-                        followers = int(match.group(1))
-                        break
-                except:
-                    pass
-        
-        # Get profile picture
-        profile_pic = None
-        og_image = soup.find('meta', {'property': 'og:image'})
-        if og_image:
-            profile_pic = og_image.get('content')
-        
-        # Get description
-        description = None
-        og_desc = soup.find('meta', {'property': 'og:description'})
-        if og_desc:
-            description = og_desc.get('content', '')[:200]
-        
-        return {
-            'followers': followers or 0,
-            'username': username,
-            'description': description,
-            'profile_pic': profile_pic
-        }
+
+        # Threads is similar to Instagram (Meta): JSON data in script tags,
+        # and og:description reads "1,234 Followers • 56 Threads • ..."
+        meta = _head_meta(html)
+        followers = _first_count((_THREADS_FOLLOWERS_JSON_RE, _THREADS_FOLLOWERS_ALT_JSON_RE), html)
+        if not followers:
+            followers = _first_count((_FOLLOWERS_RE,), meta.get('og:description'))
+
+        return _profile(username, meta, followers)
     except Exception as e:
         print(f"Error parsing Threads: {e}")
         return None
@@ -252,54 +534,18 @@ def _scrape_threads(html, url):
 def _scrape_instagram(html, url):
     """Scrape Instagram profile (fallback if API fails)"""
     try:
-        soup = BeautifulSoup(html, 'html.parser')
-        
         # Extract username from URL
         username = url.split('instagram.com/')[-1].split('/')[0] if 'instagram.com/' in url else None
-        
-        # Instagram stores data in JSON in script tags
-        followers = None
-        
-        scripts = soup.find_all('script', type='text/javascript')
-        for script in scripts:
-            if script.string and 'edge_followed_by' in script.string:
-                try:
-                    # Instagram embeds data in window._sharedData
-                    match = re.search(r'"edge_followed_by":\s*{\s*"count":\s*(\d+)', script.string)
-                    if match:
-                        followers = int(match.group(1))
-                        break
-                except:
-                    pass
-        
-        # Alternative: Look in meta tags
+
+        # Instagram embeds data in window._sharedData
+        meta = _head_meta(html)
+        followers = _first_count((_INSTAGRAM_FOLLOWERS_JSON_RE,), html)
+
+        # Alternative: og:description "123K Followers, 456 Following, 789 Posts"
         if not followers:
-            meta_followers = soup.find('meta', {'property': 'og:description'})
-            if meta_followers:
-                desc = meta_followers.get('content', '')
-                # Pattern: "123K Followers, 456 Following, 789 Posts"
-                match = re.search(r'([\d.]+[KMB]?)\s+Followers', desc, re.IGNORECASE)
-                if match:
-                    followers = _parse_count(match.group(1))
-        
-        # Get profile picture
-        profile_pic = None
-        og_image = soup.find('meta', {'property': 'og:image'})
-        if og_image:
-            profile_pic = og_image.get('content')
-        
-        # Get description
-        description = None
-        og_desc = soup.find('meta', {'property': 'og:description'})
-        if og_desc:
-            description = og_desc.get('content', '')[:200]
-        
-        return {
-            'followers': followers or 0,
-            'username': username,
-            'description': description,
-            'profile_pic': profile_pic
-        }
+            followers = _first_count((_FOLLOWERS_RE,), meta.get('og:description'))
+
+        return _profile(username, meta, followers)
     except Exception as e:
         print(f"Error parsing Instagram: {e}")
         return None
@@ -308,48 +554,18 @@ def _scrape_instagram(html, url):
 def _scrape_substack(html, url):
     """Scrape Substack profile/publication"""
     try:
-        soup = BeautifulSoup(html, 'html.parser')
-        
         # Extract username/publication name from URL
         parsed = urlparse(url)
         username = parsed.netloc.replace('.substack.com', '') if '.substack.com' in parsed.netloc else None
-        
-        # Substack shows subscriber count
-        followers = None
-        
-        # Look for subscriber count in various places
-        page_text = soup.get_text()
-        
-        # Pattern: "1,234 subscribers" or "1.2K subscribers"
-        patterns = [
-            r'([\d.]+[KMB]?)\s+subscribers',
-            r'(\d+(?:,\d+)*)\s+subscribers',
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, page_text, re.IGNORECASE)
-            if match:
-                followers = _parse_count(match.group(1))
-                if followers:
-                    break
-        
-        # Get profile picture (publication logo)
-        profile_pic = None
-        og_image = soup.find('meta', {'property': 'og:image'})
-        if og_image:
-            profile_pic = og_image.get('content')
-        
-        # Get description
-        description = None
-        og_desc = soup.find('meta', {'property': 'og:description'})
-        if og_desc:
-            description = og_desc.get('content', '')[:200]
-        
-        return {
-            'followers': followers or 0,
-            'username': username,
-            'description': description,
-            'profile_pic': profile_pic
-        }
+
+        # Substack shows "1,234 subscribers" or "1.2K subscribers", sometimes in og:description
+        meta = _head_meta(html)
+        followers = _first_count((_SUBSCRIBERS_RE,), meta.get('og:description'))
+        if not followers:
+            followers = _first_count((_SUBSCRIBERS_RE,), _body_text(html))
+
+        # Profile picture is the publication logo
+        return _profile(username, meta, followers)
     except Exception as e:
         print(f"Error parsing Substack: {e}")
         return None
@@ -358,66 +574,38 @@ def _scrape_substack(html, url):
 def _scrape_telegram(html, url):
     """Scrape Telegram channel/group"""
     try:
-        soup = BeautifulSoup(html, 'html.parser')
-        
         # Extract username from URL
         username = url.split('t.me/')[-1].split('/')[0] if 't.me/' in url else None
-        
-        # Telegram web shows member count
-        followers = None
-        
-        page_text = soup.get_text()
-        
-        # Pattern: "1,234 members" or "1.2K members" or "1,234 subscribers"
-        patterns = [
-            r'([\d.]+[KMB]?)\s+members',
-            r'(\d+(?:,\d+)*)\s+members',
-            r'([\d.]+[KMB]?)\s+subscribers',
-            r'(\d+(?:,\d+)*)\s+subscribers',
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, page_text, re.IGNORECASE)
-            if match:
-                followers = _parse_count(match.group(1))
-                if followers:
-                    break
-        
-        # Get description
-        description = None
-        og_desc = soup.find('meta', {'property': 'og:description'})
-        if og_desc:
-            description = og_desc.get('content', '')[:200]
-        
+
+        # t.me pages show the member count in a tgme_page_extra block
+        meta = _head_meta(html)
+        extra = _TELEGRAM_EXTRA_RE.search(html)
+        followers = _first_count((_TELEGRAM_COUNT_RE,), extra.group(1)) if extra else None
+
+        # Fallback: "1,234 members" or "1.2K subscribers" anywhere in the page text
+        if not followers:
+            followers = _first_count((_MEMBERS_RE, _SUBSCRIBERS_RE), _body_text(html))
+
         # Telegram doesn't have profile pics in the same way
-        profile_pic = None
-        
-        return {
-            'followers': followers or 0,
-            'username': username,
-            'description': description,
-            'profile_pic': profile_pic
-        }
+        return _profile(username, meta, followers, with_picture=False)
     except Exception as e:
         print(f"Error parsing Telegram: {e}")
         return None
 
 
 def _parse_count(count_str):
-    """Parse count string like '1.2K', '1M', '1,234' into integer"""
+    """Parse count string like '1.2K', '1M', '1,234', '12 345' into integer"""
     if not count_str:
         return None
-    
-    count_str = count_str.strip().replace(',', '')
-    
-    try:
-        if count_str.upper().endswith('K'):
-            return int(float(count_str[:-1]) * 1000)
-        elif count_str.upper().endswith('M'):
-            return int(float(count_str[:-1]) * 1000000)
-        elif count_str.upper().endswith('B'):
-            return int(float(count_str[:-1]) * 1000000000)
-        else:
-            return int(float(count_str))
-    except:
+
+    count_str = count_str.strip().replace(',', '').replace(' ', '')
+    if not count_str:
         return None
 
+    try:
+        multiplier = _COUNT_SUFFIXES.get(count_str[-1].upper())
+        if multiplier:
+            return int(float(count_str[:-1]) * multiplier)
+        return int(float(count_str))
+    except ValueError:
+        return None
@@ -0,0 +1,261 @@
+"""
+Follower snapshot store - cached social profile data keyed by (platform, URL)
+
+Follower counts change slowly, so dashboard views read profile snapshots
+instead of scraping on every request. A snapshot holds followers, username,
+description, profile_pic and fetched_at, and is fresh for a per-platform TTL
+(SNAPSHOT_TTL_<PLATFORM> seconds). Failed fetches are cached too
+(SNAPSHOT_NEGATIVE_TTL) so a broken profile isn't re-scraped on every view;
+the last good data is kept and served as stale meanwhile.
+
+follower_refresh.py keeps snapshots fresh ahead of time; while it runs,
+dashboard requests read snapshots without scraping (see
+follower_refresh.request_fetch_allowed).
+
+Backends (SNAPSHOT_BACKEND):
+- kv: the shared Redis/Vercel KV connection from content/storage.py
+- sqlite: a local SQLite file (SNAPSHOT_DB_PATH, WAL mode)
+- auto (default): kv when connected, else sqlite, else in-memory
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+from utils.throttle import ThrottleRejected
+
+# Seconds a successful snapshot is considered fresh, per platform
+DEFAULT_TTLS = {
+    'instagram': 6 * 3600,
+    'x': 6 * 3600,
+    'threads': 12 * 3600,
+    'linkedin': 24 * 3600,
+    'substack': 24 * 3600,
+    'telegram': 6 * 3600,
+}
+DEFAULT_TTL = 12 * 3600
+NEGATIVE_TTL = int(os.getenv('SNAPSHOT_NEGATIVE_TTL', '900'))
+# How long snapshots are kept at all (stale data beats dummy data)
+RETENTION_SECONDS = int(os.getenv('SNAPSHOT_RETENTION', str(30 * 86400)))
+SNAPSHOT_DB_PATH = os.getenv('SNAPSHOT_DB_PATH', 'follower_snapshots.db')
+
+PROFILE_FIELDS = ('followers', 'username', 'description', 'profile_pic')
+
+
+def ttl_for(platform):
+    """Freshness TTL in seconds for a platform"""
+    override = os.getenv(f"SNAPSHOT_TTL_{platform.upper()}")
+    if override:
+        return int(override)
+    return DEFAULT_TTLS.get(platform, DEFAULT_TTL)
+
+
+def normalize_url(url):
+    """Canonical form of a profile URL so equivalent spellings share a snapshot"""
+    url = (url or '').strip()
+    if not url:
+        return ''
+    if '://' not in url:
+        url = 'https://' + url
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if host == 'twitter.com':
+        host = 'x.com'
+    path = parsed.path.rstrip('/')
+    return f"{host}{path}".lower()
+
+
+class SQLiteSnapshotBackend:
+    """Snapshots in a local SQLite file (one row per platform/URL)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS follower_snapshots ('
+            ' platform TEXT NOT NULL,'
+            ' url TEXT NOT NULL,'
+            ' data TEXT NOT NULL,'
+            ' fetched_at REAL NOT NULL,'
+            ' PRIMARY KEY (platform, url))'
+        )
+        self._conn.commit()
+
+    def get(self, platform, url):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT data FROM follower_snapshots WHERE platform = ? AND url = ?',
+                (platform, url)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, platform, url, snapshot):
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO follower_snapshots (platform, url, data, fetched_at) VALUES (?, ?, ?, ?)',
+                (platform, url, json.dumps(snapshot), snapshot['fetched_at'])
+            )
+            self._conn.execute(
+                'DELETE FROM follower_snapshots WHERE fetched_at < ?',
+                (time.time() - RETENTION_SECONDS,)
+            )
+            self._conn.commit()
+
+
+class CacheSnapshotBackend:
+    """Snapshots in a utils.cache backend (shared KV, or in-memory)"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def get(self, platform, url):
+        return self.backend.get(f"{platform}:{url}")
+
+    def set(self, platform, url, snapshot):
+        self.backend.set(f"{platform}:{url}", snapshot, RETENTION_SECONDS)
+
+
+def _make_backend():
+    from utils.cache import MemoryBackend, make_backend, RedisBackend
+
+    choice = os.getenv('SNAPSHOT_BACKEND', 'auto').lower()
+    if choice in ('auto', 'kv'):
+        backend = make_backend('follower_snapshots', max_entries=5000)
+        if isinstance(backend, RedisBackend) or choice == 'kv':
+            return CacheSnapshotBackend(backend)
+    try:
+        return SQLiteSnapshotBackend(SNAPSHOT_DB_PATH)
+    except sqlite3.Error as e:
+        # e.g. read-only filesystem on serverless hosts
+        print(f"⚠️ Could not open snapshot database {SNAPSHOT_DB_PATH}: {e}, using memory")
+        return CacheSnapshotBackend(MemoryBackend('follower_snapshots', max_entries=5000))
+
+
+class SnapshotStore:
+    """TTL/negative-caching policy over a snapshot backend"""
+
+    def __init__(self, backend=None):
+        self._backend = backend
+        self._backend_lock = threading.Lock()
+        self._key_locks = {}
+        self._key_locks_lock = threading.Lock()
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            with self._backend_lock:
+                if self._backend is None:
+                    self._backend = _make_backend()
+        return self._backend
+
+    def _key_lock(self, key):
+        with self._key_locks_lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def peek(self, platform, url):
+        """Stored snapshot regardless of age, or None"""
+        try:
+            return self.backend.get(platform, normalize_url(url))
+        except Exception as e:
+            print(f"⚠️ Snapshot read failed for {platform} {url}: {e}")
+            return None
+
+    def is_fresh(self, platform, snapshot, now=None):
+        if not snapshot:
+            return False
+        ttl = ttl_for(platform) if snapshot.get('ok') else NEGATIVE_TTL
+        return (now or time.time()) - snapshot.get('fetched_at', 0) < ttl
+
+    def record(self, platform, url, data, error=None):
+        """
+        Store a fetch result. ``data`` is the scraper/API dict or None on failure;
+        failures keep the previous good data as ``last_good``.
+        """
+        key = normalize_url(url)
+        ok = bool(data and data.get('followers'))
+        snapshot = {
+            'platform': platform,
+            'url': key,
+            'ok': ok,
+            'fetched_at': time.time(),
+            'error': None if ok else (error or 'No follower count found'),
+        }
+        if ok:
+            snapshot.update({field: data.get(field) for field in PROFILE_FIELDS})
+        else:
+            previous = self.peek(platform, url)
+            if previous:
+                snapshot['last_good'] = previous if previous.get('ok') else previous.get('last_good')
+        try:
+            self.backend.set(platform, key, snapshot)
+        except Exception as e:
+            print(f"⚠️ Snapshot write failed for {platform} {url}: {e}")
+        return snapshot
+
+    def get_profile(self, platform, url, fetch, allow_fetch=True, fetch_missing=False):
+        """
+        Profile dict for (platform, url), fetching with ``fetch()`` when stale.
+
+        With ``allow_fetch=False`` stored data is returned whatever its age;
+        ``fetch_missing`` still fetches when there is no snapshot at all.
+
+        Returns a dict with PROFILE_FIELDS plus fetched_at, 'stale' (True when
+        serving old data after a failed or skipped refresh) and 'cached', or
+        None when there is no usable data.
+        """
+        if not url:
+            return None
+        snapshot = self.peek(platform, url)
+        if self.is_fresh(platform, snapshot) or not (allow_fetch or (fetch_missing and snapshot is None)):
+            return self._as_profile(snapshot, cached=True)
+
+        # One fetch per key at a time; waiters reuse its result
+        with self._key_lock((platform, normalize_url(url))):
+            snapshot = self.peek(platform, url)
+            if self.is_fresh(platform, snapshot):
+                return self._as_profile(snapshot, cached=True)
+            try:
+                data = fetch()
+                error = None
+            except ThrottleRejected as e:
+                # Nothing was sent, so don't record a failure; retry on the next request
+                print(f"⏸️ {platform} refresh skipped for {url}: {e}")
+                return self._as_profile(snapshot, cached=True)
+            except Exception as e:
+                data, error = None, str(e)
+            snapshot = self.record(platform, url, data, error=error)
+        return self._as_profile(snapshot, cached=False)
+
+    def _as_profile(self, snapshot, cached):
+        if not snapshot:
+            return None
+        source = snapshot if snapshot.get('ok') else snapshot.get('last_good')
+        if not source:
+            return None
+        profile = {field: source.get(field) for field in PROFILE_FIELDS}
+        profile['fetched_at'] = source.get('fetched_at')
+        profile['stale'] = source is not snapshot or not self.is_fresh(snapshot.get('platform'), snapshot)
+        profile['cached'] = cached
+        return profile
+
+
+_store = SnapshotStore()
+
+
+def get_store():
+    """Process-wide snapshot store"""
+    return _store
+
+
+def get_profile_snapshot(platform, url, allow_fetch=True, fetch_missing=False):
+    """Scraped profile for a public profile URL, served from snapshots when fresh"""
+    def fetch():
+        from social_scraper import get_followers_from_url
+        return get_followers_from_url(platform, url)
+    return _store.get_profile(platform, url, fetch, allow_fetch=allow_fetch, fetch_missing=fetch_missing)
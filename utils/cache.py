@@ -0,0 +1,223 @@
+"""
+Caching helpers shared by the Flask app.
+
+Backends:
+- MemoryBackend: per-process dict with TTLs (default, local dev)
+- RedisBackend: shared Redis/Vercel KV, reusing the connection from
+  content/storage.py, so every instance sees the same entries and
+  invalidations
+
+SWRCache sits on top of a backend and adds stale-while-revalidate: entries
+younger than ``soft_ttl`` are fresh; entries between ``soft_ttl`` and
+``hard_ttl`` are served immediately while a single background refresh per key
+rebuilds them. Misses compute in the caller, and concurrent misses for the
+same key (within a process) wait on that one computation.
+
+Set ``CACHE_BACKEND=memory`` or ``CACHE_BACKEND=redis`` to force a backend;
+by default Redis is used when content/storage.py has a connection.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class CacheBackend:
+    """Namespaced key/value store with per-entry TTLs."""
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+
+    def key(self, key: str) -> str:
+        return f"cache:{self.namespace}:{key}"
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> bool:
+        raise NotImplementedError
+
+
+class MemoryBackend(CacheBackend):
+    """In-process backend; values are stored as-is (no serialization)."""
+
+    def __init__(self, namespace: str, max_entries: int = 100):
+        super().__init__(namespace)
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(self.key(key))
+            if not entry:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[self.key(key)]
+                return None
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[self.key(key)] = (value, time.time() + ttl)
+            if len(self._entries) > self.max_entries:
+                # Drop the entries closest to expiry
+                by_expiry = sorted(self._entries.items(), key=lambda item: item[1][1])
+                for stale_key, _ in by_expiry[:-self.max_entries]:
+                    del self._entries[stale_key]
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return self._entries.pop(self.key(key), None) is not None
+
+
+class RedisBackend(CacheBackend):
+    """
+    Shared backend over any redis-py compatible client.
+
+    Values are stored as compact JSON with a Redis-side TTL, so they must be
+    JSON-serializable. Errors are logged and treated as misses so a KV outage
+    degrades to recomputing rather than failing requests.
+    """
+
+    def __init__(self, namespace: str, client: Any):
+        super().__init__(namespace)
+        self.client = client
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = self.client.get(self.key(key))
+        except Exception as e:
+            print(f"⚠️ Cache GET failed for {key}: {e}")
+            return None
+        if raw is None:
+            return None
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return None
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        try:
+            payload = json.dumps(value, separators=(',', ':'), default=str)
+            self.client.set(self.key(key), payload, ex=max(1, int(ttl)))
+        except Exception as e:
+            print(f"⚠️ Cache SET failed for {key}: {e}")
+
+    def delete(self, key: str) -> bool:
+        try:
+            return bool(self.client.delete(self.key(key)))
+        except Exception as e:
+            print(f"⚠️ Cache DELETE failed for {key}: {e}")
+            return False
+
+
+def make_backend(namespace: str, max_entries: int = 100) -> CacheBackend:
+    """Pick the shared Redis backend when available, else an in-process one."""
+    choice = os.getenv('CACHE_BACKEND', 'auto').lower()
+    if choice != 'memory':
+        try:
+            from content.storage import get_redis_client
+            client = get_redis_client()
+        except Exception:
+            client = None
+        if client is not None:
+            return RedisBackend(namespace, client)
+        if choice == 'redis':
+            print(f"⚠️ CACHE_BACKEND=redis but no KV connection, using memory for {namespace}")
+    return MemoryBackend(namespace, max_entries=max_entries)
+
+
+class SWRCache:
+    """Stale-while-revalidate cache with per-key request coalescing."""
+
+    def __init__(self, soft_ttl: float, hard_ttl: float, max_entries: int = 100,
+                 backend: Optional[CacheBackend] = None, namespace: str = 'default'):
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = max(hard_ttl, soft_ttl)
+        self.backend = backend or MemoryBackend(namespace, max_entries=max_entries)
+        self._inflight: Dict[str, Future] = {}
+        # Bumped on invalidate so this process's refreshes started before it
+        # don't store stale data; other instances see the backend delete
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, key: str) -> Optional[Tuple[Any, float]]:
+        entry = self.backend.get(key)
+        if not isinstance(entry, (list, tuple)) or len(entry) != 2:
+            return None
+        return entry[0], entry[1]
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for ``key``, computing it if needed.
+
+        ``compute`` must not depend on Flask's request context, since it may
+        run on a background thread.
+        """
+        entry = self._load(key)
+        with self._lock:
+            if entry:
+                value, stored_at = entry
+                age = time.time() - stored_at
+                if age < self.soft_ttl:
+                    return value
+                if age < self.hard_ttl:
+                    if key not in self._inflight:
+                        self._start_refresh(key, compute)
+                    return value
+
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+                generation = self._generations.get(key, 0)
+
+        if not owner:
+            return future.result()
+
+        self._run(key, compute, future, generation)
+        return future.result()
+
+    def _start_refresh(self, key: str, compute: Callable[[], Any]) -> None:
+        # Caller holds self._lock
+        future: Future = Future()
+        self._inflight[key] = future
+        generation = self._generations.get(key, 0)
+        thread = threading.Thread(target=self._run, args=(key, compute, future, generation), daemon=True)
+        thread.start()
+
+    def _run(self, key: str, compute: Callable[[], Any], future: Future, generation: int) -> None:
+        try:
+            value = compute()
+        except Exception as e:
+            print(f"⚠️ Cache refresh failed for {key}: {e}")
+            with self._lock:
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+            future.set_exception(e)
+            return
+
+        with self._lock:
+            store = self._generations.get(key, 0) == generation
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        if store:
+            self.backend.set(key, (value, time.time()), self.hard_ttl)
+        future.set_result(value)
+
+    def invalidate(self, key: str) -> bool:
+        """Drop ``key`` (across all instances for shared backends). Returns True if an entry was removed."""
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            self._inflight.pop(key, None)
+        return self.backend.delete(key)
@@ -0,0 +1,135 @@
+"""
+Shared, indexed view of clients.json.
+
+The file is parsed once and kept in memory with clients indexed by
+``client_id`` and ``chat_id``. Every lookup stats the file and re-parses it
+only when its mtime/size changes, so request handlers get O(1) lookups
+instead of reading and scanning the whole file on every call.
+
+Returned client dicts are shared between callers - treat them as read-only
+and copy before mutating.
+"""
+from __future__ import annotations
+
+import json
+import os
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+CLIENTS_FILE = "clients.json"
+
+# Signature of a registry that has not looked at the file yet
+_UNLOADED = object()
+
+
+class ClientRegistry:
+    """mtime-aware cache of a clients.json file with id and chat_id indexes."""
+
+    def __init__(self, path: str = CLIENTS_FILE):
+        self.path = path
+        self._lock = Lock()
+        self._signature: Any = _UNLOADED
+        self._clients: List[Dict[str, Any]] = []
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._by_chat_id: Dict[str, Dict[str, Any]] = {}
+
+    def _stat_signature(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _refresh(self) -> None:
+        """Re-index the file if it changed since the last load."""
+        signature = self._stat_signature()
+        if signature == self._signature:
+            return
+
+        with self._lock:
+            if signature == self._signature:
+                return
+
+            if signature is None:
+                self._clients, self._by_id, self._by_chat_id = [], {}, {}
+                self._signature = None
+                return
+
+            try:
+                with open(self.path, "r") as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                # Keep serving the last good index; retry on the next lookup
+                print(f"⚠️ Could not load {self.path}: {e}")
+                return
+
+            clients = data.get("clients", []) if isinstance(data, dict) else []
+            by_id: Dict[str, Dict[str, Any]] = {}
+            by_chat_id: Dict[str, Dict[str, Any]] = {}
+            for client in clients:
+                client_id = client.get("client_id")
+                if client_id and client_id not in by_id:
+                    by_id[client_id] = client
+                chat_id = client.get("chat_id")
+                if chat_id is not None and str(chat_id) not in by_chat_id:
+                    by_chat_id[str(chat_id)] = client
+
+            self._clients, self._by_id, self._by_chat_id = clients, by_id, by_chat_id
+            self._signature = signature
+
+    def exists(self) -> bool:
+        """Whether the backing file is present."""
+        self._refresh()
+        return self._signature is not None
+
+    def list_clients(self) -> List[Dict[str, Any]]:
+        """All clients in file order."""
+        self._refresh()
+        return list(self._clients)
+
+    def get(self, client_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Client with the given client_id, or None."""
+        if not client_id:
+            return None
+        self._refresh()
+        return self._by_id.get(client_id)
+
+    def get_by_chat_id(self, chat_id: Any) -> Optional[Dict[str, Any]]:
+        """Client whose Telegram chat_id matches, or None."""
+        if chat_id is None:
+            return None
+        self._refresh()
+        return self._by_chat_id.get(str(chat_id))
+
+    def invalidate(self) -> None:
+        """Force a re-parse on the next lookup."""
+        with self._lock:
+            self._signature = _UNLOADED
+
+
+_registry = ClientRegistry()
+
+
+def get_registry() -> ClientRegistry:
+    """Process-wide registry for clients.json."""
+    return _registry
+
+
+def get_client(client_id: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Look up a client by client_id."""
+    return _registry.get(client_id)
+
+
+def get_client_by_chat_id(chat_id: Any) -> Optional[Dict[str, Any]]:
+    """Look up a client by Telegram chat_id."""
+    return _registry.get_by_chat_id(chat_id)
+
+
+def list_clients() -> List[Dict[str, Any]]:
+    """All clients from clients.json."""
+    return _registry.list_clients()
+
+
+def clients_file_exists() -> bool:
+    """Whether clients.json is present."""
+    return _registry.exists()
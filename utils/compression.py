@@ -0,0 +1,106 @@
+"""
+Response compression for the Flask app.
+
+``init_compression(app)`` registers an after_request hook that compresses
+text/JSON responses above ``COMPRESS_MIN_SIZE`` bytes using the best
+encoding the client accepts: brotli (when the ``brotli`` package is
+installed) or gzip. Streamed, already-encoded and non-200 responses pass
+through untouched.
+
+Set ``COMPRESS_RESPONSES=false`` to disable (e.g. when a proxy already
+compresses).
+"""
+from __future__ import annotations
+
+import gzip
+import os
+from typing import Optional
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', '1024'))
+GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', '6'))
+BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', '4'))
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'text/html',
+    'text/css',
+    'text/plain',
+    'text/javascript',
+    'image/svg+xml',
+}
+
+
+def _accepted(accept_encoding: str) -> set:
+    """Encodings the client accepts (q=0 entries excluded)."""
+    accepted = set()
+    for item in accept_encoding.split(','):
+        name, _, params = item.strip().partition(';')
+        if params.strip().replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            continue
+        if name:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick 'br' or 'gzip' from an Accept-Encoding header, or None."""
+    if not accept_encoding:
+        return None
+    accepted = _accepted(accept_encoding)
+    if BROTLI_AVAILABLE and ('br' in accepted or '*' in accepted):
+        return 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL)
+
+
+def init_compression(app) -> None:
+    """Register the compression hook on ``app`` (no-op if disabled)."""
+    if os.getenv('COMPRESS_RESPONSES', 'true').lower() in ('false', '0', 'no'):
+        return
+
+    from flask import request
+
+    @app.after_request
+    def compress_response(response):
+        # Every compressible response varies on the header, even when sent uncompressed
+        if response.mimetype in COMPRESSIBLE_MIMETYPES:
+            response.vary.add('Accept-Encoding')
+
+        if (response.status_code != 200
+                or response.direct_passthrough
+                or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+
+        encoding = choose_encoding(request.headers.get('Accept-Encoding'))
+        if not encoding:
+            return response
+
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return response
+
+        compressed = compress(data, encoding)
+        if len(compressed) >= len(data):
+            return response
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        response.headers['Content-Length'] = str(len(compressed))
+        return response
@@ -0,0 +1,308 @@
+"""
+Process-wide bounded executor for request-time fan-out.
+
+Request handlers used to create a ``ThreadPoolExecutor`` per request (and
+nest another one per client), so thread count grew with concurrent load.
+All fan-out now goes through one shared executor:
+
+- at most ``FANOUT_MAX_WORKERS`` tasks run at once and at most
+  ``FANOUT_MAX_QUEUE`` wait; beyond that submissions are rejected with
+  ExecutorSaturated instead of queueing without bound
+- ``fan_out`` waits for a batch of named tasks up to a per-task timeout and
+  an overall Deadline; tasks still queued when it passes are cancelled
+- ``stats()`` reports queue depth, running tasks and outcome counters
+
+Backends (``FANOUT_BACKEND``):
+- ``thread`` (default): a bounded thread pool
+- ``asyncio``: one event loop on a background thread; coroutine functions
+  run on the loop (and are really cancelled at the deadline), plain
+  callables run on the same bounded thread pool
+
+Tasks submitted from inside a worker (nested fan-out) are queued only while
+the pool has idle workers for them; otherwise they run inline in the
+submitting worker, so a full pool can never deadlock waiting on its own
+subtasks. A fan-out stops starting (or running inline) tasks once their
+cutoff has passed, and results that finished are kept even when the cutoff
+passed while they were running inline.
+Tasks run without Flask's request context.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+FANOUT_MAX_WORKERS = int(os.getenv('FANOUT_MAX_WORKERS', '16'))
+FANOUT_MAX_QUEUE = int(os.getenv('FANOUT_MAX_QUEUE', '256'))
+FANOUT_TASK_TIMEOUT = float(os.getenv('FANOUT_TASK_TIMEOUT', '20'))
+FANOUT_BACKEND = os.getenv('FANOUT_BACKEND', 'thread').lower()
+
+# Set while a thread is executing a task for a given executor
+_worker_state = threading.local()
+
+
+class ExecutorSaturated(RuntimeError):
+    """The executor's queue is full; the task was not accepted."""
+
+
+class Deadline:
+    """Absolute point in time (monotonic) shared by every task of a request."""
+
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+
+@dataclass
+class TaskResult:
+    """Outcome of one fan-out task: status is ok, error, timeout, cancelled or rejected."""
+
+    status: str
+    value: Any = None
+    error: Optional[str] = None
+    elapsed_ms: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 'ok'
+
+
+class BoundedExecutor:
+    """Shared executor with a bounded queue, inline nesting and counters."""
+
+    def __init__(self, name: str = 'fanout', max_workers: int = FANOUT_MAX_WORKERS,
+                 max_queue: int = FANOUT_MAX_QUEUE, backend: str = FANOUT_BACKEND):
+        if backend not in ('thread', 'asyncio'):
+            print(f"⚠️ Unknown FANOUT_BACKEND '{backend}', using thread")
+            backend = 'thread'
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.backend = backend
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._queued = 0
+        self._running = 0
+        self._counters = {
+            'submitted': 0, 'completed': 0, 'failed': 0, 'timed_out': 0,
+            'cancelled': 0, 'rejected': 0, 'inline': 0, 'max_queue_depth': 0,
+        }
+
+    # ---------- submission ----------
+
+    def in_worker(self) -> bool:
+        """Whether the current thread is running a task of this executor."""
+        return getattr(_worker_state, 'executor', None) is self
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Schedule ``fn(*args, **kwargs)``; raises ExecutorSaturated when the queue is full."""
+        nested = self.in_worker()
+        with self._lock:
+            if nested and self._running + self._queued >= self.max_workers:
+                run_inline = True
+            else:
+                run_inline = False
+                if self._queued >= self.max_queue:
+                    self._counters['rejected'] += 1
+                    raise ExecutorSaturated(f"{self.name} queue full ({self._queued} waiting)")
+                self._queued += 1
+                self._counters['submitted'] += 1
+                self._counters['max_queue_depth'] = max(self._counters['max_queue_depth'], self._queued)
+        if run_inline:
+            return self._run_inline(fn, *args, **kwargs)
+
+        # Shared with the runner so cancelled-before-start tasks leave the queue count
+        task_state = {'started': False}
+        if self.backend == 'asyncio' and asyncio.iscoroutinefunction(fn):
+            future = asyncio.run_coroutine_threadsafe(
+                self._run_coroutine(task_state, fn, *args, **kwargs), self._get_loop()
+            )
+        else:
+            future = self._pool.submit(self._run_task, task_state, fn, *args, **kwargs)
+        future.add_done_callback(lambda f: self._on_done(f, task_state))
+        return future
+
+    def _run_inline(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        future: Future = Future()
+        with self._lock:
+            self._counters['inline'] += 1
+        try:
+            result = fn(*args, **kwargs)
+            if asyncio.iscoroutine(result):
+                result = asyncio.run(result)
+            future.set_result(result)
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def _start(self, task_state: Dict[str, bool]) -> None:
+        with self._lock:
+            task_state['started'] = True
+            self._queued -= 1
+            self._running += 1
+
+    def _run_task(self, task_state: Dict[str, bool], fn: Callable[..., Any], *args, **kwargs) -> Any:
+        self._start(task_state)
+        _worker_state.executor = self
+        try:
+            result = fn(*args, **kwargs)
+            if asyncio.iscoroutine(result):
+                result = asyncio.run(result)
+            return result
+        finally:
+            _worker_state.executor = None
+            with self._lock:
+                self._running -= 1
+
+    async def _run_coroutine(self, task_state: Dict[str, bool], fn: Callable[..., Any], *args, **kwargs) -> Any:
+        async with self._semaphore:
+            self._start(task_state)
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name=f"{self.name}-loop", daemon=True).start()
+                self._semaphore = asyncio.run_coroutine_threadsafe(
+                    self._make_semaphore(), loop
+                ).result()
+                self._loop = loop
+            return self._loop
+
+    async def _make_semaphore(self) -> asyncio.Semaphore:
+        # Created on the loop's own thread so it binds to that loop
+        return asyncio.Semaphore(self.max_workers)
+
+    def _on_done(self, future: Future, task_state: Dict[str, bool]) -> None:
+        with self._lock:
+            if not task_state['started']:
+                # Cancelled before it ran, so it never left the queue
+                self._queued -= 1
+            if future.cancelled():
+                self._counters['cancelled'] += 1
+            elif future.exception() is not None:
+                self._counters['failed'] += 1
+            else:
+                self._counters['completed'] += 1
+
+    # ---------- fan-out ----------
+
+    def fan_out(self, tasks: Dict[str, Callable[[], Any]], timeout: Optional[float] = None,
+                deadline: Optional[Deadline] = None,
+                timeouts: Optional[Dict[str, float]] = None) -> Dict[str, TaskResult]:
+        """
+        Run named zero-argument callables concurrently and collect their outcomes.
+
+        Each task gets at most ``timeout`` seconds (default FANOUT_TASK_TIMEOUT,
+        overridden per key by ``timeouts``) and none waits past ``deadline``.
+        Never raises for task failures; check ``TaskResult.status`` instead.
+        """
+        timeout = FANOUT_TASK_TIMEOUT if timeout is None else timeout
+        timeouts = timeouts or {}
+        started = time.monotonic()
+        results: Dict[str, TaskResult] = {}
+        pending: Dict[Future, str] = {}
+
+        cutoffs: Dict[str, float] = {}
+        for key in tasks:
+            cutoffs[key] = started + timeouts.get(key, timeout)
+            if deadline is not None:
+                cutoffs[key] = min(cutoffs[key], deadline.expires_at)
+
+        for key, fn in tasks.items():
+            # Nested submits may run inline, so the cutoff can pass while submitting
+            if time.monotonic() >= cutoffs[key]:
+                results[key] = self._timed_out(None, timeouts.get(key, timeout), started)
+                continue
+            try:
+                pending[self.submit(fn)] = key
+            except ExecutorSaturated as e:
+                results[key] = TaskResult('rejected', error=str(e))
+
+        while pending:
+            # Results that are already in count, even if their cutoff has passed
+            for future in [f for f in pending if f.done()]:
+                results[pending.pop(future)] = self._result_of(future, started)
+            now = time.monotonic()
+            for future, key in list(pending.items()):
+                if cutoffs[key] <= now:
+                    del pending[future]
+                    results[key] = self._timed_out(future, timeouts.get(key, timeout), started)
+            if not pending:
+                break
+            remaining = min(cutoffs[key] for key in pending.values()) - now
+            wait(list(pending), timeout=remaining, return_when=FIRST_COMPLETED)
+
+        return {key: results[key] for key in tasks}
+
+    def _timed_out(self, future: Optional[Future], timeout: float, started: float) -> TaskResult:
+        # Queued tasks are dropped; running thread tasks finish in the background
+        if future is not None:
+            future.cancel()
+        with self._lock:
+            self._counters['timed_out'] += 1
+        return TaskResult('timeout', error=f"No result within {timeout:g}s or request deadline",
+                          elapsed_ms=int((time.monotonic() - started) * 1000))
+
+    @staticmethod
+    def _result_of(future: Future, started: float) -> TaskResult:
+        elapsed_ms = int((time.monotonic() - started) * 1000)
+        try:
+            return TaskResult('ok', value=future.result(), elapsed_ms=elapsed_ms)
+        except CancelledError:
+            return TaskResult('cancelled', error='Cancelled', elapsed_ms=elapsed_ms)
+        except Exception as e:
+            return TaskResult('error', error=str(e), elapsed_ms=elapsed_ms)
+
+    # ---------- metrics ----------
+
+    def stats(self) -> Dict[str, Any]:
+        """Current queue depth, running tasks and lifetime counters."""
+        with self._lock:
+            return {
+                'name': self.name,
+                'backend': self.backend,
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'queued': self._queued,
+                'running': self._running,
+                **self._counters,
+            }
+
+
+_executor: Optional[BoundedExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> BoundedExecutor:
+    """Process-wide executor for request fan-out."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = BoundedExecutor()
+    return _executor
+
+
+def fan_out(tasks: Dict[str, Callable[[], Any]], timeout: Optional[float] = None,
+            deadline: Optional[Deadline] = None,
+            timeouts: Optional[Dict[str, float]] = None) -> Dict[str, TaskResult]:
+    """Run ``tasks`` on the shared executor; see BoundedExecutor.fan_out."""
+    return get_executor().fan_out(tasks, timeout=timeout, deadline=deadline, timeouts=timeouts)
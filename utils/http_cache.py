@@ -0,0 +1,91 @@
+"""
+Conditional GET support (ETag / If-None-Match / Cache-Control) for JSON routes.
+
+``conditional_get(versions, cache_control)`` wraps a Flask view. Before the
+view runs, ``versions()`` returns cheap version markers for the data the
+response is built from (see content/data_version.py). The ETag is a hash of
+the request path, query string and those markers, so a matching
+``If-None-Match`` gets an empty 304 without running the view at all.
+
+If ``versions()`` returns None (or raises), the view runs and the ETag is a
+hash of the response body instead: no CPU is saved, but unchanged
+responses still go out as 304s.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from functools import wraps
+from typing import Any, Callable, Iterable, Optional
+
+# Polling clients revalidate every time; the 304 path is what keeps it cheap
+DEFAULT_CACHE_CONTROL = 'private, no-cache'
+
+
+def time_bucket(seconds: int) -> int:
+    """Version marker that changes every ``seconds`` (for data fetched live from third parties)."""
+    return int(time.time() // seconds)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    # Weak comparison: ignore W/ prefixes (proxies may weaken ETags after compression)
+    candidates = [_strip_weak(tag.strip()) for tag in if_none_match.split(',')]
+    return _strip_weak(etag) in candidates
+
+
+def _strip_weak(tag: str) -> str:
+    return tag[2:] if tag.startswith('W/') else tag
+
+
+def _make_etag(*parts: Any) -> str:
+    digest = hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def conditional_get(versions: Callable[[], Optional[Iterable[Any]]],
+                    cache_control: str = DEFAULT_CACHE_CONTROL) -> Callable:
+    """Decorate a GET view with ETag/304 handling and a Cache-Control policy."""
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            from flask import make_response, request
+
+            try:
+                markers = versions()
+            except Exception as e:
+                print(f"⚠️ Could not compute data version for {request.path}: {e}")
+                markers = None
+
+            etag = None
+            if markers is not None:
+                etag = _make_etag(request.path, sorted(request.args.items(multi=True)), list(markers))
+                if _etag_matches(request.headers.get('If-None-Match'), etag):
+                    return _not_modified(etag, cache_control)
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+
+            if etag is None:
+                etag = _make_etag(request.path, response.get_data(as_text=True))
+                if _etag_matches(request.headers.get('If-None-Match'), etag):
+                    return _not_modified(etag, cache_control)
+
+            response.headers['ETag'] = etag
+            response.headers['Cache-Control'] = cache_control
+            return response
+        return wrapper
+    return decorator
+
+
+def _not_modified(etag: str, cache_control: str):
+    from flask import Response
+    response = Response(status=304)
+    response.headers['ETag'] = etag
+    response.headers['Cache-Control'] = cache_control
+    return response
@@ -0,0 +1,65 @@
+"""
+Optional orjson-backed JSON provider for Flask.
+
+``install_json_provider(app)`` swaps Flask's stdlib-json provider for one
+that serializes with orjson when the package is installed; otherwise the
+app keeps the default provider. Output stays compatible with Flask's
+defaults: keys are sorted, datetimes/dates use Flask's HTTP date format,
+and dataclasses, UUIDs and Decimals go through Flask's own ``default``.
+
+Set ``JSON_PROVIDER=stdlib`` to keep the default provider even when orjson
+is available.
+"""
+from __future__ import annotations
+
+import os
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """DefaultJSONProvider with orjson for dumps/loads."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        # Anything orjson has no option for (cls=, separators=, ...) uses the stdlib path
+        extra = set(kwargs) - {'sort_keys', 'indent', 'default', 'ensure_ascii'}
+        if extra:
+            return super().dumps(obj, **kwargs)
+
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        default = kwargs.get('default', self.default)
+        # orjson always emits UTF-8, which is valid JSON whatever ensure_ascii says
+        return orjson.dumps(obj, default=default, option=option).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = None
+        if self.compact is False or (self.compact is None and self._app.debug):
+            indent = 2
+        return self._app.response_class(
+            f"{self.dumps(obj, indent=indent)}\n", mimetype=self.mimetype
+        )
+
+
+def install_json_provider(app) -> None:
+    """Use OrjsonProvider for ``app`` when orjson is installed."""
+    if os.getenv('JSON_PROVIDER', 'auto').lower() == 'stdlib' or not ORJSON_AVAILABLE:
+        return
+    app.json = OrjsonProvider(app)
@@ -0,0 +1,251 @@
+"""
+Local verification of Supabase access tokens.
+
+``get_current_user`` used to call ``client.auth.get_user`` on every request.
+This module checks the token signature and expiry in-process instead:
+
+- HS256 tokens are verified with ``SUPABASE_JWT_SECRET`` (stdlib only)
+- RS256/ES256 tokens are verified against the project's JWKS, fetched from
+  ``{SUPABASE_URL}/auth/v1/.well-known/jwks.json`` and cached (needs PyJWT)
+
+Verified tokens are kept in a small LRU keyed by the token's SHA-256 until
+they expire. The remote call is only used on a cache miss that cannot be
+verified locally (no key material, unknown ``kid`` after a JWKS refresh).
+
+Set ``SUPABASE_AUTH_VERIFY=remote`` to always use the remote call (no caching).
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import jwt as pyjwt
+    PYJWT_AVAILABLE = True
+except ImportError:
+    pyjwt = None
+    PYJWT_AVAILABLE = False
+
+TOKEN_CACHE_SIZE = int(os.getenv('SUPABASE_AUTH_CACHE_SIZE', '512'))
+JWKS_TTL_SECONDS = int(os.getenv('SUPABASE_JWKS_TTL', '600'))
+JWKS_MIN_REFRESH_SECONDS = 30
+CLOCK_SKEW_SECONDS = 30
+EXPECTED_AUDIENCE = 'authenticated'
+# Asymmetric algorithms accepted for JWKS-verified tokens
+JWKS_ALGORITHMS = ('RS256', 'ES256')
+
+
+class TokenInvalid(Exception):
+    """Token was checked locally and is definitely not acceptable."""
+
+
+class _TokenCache:
+    """LRU of verified tokens: sha256(token) -> (user, exp)."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                return None
+            user, exp = entry
+            if exp <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return user
+
+    def put(self, key: str, user: Dict[str, Any], exp: float) -> None:
+        if exp <= time.time():
+            return
+        with self._lock:
+            self._entries[key] = (user, exp)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class _JWKSCache:
+    """Signing keys from the Supabase JWKS endpoint, refreshed on TTL or unknown kid."""
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._keys: Dict[str, Dict[str, Any]] = {}
+        self._fetched_at = 0.0
+        self._lock = Lock()
+
+    def _url(self) -> Optional[str]:
+        supabase_url = os.getenv('SUPABASE_URL')
+        if not supabase_url:
+            return None
+        return f"{supabase_url.rstrip('/')}/auth/v1/.well-known/jwks.json"
+
+    def _fetch(self) -> None:
+        url = self._url()
+        if not url:
+            return
+        import requests
+        response = requests.get(url, timeout=5)
+        response.raise_for_status()
+        keys = response.json().get('keys', [])
+        self._keys = {k['kid']: k for k in keys if k.get('kid')}
+        self._fetched_at = time.time()
+
+    def get(self, kid: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            age = time.time() - self._fetched_at
+            if age > self.ttl or (kid not in self._keys and age > JWKS_MIN_REFRESH_SECONDS):
+                # Unknown kid usually means the keys were rotated
+                try:
+                    self._fetch()
+                except Exception as e:
+                    print(f"⚠️ Could not refresh Supabase JWKS: {e}")
+            return self._keys.get(kid)
+
+
+_token_cache = _TokenCache(TOKEN_CACHE_SIZE)
+_jwks_cache = _JWKSCache(JWKS_TTL_SECONDS)
+
+
+def _b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + '=' * (-len(segment) % 4))
+
+
+def _split(token: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    try:
+        header_b64, payload_b64, _ = token.split('.')
+        return json.loads(_b64url_decode(header_b64)), json.loads(_b64url_decode(payload_b64))
+    except Exception:
+        raise TokenInvalid("Malformed token")
+
+
+def _check_claims(claims: Dict[str, Any]) -> None:
+    exp = claims.get('exp')
+    if not isinstance(exp, (int, float)) or exp + CLOCK_SKEW_SECONDS < time.time():
+        raise TokenInvalid("Token expired")
+    aud = claims.get('aud')
+    if aud is not None:
+        audiences = aud if isinstance(aud, list) else [aud]
+        if EXPECTED_AUDIENCE not in audiences:
+            raise TokenInvalid("Unexpected audience")
+    if not claims.get('sub'):
+        raise TokenInvalid("Token has no subject")
+
+
+def _verify_hs256(token: str, secret: str) -> None:
+    header_b64, payload_b64, signature_b64 = token.split('.')
+    expected = hmac.new(secret.encode(), f"{header_b64}.{payload_b64}".encode(), hashlib.sha256).digest()
+    if not hmac.compare_digest(expected, _b64url_decode(signature_b64)):
+        raise TokenInvalid("Bad signature")
+
+
+def _verify_jwks(token: str, header: Dict[str, Any]) -> bool:
+    """Verify an asymmetric token. Returns False if no key is available."""
+    kid = header.get('kid')
+    if not PYJWT_AVAILABLE or not kid:
+        return False
+    jwk = _jwks_cache.get(kid)
+    if not jwk:
+        return False
+    # The algorithm comes from our allowlist and the key, never from the token header
+    alg = jwk.get('alg') or {'RSA': 'RS256', 'EC': 'ES256'}.get(jwk.get('kty'))
+    if alg not in JWKS_ALGORITHMS:
+        raise TokenInvalid("Unsupported signing key")
+    if header.get('alg') != alg:
+        raise TokenInvalid("Unexpected token algorithm")
+    try:
+        key = pyjwt.PyJWK(jwk, algorithm=alg).key
+        pyjwt.decode(
+            token,
+            key=key,
+            algorithms=[alg],
+            options={'verify_aud': False, 'verify_exp': False}
+        )
+    except pyjwt.PyJWTError as e:
+        raise TokenInvalid(str(e))
+    return True
+
+
+def _user_from_claims(claims: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'id': claims['sub'],
+        'email': claims.get('email'),
+        'user_metadata': claims.get('user_metadata') or {}
+    }
+
+
+def verify_locally(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Verify a token without calling Supabase.
+
+    Returns the user dict, or None if there is no key material to check it.
+    Raises TokenInvalid if the token is bad or expired.
+    """
+    header, claims = _split(token)
+    alg = header.get('alg')
+
+    if alg == 'HS256':
+        secret = os.getenv('SUPABASE_JWT_SECRET')
+        if not secret:
+            return None
+        _verify_hs256(token, secret)
+    elif not _verify_jwks(token, header):
+        return None
+
+    _check_claims(claims)
+    return _user_from_claims(claims)
+
+
+def verify_access_token(token: str, remote_verify: Callable[[], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+    """
+    Resolve an access token to a user dict.
+
+    Checks the LRU first, then local verification, then ``remote_verify``
+    (which should call ``client.auth.get_user``). Successful results are
+    cached until the token's ``exp``.
+    """
+    if os.getenv('SUPABASE_AUTH_VERIFY', 'local') == 'remote':
+        return remote_verify()
+
+    cache_key = hashlib.sha256(token.encode()).hexdigest()
+    user = _token_cache.get(cache_key)
+    if user:
+        return user
+
+    try:
+        _, claims = _split(token)
+    except TokenInvalid:
+        return None
+
+    try:
+        user = verify_locally(token)
+    except TokenInvalid as e:
+        print(f"⚠️ Rejected access token: {e}")
+        return None
+
+    if user is None:
+        user = remote_verify()
+
+    if user and isinstance(claims.get('exp'), (int, float)):
+        _token_cache.put(cache_key, user, float(claims['exp']))
+    return user
+
+
+def forget_token(token: str) -> None:
+    """Drop a token's cached verification (e.g. on logout)."""
+    _token_cache.discard(hashlib.sha256(token.encode()).hexdigest())
@@ -0,0 +1,362 @@
+"""
+Per-host rate limiting and circuit breaking for outbound HTTP.
+
+Every outbound call to a third-party host (scraped profile pages, the
+Instagram Graph API, Beehiiv, Vercel) goes through the host's HostGuard:
+
+- a token bucket caps the request rate per host; callers wait up to
+  ``THROTTLE_MAX_WAIT`` seconds for a token, then fail with RateLimited
+- a circuit breaker opens after ``CIRCUIT_FAILURE_THRESHOLD`` consecutive
+  failures (connection errors, timeouts, 403/429/5xx) and rejects calls with
+  CircuitOpenError for a cooldown. The cooldown doubles each time the
+  breaker re-opens (up to ``CIRCUIT_MAX_COOLDOWN``) and honours Retry-After.
+  After the cooldown a single probe request is let through: success closes
+  the breaker, failure re-opens it.
+
+Rates are configured per host as ``rate:burst`` (requests/second, bucket
+size). Defaults live in DEFAULT_HOST_RATES; ``HOST_RATE_LIMITS`` overrides
+them, e.g. ``HOST_RATE_LIMITS="instagram.com=0.2:2,x.com=1:3"``. A rule for
+a domain also covers its subdomains. Other hosts use ``HOST_RATE_DEFAULT``.
+
+``stats()`` reports every guard's breaker state and counters for diagnostics.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', '5'))
+CIRCUIT_COOLDOWN = float(os.getenv('CIRCUIT_COOLDOWN', '60'))
+CIRCUIT_MAX_COOLDOWN = float(os.getenv('CIRCUIT_MAX_COOLDOWN', '600'))
+THROTTLE_MAX_WAIT = float(os.getenv('THROTTLE_MAX_WAIT', '2'))
+
+# requests/second, burst
+DEFAULT_HOST_RATES: Dict[str, Tuple[float, int]] = {
+    'instagram.com': (0.5, 3),
+    'x.com': (0.5, 3),
+    'twitter.com': (0.5, 3),
+    'threads.net': (0.5, 3),
+    'linkedin.com': (0.2, 2),
+    'substack.com': (1.0, 5),
+    't.me': (1.0, 5),
+    'graph.facebook.com': (5.0, 10),
+    'api.beehiiv.com': (2.0, 5),
+    'api.vercel.com': (2.0, 5),
+}
+
+# Responses that mean the host is unhealthy or pushing back on us
+FAILURE_STATUSES = frozenset([403, 429, 500, 502, 503, 504])
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class ThrottleRejected(RuntimeError):
+    """The request was refused locally and never sent."""
+
+
+class CircuitOpenError(ThrottleRejected):
+    """The host's circuit breaker is open; the call was not attempted."""
+
+
+class RateLimited(ThrottleRejected):
+    """No request token became available within the wait limit."""
+
+
+def _parse_rate(spec: str) -> Tuple[float, int]:
+    rate, _, burst = spec.partition(':')
+    return float(rate), int(burst or max(1, round(float(rate))))
+
+
+def _load_rates() -> Dict[str, Tuple[float, int]]:
+    rates = dict(DEFAULT_HOST_RATES)
+    for item in os.getenv('HOST_RATE_LIMITS', '').split(','):
+        host, _, spec = item.strip().partition('=')
+        if not host or not spec:
+            continue
+        try:
+            rates[host.strip().lower()] = _parse_rate(spec.strip())
+        except ValueError:
+            print(f"⚠️ Ignoring invalid HOST_RATE_LIMITS entry: {item}")
+    return rates
+
+
+DEFAULT_RATE = _parse_rate(os.getenv('HOST_RATE_DEFAULT', '2:5'))
+
+
+def host_of(url: str) -> str:
+    """Lowercased host of a URL without a leading www."""
+    if '://' not in url:
+        url = 'https://' + url
+    host = (urlparse(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens/second, up to ``burst`` saved."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> float:
+        """Take a token and return 0, or return the seconds until one is available."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate if self.rate > 0 else float('inf')
+
+    def acquire(self, max_wait: float) -> bool:
+        """Take a token, sleeping up to ``max_wait`` seconds for one."""
+        deadline = time.monotonic() + max_wait
+        while True:
+            wait = self.try_acquire()
+            if wait == 0:
+                return True
+            remaining = deadline - time.monotonic()
+            if wait > remaining:
+                return False
+            time.sleep(wait)
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a growing cooldown and one half-open probe."""
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 cooldown: float = CIRCUIT_COOLDOWN, max_cooldown: float = CIRCUIT_MAX_COOLDOWN):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.times_opened = 0
+        self.opened_at: Optional[float] = None
+        self.open_until = 0.0
+        self.last_error: Optional[str] = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go out now (claims the probe slot when half-open)."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.time() >= self.open_until:
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self.times_opened = 0
+            self._probe_in_flight = False
+
+    def record_failure(self, error: str, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            self.last_error = error
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold or retry_after:
+                self._open(retry_after)
+
+    def _open(self, retry_after: Optional[float]) -> None:
+        cooldown = min(self.cooldown * (2 ** self.times_opened), self.max_cooldown)
+        if retry_after:
+            cooldown = max(cooldown, min(retry_after, self.max_cooldown))
+        self.state = OPEN
+        self.times_opened += 1
+        self.opened_at = time.time()
+        self.open_until = self.opened_at + cooldown
+        self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Give back a claimed half-open probe slot whose request never went out."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def retry_in(self) -> float:
+        with self._lock:
+            return max(0.0, self.open_until - time.time()) if self.state == OPEN else 0.0
+
+
+class HostGuard:
+    """Token bucket + circuit breaker for one host, with counters."""
+
+    def __init__(self, host: str, rate: float, burst: int):
+        self.host = host
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker()
+        self.counters = {'allowed': 0, 'succeeded': 0, 'failed': 0,
+                         'rejected_open': 0, 'rejected_rate': 0}
+        self._counter_lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._counter_lock:
+            self.counters[name] += 1
+
+    def before_request(self, max_wait: Optional[float] = None) -> None:
+        """Raise CircuitOpenError/RateLimited unless a request may go out now."""
+        if not self.breaker.allow():
+            self._count('rejected_open')
+            raise CircuitOpenError(
+                f"Circuit open for {self.host} (retry in {self.breaker.retry_in():.0f}s): {self.breaker.last_error}"
+            )
+        if not self.bucket.acquire(THROTTLE_MAX_WAIT if max_wait is None else max_wait):
+            self._count('rejected_rate')
+            self.breaker.release_probe()
+            raise RateLimited(f"Rate limit for {self.host} exceeded")
+        self._count('allowed')
+
+    async def before_request_async(self, max_wait: Optional[float] = None) -> None:
+        """before_request for event loops: waits for a token with asyncio.sleep."""
+        if not self.breaker.allow():
+            self._count('rejected_open')
+            raise CircuitOpenError(
+                f"Circuit open for {self.host} (retry in {self.breaker.retry_in():.0f}s): {self.breaker.last_error}"
+            )
+        deadline = time.monotonic() + (THROTTLE_MAX_WAIT if max_wait is None else max_wait)
+        while True:
+            wait = self.bucket.try_acquire()
+            if wait == 0:
+                break
+            if wait > deadline - time.monotonic():
+                self._count('rejected_rate')
+                self.breaker.release_probe()
+                raise RateLimited(f"Rate limit for {self.host} exceeded")
+            await asyncio.sleep(wait)
+        self._count('allowed')
+
+    def record_success(self) -> None:
+        self._count('succeeded')
+        self.breaker.record_success()
+
+    def record_failure(self, error: str, retry_after: Optional[float] = None) -> None:
+        self._count('failed')
+        self.breaker.record_failure(error, retry_after=retry_after)
+
+    def record_response(self, response: Any) -> None:
+        """Classify an HTTP response as a success or failure for the breaker."""
+        # requests exposes status_code, aiohttp status
+        status = getattr(response, 'status_code', None) or getattr(response, 'status', 200)
+        if status in FAILURE_STATUSES:
+            self.record_failure(f"HTTP {status}", retry_after=_retry_after(response))
+        else:
+            self.record_success()
+
+    def stats(self) -> Dict[str, Any]:
+        breaker = self.breaker
+        with self._counter_lock:
+            counters = dict(self.counters)
+        return {
+            'host': self.host,
+            'state': breaker.state,
+            'consecutive_failures': breaker.consecutive_failures,
+            'retry_in_seconds': round(breaker.retry_in(), 1),
+            'last_error': breaker.last_error,
+            'rate_per_second': self.bucket.rate,
+            'burst': self.bucket.burst,
+            'tokens': round(self.bucket.tokens, 2),
+            **counters,
+        }
+
+
+def _retry_after(response: Any) -> Optional[float]:
+    value = (getattr(response, 'headers', None) or {}).get('Retry-After')
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None  # HTTP-date form; the normal cooldown applies
+
+
+_guards: Dict[str, HostGuard] = {}
+_guards_lock = threading.Lock()
+_rates = _load_rates()
+
+
+def _rate_for(host: str) -> Tuple[float, int]:
+    parts = host.split('.')
+    for i in range(len(parts) - 1):
+        rate = _rates.get('.'.join(parts[i:]))
+        if rate:
+            return rate
+    return DEFAULT_RATE
+
+
+def get_guard(url: str) -> HostGuard:
+    """The process-wide guard for a URL's host."""
+    host = host_of(url)
+    guard = _guards.get(host)
+    if guard is None:
+        with _guards_lock:
+            guard = _guards.get(host)
+            if guard is None:
+                guard = _guards[host] = HostGuard(host, *_rate_for(host))
+    return guard
+
+
+@contextmanager
+def guarded(url: str, max_wait: Optional[float] = None) -> Iterator[HostGuard]:
+    """
+    Guard one request to ``url``. Exceptions raised inside the block count as
+    failures; otherwise the block should call ``guard.record_response(response)``.
+    """
+    guard = get_guard(url)
+    guard.before_request(max_wait)
+    try:
+        yield guard
+    except Exception as e:
+        guard.record_failure(f"{type(e).__name__}: {e}")
+        raise
+
+
+def guarded_request(method: str, url: str, session: Any = None, **kwargs: Any) -> Any:
+    """``session.request(method, url, **kwargs)`` (default: requests) under the host's guard."""
+    if session is None:
+        import requests as session
+    with guarded(url) as guard:
+        response = session.request(method, url, **kwargs)
+        guard.record_response(response)
+    return response
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    """Breaker state and counters for every host seen so far."""
+    with _guards_lock:
+        guards = list(_guards.values())
+    return {guard.host: guard.stats() for guard in sorted(guards, key=lambda g: g.host)}
+
+
+def reset(host: Optional[str] = None) -> None:
+    """Forget guard state for one host (or all), e.g. after a manual check."""
+    with _guards_lock:
+        if host:
+            _guards.pop(host_of(host), None)
+        else:
+            _guards.clear()